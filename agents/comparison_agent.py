@@ -1,15 +1,9 @@
 """Multi-ticker comparison agent."""
 
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
-from google.genai import types
-from config.settings import (
-    DEFAULT_MODEL,
-    MAX_RETRY_ATTEMPTS,
-    RETRY_EXP_BASE,
-    RETRY_INITIAL_DELAY,
-    RETRY_HTTP_STATUS_CODES,
-)
+from google.adk.tools import FunctionTool
+from tools.async_tools import screen_stocks_async, generate_comparison_chart_async
+from llm.registry import get_model
 
 
 def create_comparison_agent() -> LlmAgent:
@@ -18,16 +12,9 @@ def create_comparison_agent() -> LlmAgent:
     Returns:
         Configured LlmAgent for comparison analysis
     """
-    retry_config = types.HttpRetryOptions(
-        attempts=MAX_RETRY_ATTEMPTS,
-        exp_base=RETRY_EXP_BASE,
-        initial_delay=RETRY_INITIAL_DELAY,
-        http_status_codes=RETRY_HTTP_STATUS_CODES,
-    )
-
     agent = LlmAgent(
         name="ComparisonAgent",
-        model=Gemini(model=DEFAULT_MODEL, retry_options=retry_config),
+        model=get_model(),
         instruction="""You are a specialized comparison analysis agent for multiple tickers.
 
 Your responsibilities:
@@ -41,9 +28,28 @@ Your responsibilities:
 4. Provide sector/industry context when available
 5. Highlight key differentiators between tickers
 
+Use screen_stocks to rank the tickers on a metric or to get percentile ranks
+("<metric>_pct") and sector-relative z-scores ("<metric>_sector_z") for the table.
+
+Call generate_comparison_chart once with all tickers to get a single chart with their
+relative performance (rebased to 100) and one small price panel per ticker. Include
+the chart path in your output.
+
 Input format: You will receive structured data with analysis for each ticker.
 Output format: Provide a clear comparison table and narrative analysis.
+
+Query analysis:
+{query_analysis?}
+
+Research results (JSON of ticker -> news_analysis, market_analysis, valuation_analysis):
+{research_by_ticker?}
 """,
+        # The research results above replace the transcript of every research branch
+        include_contents="none",
+        tools=[
+            FunctionTool(screen_stocks_async),
+            FunctionTool(generate_comparison_chart_async),
+        ],
         output_key="comparison_analysis",
     )
 
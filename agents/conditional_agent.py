@@ -0,0 +1,55 @@
+"""Pipeline stage that runs its agent only when a state condition holds."""
+
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Callable, Dict, Mapping
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from opentelemetry import trace
+
+tracer = trace.get_tracer(__name__)
+
+StateCondition = Callable[[Mapping[str, Any]], bool]
+
+
+class ConditionalAgent(BaseAgent):
+    """Runs its sub-agents when run_if holds for the session state.
+
+    When the condition does not hold the stage is skipped without calling
+    a model, but it stays visible: a "skip_agent <name>" span is recorded
+    under this agent's invocation span, and an event carries the skipped
+    agents and the reason in its custom metadata. Output keys of the
+    skipped agents are cleared so a result from an earlier query in the
+    session is not mistaken for this one's.
+    """
+
+    run_if: StateCondition
+    skip_reason: str = ""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if self.run_if(ctx.session.state):
+            for sub_agent in self.sub_agents:
+                async with aclosing(sub_agent.run_async(ctx)) as events:
+                    async for event in events:
+                        yield event
+            return
+
+        state_delta: Dict[str, Any] = {}
+        for sub_agent in self.sub_agents:
+            with tracer.start_as_current_span(f"skip_agent {sub_agent.name}") as span:
+                span.set_attribute("gen_ai.agent.name", sub_agent.name)
+                span.set_attribute("skip.reason", self.skip_reason)
+            output_key = getattr(sub_agent, "output_key", None)
+            if output_key:
+                state_delta[output_key] = ""
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+            custom_metadata={
+                "skipped_agents": [sub_agent.name for sub_agent in self.sub_agents],
+                "skip_reason": self.skip_reason,
+            },
+        )
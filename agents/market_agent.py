@@ -1,23 +1,18 @@
 """Market data and chart generation agent."""
 
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool
-from tools.market_data_tool import (
-    fetch_price_history,
-    compute_volatility,
-    compute_returns,
-)
-from tools.chart_tool import generate_price_chart
-from google.genai import types
-from config.settings import (
-    DEFAULT_MODEL,
-    MAX_RETRY_ATTEMPTS,
-    RETRY_EXP_BASE,
-    RETRY_INITIAL_DELAY,
-    RETRY_HTTP_STATUS_CODES,
-    CHART_OUTPUT_DIR,
+from tools.async_tools import (
+    fetch_price_history_async,
+    compute_volatility_async,
+    compute_returns_async,
+    fetch_price_history_batch_async,
+    compute_volatility_batch_async,
+    compute_returns_batch_async,
+    generate_price_chart_async,
 )
+from llm.registry import get_model
+from config.settings import CHART_OUTPUT_DIR
 
 
 def create_market_agent() -> LlmAgent:
@@ -26,16 +21,9 @@ def create_market_agent() -> LlmAgent:
     Returns:
         Configured LlmAgent for market data analysis
     """
-    retry_config = types.HttpRetryOptions(
-        attempts=MAX_RETRY_ATTEMPTS,
-        exp_base=RETRY_EXP_BASE,
-        initial_delay=RETRY_INITIAL_DELAY,
-        http_status_codes=RETRY_HTTP_STATUS_CODES,
-    )
-
     agent = LlmAgent(
         name="MarketAgent",
-        model=Gemini(model=DEFAULT_MODEL, retry_options=retry_config),
+        model=get_model(),
         instruction="""You are a specialized market data analysis agent.
 
 Your responsibilities:
@@ -50,14 +38,31 @@ Your responsibilities:
    - Technical indicators (SMA, EMA)
    - Chart location for visualization
 
+When the query covers more than one ticker, use fetch_price_history_batch,
+compute_volatility_batch and compute_returns_batch once with the full list of
+tickers instead of calling the single-ticker tools for each ticker. Check the
+"errors" field of batch responses for tickers that could not be loaded.
+Do not call generate_price_chart for each ticker of a multi-ticker query; the
+comparison step renders one combined chart for all of them.
+
+Results of the market data tools for the query's tickers may already be prefetched
+with period "1mo", keyed by tool name:
+{prefetched_market_data?}
+Use these results instead of calling the same tools again; call a tool only when
+its prefetched result is missing or failed, for a different period, or to
+generate a chart.
+
 Always check the status field in tool responses for errors. If errors occur, report them clearly.
 Default period is "1mo" unless user specifies otherwise.
 """,
         tools=[
-            FunctionTool(fetch_price_history),
-            FunctionTool(compute_volatility),
-            FunctionTool(compute_returns),
-            FunctionTool(generate_price_chart),
+            FunctionTool(fetch_price_history_async),
+            FunctionTool(compute_volatility_async),
+            FunctionTool(compute_returns_async),
+            FunctionTool(fetch_price_history_batch_async),
+            FunctionTool(compute_volatility_batch_async),
+            FunctionTool(compute_returns_batch_async),
+            FunctionTool(generate_price_chart_async),
         ],
         output_key="market_analysis",
     )
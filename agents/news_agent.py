@@ -1,16 +1,8 @@
 """News and sentiment analysis agent."""
 
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
 from google.adk.tools import google_search
-from google.genai import types
-from config.settings import (
-    DEFAULT_MODEL,
-    MAX_RETRY_ATTEMPTS,
-    RETRY_EXP_BASE,
-    RETRY_INITIAL_DELAY,
-    RETRY_HTTP_STATUS_CODES,
-)
+from llm.registry import get_model
 
 
 def create_news_agent() -> LlmAgent:
@@ -19,16 +11,9 @@ def create_news_agent() -> LlmAgent:
     Returns:
         Configured LlmAgent for news analysis
     """
-    retry_config = types.HttpRetryOptions(
-        attempts=MAX_RETRY_ATTEMPTS,
-        exp_base=RETRY_EXP_BASE,
-        initial_delay=RETRY_INITIAL_DELAY,
-        http_status_codes=RETRY_HTTP_STATUS_CODES,
-    )
-
     agent = LlmAgent(
         name="NewsAgent",
-        model=Gemini(model=DEFAULT_MODEL, retry_options=retry_config),
+        model=get_model(),
         instruction="""You are a specialized financial news and sentiment analysis agent.
 
 Your responsibilities:
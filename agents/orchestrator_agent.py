@@ -1,20 +1,19 @@
 """Orchestrator agent that coordinates all sub-agents."""
 
-from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
-from google.adk.models.google_llm import Gemini
-from agents.news_agent import create_news_agent
-from agents.market_agent import create_market_agent
-from agents.valuation_agent import create_valuation_agent
+from google.adk.agents import LlmAgent, SequentialAgent
+from agents.conditional_agent import ConditionalAgent
+from agents.prefetch_agent import create_prefetch_agent
+from agents.query_state import (
+    QUERY_ANALYSIS_KEY,
+    TICKER_COUNT_KEY,
+    record_query_tickers,
+    resolve_query_locally,
+)
+from agents.research_fanout_agent import create_research_fanout_agent
 from agents.comparison_agent import create_comparison_agent
 from agents.report_agent import create_report_agent
-from google.genai import types
-from config.settings import (
-    DEFAULT_MODEL,
-    MAX_RETRY_ATTEMPTS,
-    RETRY_EXP_BASE,
-    RETRY_INITIAL_DELAY,
-    RETRY_HTTP_STATUS_CODES,
-)
+from llm.registry import get_model
+from config.settings import QUERY_RESOLVER_ENABLED
 
 
 def create_orchestrator_agent() -> SequentialAgent:
@@ -23,17 +22,11 @@ def create_orchestrator_agent() -> SequentialAgent:
     Returns:
         Configured SequentialAgent that orchestrates the research workflow.
     """
-    retry_config = types.HttpRetryOptions(
-        attempts=MAX_RETRY_ATTEMPTS,
-        exp_base=RETRY_EXP_BASE,
-        initial_delay=RETRY_INITIAL_DELAY,
-        http_status_codes=RETRY_HTTP_STATUS_CODES,
-    )
-
-    # Create query understanding agent
+    # Create query understanding agent; common query shapes are resolved locally
+    # from the listing table and skip the model call
     query_agent = LlmAgent(
         name="QueryAgent",
-        model=Gemini(model=DEFAULT_MODEL, retry_options=retry_config),
+        model=get_model(),
         instruction="""You are a query understanding agent for a financial research system.
 
 Your role:
@@ -42,35 +35,43 @@ Your role:
 3. Determine if this is a single-ticker or multi-ticker request
 4. Pass the ticker information clearly to the next agents in the pipeline
 
-Output format: Provide a clear summary with:
-- Extracted ticker symbols
+Output format: Start with one line listing the ticker symbols, e.g.
+"Tickers: TSLA, F" (the next step reads this line), then provide a clear summary with:
 - Whether this is a single or multi-ticker request
 - Any specific requirements mentioned (e.g., "show trends", "valuation", etc.)
 """,
-        output_key="query_analysis",
+        output_key=QUERY_ANALYSIS_KEY,
+        before_agent_callback=resolve_query_locally if QUERY_RESOLVER_ENABLED else None,
+        after_agent_callback=record_query_tickers,
     )
 
     # Create specialized agents
-    news_agent = create_news_agent()
-    market_agent = create_market_agent()
-    valuation_agent = create_valuation_agent()
+    prefetch_agent = create_prefetch_agent()
     comparison_agent = create_comparison_agent()
     report_agent = create_report_agent()
 
-    # Create parallel research team (News, Market, Valuation run simultaneously)
-    parallel_research_team = ParallelAgent(
-        name="ParallelResearchTeam",
-        sub_agents=[news_agent, market_agent, valuation_agent],
+    # Create research stage: one News/Market/Valuation team per ticker, run in parallel
+    research_team = create_research_fanout_agent()
+
+    # Comparison is skipped when the query stage found exactly one ticker,
+    # so single-ticker requests go straight from research to the report
+    comparison_stage = ConditionalAgent(
+        name="ComparisonStage",
+        description="Runs the comparison agent unless the query names a single ticker.",
+        sub_agents=[comparison_agent],
+        run_if=lambda state: state.get(TICKER_COUNT_KEY) != 1,
+        skip_reason="single-ticker query",
     )
 
-    # Create sequential pipeline: Query -> Parallel Research -> Comparison -> Report
-    # Comparison agent will process results when multiple tickers are detected
+    # Create sequential pipeline: Query -> Prefetch -> Research (per ticker) -> Comparison (unless single-ticker) -> Report
+    # Prefetch runs the market and valuation tools for the extracted tickers up front
     orchestrator_agent = SequentialAgent(
         name="OrchestratorAgent",
         sub_agents=[
             query_agent,
-            parallel_research_team,
-            comparison_agent,
+            prefetch_agent,
+            research_team,
+            comparison_stage,
             report_agent,
         ],
     )
@@ -0,0 +1,109 @@
+"""Prefetch agent that loads tool results before the research agents run."""
+
+import asyncio
+import json
+from typing import Any, AsyncGenerator, Callable, Coroutine, Dict, List, Tuple
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from tools.async_tools import (
+    fetch_price_history_async,
+    compute_volatility_async,
+    compute_returns_async,
+    fetch_price_history_batch_async,
+    compute_volatility_batch_async,
+    compute_returns_batch_async,
+    calculate_valuation_metrics_async,
+    calculate_valuation_metrics_batch_async,
+)
+from agents.query_state import query_tickers
+
+# Session state keys the research agents read the prefetched results from
+PREFETCHED_MARKET_KEY = "prefetched_market_data"
+PREFETCHED_VALUATION_KEY = "prefetched_valuation_data"
+PREFETCH_PERIOD = "1mo"
+
+ToolCall = Tuple[str, str, Callable[..., Coroutine[Any, Any, Dict[str, Any]]], Dict[str, Any]]
+
+
+def _tool_calls(tickers: List[str], period: str) -> List[ToolCall]:
+    """The (state key, tool name, tool, arguments) calls to prefetch."""
+    if len(tickers) == 1:
+        ticker = tickers[0]
+        return [
+            (PREFETCHED_MARKET_KEY, "fetch_price_history", fetch_price_history_async, {"ticker": ticker, "period": period}),
+            (PREFETCHED_MARKET_KEY, "compute_volatility", compute_volatility_async, {"ticker": ticker, "period": period}),
+            (PREFETCHED_MARKET_KEY, "compute_returns", compute_returns_async, {"ticker": ticker, "period": period}),
+            (PREFETCHED_VALUATION_KEY, "calculate_valuation_metrics", calculate_valuation_metrics_async, {"ticker": ticker}),
+        ]
+    return [
+        (PREFETCHED_MARKET_KEY, "fetch_price_history_batch", fetch_price_history_batch_async, {"tickers": tickers, "period": period}),
+        (PREFETCHED_MARKET_KEY, "compute_volatility_batch", compute_volatility_batch_async, {"tickers": tickers, "period": period}),
+        (PREFETCHED_MARKET_KEY, "compute_returns_batch", compute_returns_batch_async, {"tickers": tickers, "period": period}),
+        (PREFETCHED_VALUATION_KEY, "calculate_valuation_metrics_batch", calculate_valuation_metrics_batch_async, {"tickers": tickers}),
+    ]
+
+
+async def prefetch_tool_results(tickers: List[str], period: str = PREFETCH_PERIOD) -> Dict[str, str]:
+    """Run the market and valuation tools for the tickers concurrently.
+
+    Args:
+        tickers: Ticker symbols of the query
+        period: Price history period
+
+    Returns:
+        State key -> JSON object of tool name -> tool response. Every key is
+        present, empty when there was nothing to fetch, so results from an
+        earlier query in the session are cleared.
+    """
+    state_delta = {PREFETCHED_MARKET_KEY: "", PREFETCHED_VALUATION_KEY: ""}
+    if not tickers:
+        return state_delta
+
+    calls = _tool_calls(tickers, period)
+    responses = await asyncio.gather(
+        *(tool(**arguments) for _, _, tool, arguments in calls), return_exceptions=True
+    )
+
+    results: Dict[str, Dict[str, Any]] = {key: {} for key in state_delta}
+    for (key, name, _, _), response in zip(calls, responses):
+        if isinstance(response, Exception):
+            response = {"status": "error", "error_message": f"{type(response).__name__}: {response}"}
+        results[key][name] = response
+    for key, by_tool in results.items():
+        state_delta[key] = json.dumps(by_tool, default=str)
+    return state_delta
+
+
+class PrefetchAgent(BaseAgent):
+    """Deterministic agent that prefetches tool results into session state.
+
+    Reads the tickers from the query agent's analysis and runs the price
+    history, volatility, returns and valuation tools for all of them at
+    once, so the research agents start from the results instead of
+    discovering them one model round-trip at a time.
+    """
+
+    period: str = PREFETCH_PERIOD
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        tickers = query_tickers(ctx.session.state)
+        state_delta = await prefetch_tool_results(tickers, self.period)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+
+def create_prefetch_agent() -> PrefetchAgent:
+    """Create the prefetch agent.
+
+    Returns:
+        Configured PrefetchAgent
+    """
+    return PrefetchAgent(
+        name="PrefetchAgent",
+        description="Prefetches market and valuation data for the query's tickers.",
+    )
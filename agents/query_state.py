@@ -0,0 +1,61 @@
+"""Structured query state written by the query stage."""
+
+from typing import Any, List, Mapping, Optional
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from utils.query_resolver import get_resolver
+from utils.tickers import parse_tickers
+
+# Session state keys of the query stage
+QUERY_ANALYSIS_KEY = "query_analysis"
+QUERY_TICKERS_KEY = "query_tickers"
+TICKER_COUNT_KEY = "ticker_count"
+
+
+def query_tickers(state: Mapping[str, Any]) -> List[str]:
+    """Tickers of the current query.
+
+    Args:
+        state: Session state
+
+    Returns:
+        The structured ticker list, or the tickers parsed from the query
+        analysis when the list has not been written
+    """
+    tickers = state.get(QUERY_TICKERS_KEY)
+    if isinstance(tickers, list):
+        return list(tickers)
+    return parse_tickers(str(state.get(QUERY_ANALYSIS_KEY, "")))
+
+
+def _write_tickers(callback_context: CallbackContext, tickers: List[str]) -> None:
+    callback_context.state[QUERY_TICKERS_KEY] = tickers
+    callback_context.state[TICKER_COUNT_KEY] = len(tickers)
+
+
+def record_query_tickers(callback_context: CallbackContext) -> None:
+    """Write the query agent's tickers and their count to session state.
+
+    Used as the query agent's after_agent_callback, so later stages can
+    branch on ticker_count instead of parsing the analysis text.
+    """
+    _write_tickers(callback_context, parse_tickers(str(callback_context.state.get(QUERY_ANALYSIS_KEY, ""))))
+
+
+def resolve_query_locally(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Answer the query agent's turn from the local resolver when it is sure.
+
+    Used as the query agent's before_agent_callback: a resolved query
+    writes the same state the model path would and skips the model call;
+    otherwise the agent runs as usual.
+
+    Returns:
+        The analysis as the agent's reply, or None to let the model answer
+    """
+    parts = callback_context.user_content.parts if callback_context.user_content else None
+    resolution = get_resolver().resolve(" ".join(part.text for part in parts or [] if part.text))
+    if resolution is None:
+        return None
+    callback_context.state[QUERY_ANALYSIS_KEY] = resolution["analysis"]
+    _write_tickers(callback_context, resolution["tickers"])
+    return types.Content(role="model", parts=[types.Part(text=resolution["analysis"])])
@@ -1,15 +1,9 @@
 """Final report generation agent."""
 
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
-from google.genai import types
-from config.settings import (
-    DEFAULT_MODEL,
-    MAX_RETRY_ATTEMPTS,
-    RETRY_EXP_BASE,
-    RETRY_INITIAL_DELAY,
-    RETRY_HTTP_STATUS_CODES,
-)
+from llm.registry import get_model
+
+REPORT_AGENT_NAME = "ReportAgent"
 
 
 def create_report_agent() -> LlmAgent:
@@ -18,16 +12,9 @@ def create_report_agent() -> LlmAgent:
     Returns:
         Configured LlmAgent for report generation
     """
-    retry_config = types.HttpRetryOptions(
-        attempts=MAX_RETRY_ATTEMPTS,
-        exp_base=RETRY_EXP_BASE,
-        initial_delay=RETRY_INITIAL_DELAY,
-        http_status_codes=RETRY_HTTP_STATUS_CODES,
-    )
-
     agent = LlmAgent(
-        name="ReportAgent",
-        model=Gemini(model=DEFAULT_MODEL, retry_options=retry_config),
+        name=REPORT_AGENT_NAME,
+        model=get_model(),
         instruction="""You are a specialized financial research report generator.
 
 Your responsibilities:
@@ -0,0 +1,144 @@
+"""Research stage that fans out one research team per ticker."""
+
+import asyncio
+import json
+import re
+from contextlib import aclosing
+from typing import AsyncGenerator, Dict, List, Optional
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from pydantic import Field, PrivateAttr
+from agents.news_agent import create_news_agent
+from agents.market_agent import create_market_agent
+from agents.valuation_agent import create_valuation_agent
+from agents.query_state import query_tickers
+from config.settings import RESEARCH_MAX_BRANCHES, RESEARCH_TICKERS_PER_BRANCH
+
+# Session state key of the merged per-ticker results (JSON)
+RESEARCH_BY_TICKER_KEY = "research_by_ticker"
+
+_BRANCH_FOCUS = (
+    "Tickers: {tickers}\n"
+    "This research branch covers only the tickers above; analyze only them, "
+    "even if the query names others.\n\n"
+)
+
+
+def ticker_groups(tickers: List[str], tickers_per_branch: int) -> List[List[str]]:
+    """Split the tickers into research branches.
+
+    Args:
+        tickers: Ticker symbols of the query
+        tickers_per_branch: Tickers researched together in one branch
+
+    Returns:
+        Ticker groups in query order; one empty group when there are no tickers
+    """
+    if not tickers:
+        return [[]]
+    size = max(1, tickers_per_branch)
+    return [tickers[start:start + size] for start in range(0, len(tickers), size)]
+
+
+def _suffix(group: List[str]) -> str:
+    """Agent name suffix of a branch (agent names must be identifiers)."""
+    return "_".join(re.sub(r"\W", "_", ticker) for ticker in group) or "all"
+
+
+class _GatedBranch(BaseAgent):
+    """Runs its sub-agents once a slot of the shared gate is free."""
+
+    _gate: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        async with self._gate:
+            for sub_agent in self.sub_agents:
+                async with aclosing(sub_agent.run_async(ctx)) as events:
+                    async for event in events:
+                        yield event
+
+
+class ResearchFanOutAgent(BaseAgent):
+    """Research stage with one news/market/valuation team per ticker group.
+
+    The tickers are read from the query agent's analysis. Each group gets
+    copies of the research agents focused on its tickers, at most
+    max_branches groups run at once, and their outputs are merged into
+    research_by_ticker and the usual news/market/valuation analysis keys,
+    so wall-clock time follows the slowest ticker rather than the sum.
+    """
+
+    research_agents: List[LlmAgent] = Field(default_factory=list)
+    max_branches: int = RESEARCH_MAX_BRANCHES
+    tickers_per_branch: int = RESEARCH_TICKERS_PER_BRANCH
+
+    def _branch(self, group: List[str], gate: asyncio.Semaphore) -> _GatedBranch:
+        suffix = _suffix(group)
+        focus = _BRANCH_FOCUS.format(tickers=", ".join(group)) if group else ""
+        team = ParallelAgent(
+            name=f"ResearchTeam_{suffix}",
+            sub_agents=[
+                agent.clone(
+                    update={
+                        "name": f"{agent.name}_{suffix}",
+                        "instruction": focus + agent.instruction,
+                        "output_key": f"temp:{agent.output_key}:{suffix}",
+                    }
+                )
+                for agent in self.research_agents
+            ],
+        )
+        branch = _GatedBranch(name=f"ResearchBranch_{suffix}", sub_agents=[team])
+        branch._gate = gate
+        return branch
+
+    def _merge(self, groups: List[List[str]], state: Dict) -> Dict[str, str]:
+        research: Dict[str, Dict[str, Optional[str]]] = {}
+        for group in groups:
+            suffix = _suffix(group)
+            research[", ".join(group) or "all"] = {
+                agent.output_key: state.get(f"temp:{agent.output_key}:{suffix}")
+                for agent in self.research_agents
+            }
+
+        state_delta = {RESEARCH_BY_TICKER_KEY: json.dumps(research)}
+        for agent in self.research_agents:
+            outputs = [(label, results[agent.output_key] or "") for label, results in research.items()]
+            if len(outputs) == 1:
+                state_delta[agent.output_key] = outputs[0][1]
+            else:
+                state_delta[agent.output_key] = "\n\n".join(f"[{label}]\n{text}" for label, text in outputs)
+        return state_delta
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        tickers = query_tickers(ctx.session.state)
+        groups = ticker_groups(tickers, self.tickers_per_branch)
+        gate = asyncio.Semaphore(max(1, self.max_branches))
+        branches = ParallelAgent(
+            name=f"{self.name}Branches",
+            sub_agents=[self._branch(group, gate) for group in groups],
+        )
+        async with aclosing(branches.run_async(ctx)) as events:
+            async for event in events:
+                yield event
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=self._merge(groups, ctx.session.state)),
+        )
+
+
+def create_research_fanout_agent() -> ResearchFanOutAgent:
+    """Create the per-ticker research stage.
+
+    Returns:
+        Configured ResearchFanOutAgent
+    """
+    return ResearchFanOutAgent(
+        name="ResearchFanOut",
+        description="Runs the news, market and valuation agents once per ticker group.",
+        research_agents=[create_news_agent(), create_market_agent(), create_valuation_agent()],
+    )
@@ -1,17 +1,13 @@
 """Financial valuation and ratio analysis agent."""
 
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool
-from tools.ratio_tool import calculate_valuation_metrics
-from google.genai import types
-from config.settings import (
-    DEFAULT_MODEL,
-    MAX_RETRY_ATTEMPTS,
-    RETRY_EXP_BASE,
-    RETRY_INITIAL_DELAY,
-    RETRY_HTTP_STATUS_CODES,
+from tools.async_tools import (
+    calculate_valuation_metrics_async,
+    calculate_valuation_metrics_batch_async,
+    screen_stocks_async,
 )
+from llm.registry import get_model
 
 
 def create_valuation_agent() -> LlmAgent:
@@ -20,16 +16,9 @@ def create_valuation_agent() -> LlmAgent:
     Returns:
         Configured LlmAgent for valuation analysis
     """
-    retry_config = types.HttpRetryOptions(
-        attempts=MAX_RETRY_ATTEMPTS,
-        exp_base=RETRY_EXP_BASE,
-        initial_delay=RETRY_INITIAL_DELAY,
-        http_status_codes=RETRY_HTTP_STATUS_CODES,
-    )
-
     agent = LlmAgent(
         name="ValuationAgent",
-        model=Gemini(model=DEFAULT_MODEL, retry_options=retry_config),
+        model=get_model(),
         instruction="""You are a specialized financial valuation analysis agent.
 
 Your responsibilities:
@@ -47,10 +36,27 @@ Your responsibilities:
    - Key strengths and weaknesses
    - Comparison context (if available)
 
+When the query covers more than one ticker, call calculate_valuation_metrics_batch
+once with all tickers instead of calling calculate_valuation_metrics for each one.
+Tickers that could not be loaded are listed in the "errors" field of the response.
+
+For screening questions (e.g., "cheapest semis by EV/EBITDA with ROE > 15%"), call
+screen_stocks with the candidate universe, filters such as "industry == Semiconductors"
+and "roe > 0.15", and sort_by="ev_to_ebitda". Use "<metric>_sector_z" to compare a
+metric with the ticker's sector peers.
+
+Results of the valuation tools for the query's tickers may already be prefetched,
+keyed by tool name:
+{prefetched_valuation_data?}
+Use these results instead of calling the same tool again; call a tool only for
+tickers whose prefetched result is missing or failed.
+
 Always check the status field in tool responses for errors. If errors occur, report them clearly.
 """,
         tools=[
-            FunctionTool(calculate_valuation_metrics),
+            FunctionTool(calculate_valuation_metrics_async),
+            FunctionTool(calculate_valuation_metrics_batch_async),
+            FunctionTool(screen_stocks_async),
         ],
         output_key="valuation_analysis",
     )
@@ -0,0 +1,83 @@
+"""Benchmark candlestick rendering time against bar count.
+
+Compares the batched candlestick drawing in tools.chart_tool with the
+previous per-bar implementation (two ax.plot calls per bar). Bars are
+synthetic, so no network access is needed.
+
+Usage:
+    python -m benchmarks.bench_chart_render [--bars 100 1000 10000 50000] [--legacy-max-bars 5000]
+"""
+
+import argparse
+import io
+import time
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from tools.chart_tool import _draw_candlesticks
+
+
+def synthetic_bars(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLC bars at 5-minute spacing."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, rows)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, rows)) * close
+    index = pd.date_range("2020-01-01 09:30", periods=rows, freq="5min", tz="America/New_York")
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+        },
+        index=index,
+    )
+
+
+def draw_candlesticks_per_bar(ax, hist: pd.DataFrame) -> None:
+    """The previous implementation: one pair of Line2D artists per bar."""
+    for ts, row in hist.iterrows():
+        color = "green" if row["Close"] >= row["Open"] else "red"
+        ax.plot([ts, ts], [row["Low"], row["High"]], color=color, linewidth=1)
+        ax.plot([ts, ts], [row["Open"], row["Close"]], color=color, linewidth=3)
+
+
+def render(draw, hist: pd.DataFrame) -> float:
+    """Draws and saves one chart, returning the elapsed seconds."""
+    start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    draw(ax, hist)
+    fig.savefig(io.BytesIO(), format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[100, 1000, 5000, 10000, 50000])
+    parser.add_argument(
+        "--legacy-max-bars",
+        type=int,
+        default=5000,
+        help="skip the per-bar implementation above this size (it takes minutes)",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    render(_draw_candlesticks, synthetic_bars(10))  # warm up fonts and caches
+    print(f"{'bars':>8} {'batched (s)':>12} {'per-bar (s)':>12} {'speedup':>8}")
+    for rows in args.bars:
+        hist = synthetic_bars(rows)
+        batched = min(render(_draw_candlesticks, hist) for _ in range(args.repeat))
+        if rows <= args.legacy_max_bars:
+            legacy = render(draw_candlesticks_per_bar, hist)
+            print(f"{rows:>8} {batched:>12.3f} {legacy:>12.3f} {legacy / batched:>7.1f}x")
+        else:
+            print(f"{rows:>8} {batched:>12.3f} {'-':>12} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
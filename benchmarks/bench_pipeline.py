@@ -0,0 +1,146 @@
+"""Load-test the full agent pipeline offline with the stub model.
+
+Runs queries through the orchestrator (Query -> ParallelResearchTeam ->
+Comparison -> Report) with every model call answered by the local stub
+and market data from the synthetic provider, so the measured time is
+orchestration and tool overhead plus the simulated model latency. The
+run happens in a temporary directory so charts, the price store and the
+database do not touch the working tree.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--requests 20] [--concurrency 4]
+        [--latency-ms 300 --distribution lognormal --spread 0.5] [--ms-per-ticker 1500]
+        [--tool-calls-per-turn 1] [--profile 25]
+"""
+
+import argparse
+import asyncio
+import cProfile
+import os
+import pstats
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+DEFAULT_QUERIES = [
+    "Research NVDA",
+    "Compare AAPL and MSFT",
+    "How is TSLA doing this year?",
+    "Compare AMD, INTC and NVDA valuations",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_pipeline(
+    queries: List[str], requests: int, concurrency: int
+) -> Dict[str, List[float]]:
+    """Runs queries through the orchestrator.
+
+    Args:
+        queries: Queries to cycle through
+        requests: Total number of queries to run
+        concurrency: Queries in flight at once
+
+    Returns:
+        Timings in seconds: "query" for whole queries and, per agent, the
+        offset of its last event from the start of the query
+    """
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+    from agents.orchestrator_agent import create_orchestrator_agent
+
+    runner = InMemoryRunner(agent=create_orchestrator_agent(), app_name="bench_pipeline")
+    timings: Dict[str, List[float]] = defaultdict(list)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(query: str) -> None:
+        async with gate:
+            session = await runner.session_service.create_session(
+                app_name="bench_pipeline", user_id="bench"
+            )
+            message = types.Content(role="user", parts=[types.Part(text=query)])
+            started = time.perf_counter()
+            finished: Dict[str, float] = {}
+            async for event in runner.run_async(
+                user_id="bench", session_id=session.id, new_message=message
+            ):
+                finished[event.author] = time.perf_counter() - started
+            timings["query"].append(time.perf_counter() - started)
+            for author, offset in finished.items():
+                timings[author].append(offset)
+
+    await asyncio.gather(*(one(queries[i % len(queries)]) for i in range(requests)))
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="center of the stub model latency")
+    parser.add_argument("--distribution", default="fixed", choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--ms-per-ticker", type=float, default=0.0, help="extra stub latency per ticker of a text reply")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--tool-calls-per-turn", type=int, default=0,
+        help="tool calls the stub makes per model turn (0 makes them all at once)",
+    )
+    parser.add_argument("--script", help="JSON script of stub responses")
+    parser.add_argument("--profile", type=int, metavar="N", help="print the N functions with the most own time")
+    args = parser.parse_args()
+
+    # Settings are read at import, so configure before importing the agents
+    os.environ["DEFAULT_MODEL"] = "stub/" + os.environ.get("DEFAULT_MODEL", "gemini-2.5-flash-lite").split("/")[-1]
+    os.environ["STUB_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["STUB_LATENCY_DISTRIBUTION"] = args.distribution
+    os.environ["STUB_LATENCY_SPREAD"] = str(args.spread)
+    os.environ["STUB_LATENCY_MS_PER_TICKER"] = str(args.ms_per_ticker)
+    os.environ["STUB_SEED"] = str(args.seed)
+    os.environ["STUB_TOOL_CALLS_PER_TURN"] = str(args.tool_calls_per_turn)
+    if args.script:
+        os.environ["STUB_SCRIPT_PATH"] = os.path.abspath(args.script)
+    os.environ.setdefault("MARKET_DATA_PROVIDER", "synthetic")
+    os.environ.setdefault("GOOGLE_API_KEY", "pipeline-benchmark")
+
+    workdir = tempfile.TemporaryDirectory(prefix="bench_pipeline_")
+    os.chdir(workdir.name)
+
+    profiler = cProfile.Profile() if args.profile else None
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    timings = asyncio.run(run_pipeline(args.queries, args.requests, args.concurrency))
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - started
+
+    from llm.registry import model_registry
+
+    queries = timings.pop("query")
+    print(f"Queries: {len(queries)} at concurrency {args.concurrency}, "
+          f"stub latency {args.latency_ms:g} ms ({args.distribution})")
+    print(f"Wall time: {elapsed:.2f} s ({len(queries) / elapsed:.2f} queries/s)")
+    print(f"Query latency: p50 {percentile(queries, 0.5) * 1e3:.0f} ms, "
+          f"p95 {percentile(queries, 0.95) * 1e3:.0f} ms, max {max(queries) * 1e3:.0f} ms")
+    print("\nagent                  done after (median ms)")
+    for author, offsets in sorted(timings.items(), key=lambda item: statistics.median(item[1])):
+        print(f"{author:<22} {statistics.median(offsets) * 1e3:>10.0f}")
+    for name, stats in model_registry.stats().items():
+        print(f"\nModel {name}: {stats}")
+
+    if profiler:
+        print()
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(args.profile)
+
+
+if __name__ == "__main__":
+    main()
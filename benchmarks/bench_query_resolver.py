@@ -0,0 +1,68 @@
+"""Benchmark the local query resolver.
+
+Resolves a fixture corpus of typical queries, labelled with the tickers a
+correct analysis names (or null where the model should answer), and
+reports the resolver's build time and per-query latency, how many queries
+it answers locally, and whether it named the right tickers or correctly
+left the query to the model.
+
+Usage:
+    python -m benchmarks.bench_query_resolver [--repeat 200]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from utils.query_resolver import QueryResolver, load_listings
+
+CORPUS_PATH = Path(__file__).resolve().parent / "fixtures" / "query_corpus.json"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS_PATH.read_text())
+
+    start = time.perf_counter()
+    listings = load_listings()
+    resolver = QueryResolver(listings)
+    build_seconds = time.perf_counter() - start
+
+    timings = []
+    for _ in range(args.repeat):
+        for item in corpus:
+            start = time.perf_counter()
+            resolver.resolve(item["query"])
+            timings.append(time.perf_counter() - start)
+
+    resolved = correct = wrong = missed = 0
+    for item in corpus:
+        result = resolver.resolve(item["query"])
+        expected = item["tickers"]
+        if result is None:
+            missed += expected is not None
+            continue
+        resolved += 1
+        if result["tickers"] == expected:
+            correct += 1
+        else:
+            wrong += 1
+            print(f"  wrong: {item['query']!r} -> {result['tickers']} (expected {expected})")
+
+    answerable = sum(item["tickers"] is not None for item in corpus)
+    print(f"Corpus: {len(corpus)} queries, {answerable} with known tickers")
+    print(f"Listings: {len(listings)} symbols, resolver built in {build_seconds * 1e3:.2f} ms")
+    print(
+        f"Resolver latency: median {statistics.median(timings) * 1e6:.1f} us, "
+        f"max {max(timings) * 1e6:.1f} us per query"
+    )
+    print(f"Resolved locally: {resolved} of {len(corpus)} ({correct} correct, {wrong} wrong)")
+    print(f"Left to the model: {len(corpus) - resolved} ({missed} of them resolvable)")
+
+
+if __name__ == "__main__":
+    main()
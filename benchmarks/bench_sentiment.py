@@ -0,0 +1,94 @@
+"""Benchmark the local lexicon sentiment scorer against the model.
+
+Scores a fixture corpus of labelled headlines in tool-sized batches and
+reports latency, agreement with the reference labels, and how many
+articles would escalate to the model. With --live the same batches are
+also scored by the model (needs GOOGLE_API_KEY), adding its latency and
+the agreement of the lexicon and hybrid paths with the model's labels.
+
+Usage:
+    python -m benchmarks.bench_sentiment [--repeat 200] [--min-confidence 6] [--live]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from tools.sentiment_tool import MAX_ARTICLES, score_articles_locally, _score_articles
+from config.settings import SENTIMENT_LLM_FALLBACK_CONFIDENCE
+
+CORPUS_PATH = Path(__file__).resolve().parent / "fixtures" / "sentiment_corpus.json"
+
+
+def batches(items: List[Any], size: int = MAX_ARTICLES) -> List[List[Any]]:
+    """Splits items into tool-sized batches."""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def agreement(labels: List[Optional[str]], reference: List[Optional[str]]) -> str:
+    """Share of articles whose labels match, skipping missing ones."""
+    pairs = [(a, b) for a, b in zip(labels, reference) if a is not None and b is not None]
+    if not pairs:
+        return "-"
+    return f"{sum(a == b for a, b in pairs) / len(pairs):.0%} of {len(pairs)}"
+
+
+def time_lexicon(corpus: List[Dict[str, Any]], repeat: int) -> float:
+    """Median seconds to score one batch locally."""
+    timings = []
+    for _ in range(repeat):
+        for batch in batches(corpus):
+            start = time.perf_counter()
+            score_articles_locally(batch)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--min-confidence", type=int, default=SENTIMENT_LLM_FALLBACK_CONFIDENCE)
+    parser.add_argument("--live", action="store_true", help="also score the corpus with the model")
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS_PATH.read_text())
+    reference = [article["label"] for article in corpus]
+
+    score_articles_locally(corpus[:1])  # warm up imports
+    local = score_articles_locally(corpus)
+    local_labels = [result["sentiment"] for result in local]
+    confident = [result["confidence"] >= args.min_confidence for result in local]
+    batch_seconds = time_lexicon(corpus, args.repeat)
+
+    print(f"Corpus: {len(corpus)} articles in batches of {MAX_ARTICLES}")
+    print(f"Lexicon latency: {batch_seconds * 1e3:.3f} ms per batch")
+    print(f"Lexicon vs reference labels (all): {agreement(local_labels, reference)}")
+    print(
+        "Lexicon vs reference labels (confident): "
+        f"{agreement([l if c else None for l, c in zip(local_labels, confident)], reference)}"
+    )
+    print(f"Escalated to the model at confidence < {args.min_confidence}: {confident.count(False)}")
+
+    if not args.live:
+        return
+
+    model_labels: List[Optional[str]] = []
+    model_seconds = []
+    for batch in batches(corpus):
+        start = time.perf_counter()
+        results = _score_articles(batch)
+        model_seconds.append(time.perf_counter() - start)
+        model_labels.extend(result["sentiment"] if result else None for result in results)
+    hybrid = [l if c else m for l, c, m in zip(local_labels, confident, model_labels)]
+
+    print(f"\nModel latency: {statistics.median(model_seconds) * 1e3:.0f} ms per batch")
+    print(f"Model vs reference labels: {agreement(model_labels, reference)}")
+    print(f"Lexicon vs model labels: {agreement(local_labels, model_labels)}")
+    print(f"Hybrid vs model labels: {agreement(hybrid, model_labels)}")
+    print(f"Hybrid vs reference labels: {agreement(hybrid, reference)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark cold-start import time and fail if startup pulls in heavy modules.
+
+Each module is imported in a fresh interpreter under `python -X importtime`.
+The run fails if a module pulls in a dependency that is meant to load only
+on first use (e.g. pandas or matplotlib at startup).
+
+Timings are reported relative to the startup imports of a bare interpreter
+measured in the same run, so the stored baseline carries over between
+machines. They only fail the run with --check-timings, since import times
+vary too much between runs on a busy machine to be a default gate.
+
+Usage:
+    python -m benchmarks.bench_startup [--modules main tools.async_tools] [--repeat 5]
+    python -m benchmarks.bench_startup --check-timings   # also fail on a slowdown
+    python -m benchmarks.bench_startup --update          # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().with_name("startup_baseline.json")
+
+_DATA_STACK = ["numpy", "pandas", "matplotlib", "yfinance"]
+
+# Module -> dependencies it must not import (they load when a tool first runs)
+DEFERRED_IMPORTS: Dict[str, List[str]] = {
+    "main": _DATA_STACK + ["google.adk.runners", "google.genai"],
+    "agents.orchestrator_agent": _DATA_STACK,
+    "tools.async_tools": _DATA_STACK + ["google.adk.models.google_llm"],
+}
+
+
+def _import_times(code: str) -> List[Tuple[str, int]]:
+    """Runs code in a fresh interpreter under -X importtime.
+
+    Args:
+        code: Python source to run
+
+    Returns:
+        (indented module name, cumulative microseconds) for every module imported
+    """
+    env = dict(os.environ)
+    # main exits at import without a key; no request is ever made
+    env.setdefault("GOOGLE_API_KEY", "startup-benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{code} failed:\n{result.stderr[-2000:]}")
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.append((name.rstrip(), int(cumulative)))
+    return times
+
+
+def import_profile(module: str) -> Dict[str, int]:
+    """Imports a module in a fresh interpreter.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Cumulative import time in microseconds for every module imported
+    """
+    return {name.strip(): cumulative for name, cumulative in _import_times(f"import {module}")}
+
+
+def interpreter_startup() -> int:
+    """Cumulative import time in microseconds of a bare interpreter's startup modules."""
+    # Top-level entries are indented by one space, nested imports by more
+    return sum(
+        cumulative
+        for name, cumulative in _import_times("pass")
+        if not name.startswith("  ")
+    )
+
+
+def deferred_violations(module: str, imported: Set[str]) -> List[str]:
+    """Lists the deferred dependencies a module imported at startup."""
+    return [
+        name
+        for name in DEFERRED_IMPORTS.get(module, [])
+        if any(m == name or m.startswith(name + ".") for m in imported)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=list(DEFERRED_IMPORTS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown over the baseline",
+    )
+    parser.add_argument(
+        "--slack",
+        type=float,
+        default=0.5,
+        help="allowed absolute slowdown in interpreter startups, so small imports are not flaky",
+    )
+    parser.add_argument("--check-timings", action="store_true", help="fail if an import is slower than the baseline")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results: Dict[str, float] = {}
+    failures = []
+
+    reference_ms = min(interpreter_startup() for _ in range(args.repeat)) / 1000
+    print(f"Interpreter startup imports: {reference_ms:.1f} ms (timings below are multiples of it)\n")
+    print(f"{'module':<28} {'import (ms)':>12} {'relative':>10} {'baseline':>10}")
+    for module in args.modules:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        elapsed_ms = min(run[module] for run in runs) / 1000
+        relative = elapsed_ms / reference_ms
+        results[module] = round(relative, 2)
+
+        expected = baseline.get(module)
+        print(
+            f"{module:<28} {elapsed_ms:>12.1f} {relative:>10.2f} "
+            f"{expected if expected is not None else '-':>10}"
+        )
+
+        leaked = deferred_violations(module, set(runs[0]))
+        if leaked:
+            failures.append(f"{module} imports {', '.join(leaked)} at startup")
+        if args.check_timings and not args.update and expected is not None:
+            limit = expected * (1 + args.tolerance) + args.slack
+            if relative > limit:
+                failures.append(f"{module} took {relative:.2f}x interpreter startup (limit {limit:.2f}x)")
+
+    if args.update:
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE_PATH.relative_to(REPO_ROOT)}")
+
+    if failures:
+        print("\nStartup regression:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
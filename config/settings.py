@@ -16,8 +16,22 @@ DB_URL = os.getenv("DB_URL", "sqlite:///financial_agent_data.db")
 APP_NAME = "financial_research_agent"
 DEFAULT_USER_ID = "default_user"
 
-# Model configuration
-DEFAULT_MODEL = "gemini-2.5-flash-lite"
+# Model configuration ("stub/<model>" selects the offline stub model, e.g.
+# DEFAULT_MODEL="stub/gemini-2.5-flash-lite")
+DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "gemini-2.5-flash-lite")
+
+# Stub model configuration (response latency drawn from a "fixed", "uniform" or
+# "lognormal" distribution around STUB_LATENCY_MS; optional JSON response script)
+STUB_MODEL_PREFIX = "stub/"
+STUB_LATENCY_DISTRIBUTION = os.getenv("STUB_LATENCY_DISTRIBUTION", "fixed")
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "0"))
+STUB_LATENCY_SPREAD = float(os.getenv("STUB_LATENCY_SPREAD", "0.5"))
+STUB_SEED = int(os.getenv("STUB_SEED", "0"))
+STUB_SCRIPT_PATH = os.getenv("STUB_SCRIPT_PATH", "")
+# Tool calls the stub makes per model turn (0 makes them all in one turn)
+STUB_TOOL_CALLS_PER_TURN = int(os.getenv("STUB_TOOL_CALLS_PER_TURN", "0"))
+# Extra latency of a text reply per ticker it covers (decoding longer answers)
+STUB_LATENCY_MS_PER_TICKER = float(os.getenv("STUB_LATENCY_MS_PER_TICKER", "0"))
 
 # Retry configuration
 MAX_RETRY_ATTEMPTS = 5
@@ -25,9 +39,75 @@ RETRY_EXP_BASE = 7
 RETRY_INITIAL_DELAY = 1
 RETRY_HTTP_STATUS_CODES = [429, 500, 503, 504]
 
+# Model client pool configuration (concurrent requests per model; overrides as
+# MODEL_CONCURRENCY_LIMITS="gemini-2.5-flash-lite=16,gemini-2.5-pro=4")
+MODEL_MAX_CONCURRENCY = int(os.getenv("MODEL_MAX_CONCURRENCY", "8"))
+MODEL_CONCURRENCY_LIMITS = {
+    name.strip(): int(limit)
+    for name, _, limit in (
+        item.partition("=") for item in os.getenv("MODEL_CONCURRENCY_LIMITS", "").split(",")
+    )
+    if name.strip()
+}
+
+# Market data provider configuration ("yfinance" or offline "synthetic")
+MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER", "yfinance")
+SYNTHETIC_DATA_SEED = int(os.getenv("SYNTHETIC_DATA_SEED", "42"))
+
+# Price history cache configuration (TTL in seconds)
+PRICE_CACHE_TTL_INTRADAY = 60
+PRICE_CACHE_TTL_DAILY = 900
+PRICE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Fundamentals fetch configuration (concurrent info requests)
+FUNDAMENTALS_MAX_WORKERS = 8
+FUNDAMENTALS_MAX_PER_HOST = 4
+FUNDAMENTALS_TIMEOUT_SECONDS = 20
+
+# Fundamentals snapshot cache configuration (ages in seconds)
+FUNDAMENTALS_PRICE_TTL = 900
+FUNDAMENTALS_STATEMENT_TTL = 24 * 60 * 60
+FUNDAMENTALS_MAX_STALE = 7 * 24 * 60 * 60
+
+# Sentiment configuration (per-article model results are cached, TTL in seconds)
+SENTIMENT_CACHE_TTL = int(os.getenv("SENTIMENT_CACHE_TTL", str(6 * 60 * 60)))
+# Articles the local lexicon scores below this confidence (1-10) go to the model;
+# 0 never calls the model, 11 always does
+SENTIMENT_LLM_FALLBACK_CONFIDENCE = int(os.getenv("SENTIMENT_LLM_FALLBACK_CONFIDENCE", "6"))
+# Token budgets of one batched sentiment request (larger batches are split)
+SENTIMENT_BATCH_MAX_INPUT_TOKENS = 32_000
+SENTIMENT_BATCH_MAX_OUTPUT_TOKENS = 8_192
+
+# Async tool configuration (threads running blocking tool work off the event loop)
+TOOL_EXECUTOR_WORKERS = 16
+
+# Research fan-out configuration (one research branch per group of tickers;
+# branches beyond the cap wait for a free slot)
+RESEARCH_MAX_BRANCHES = int(os.getenv("RESEARCH_MAX_BRANCHES", "4"))
+RESEARCH_TICKERS_PER_BRANCH = int(os.getenv("RESEARCH_TICKERS_PER_BRANCH", "1"))
+
+# Query resolver configuration (common query shapes are resolved locally from the
+# listing table; queries the resolver is unsure about go to the query agent's model)
+QUERY_RESOLVER_ENABLED = os.getenv("QUERY_RESOLVER_ENABLED", "true").lower() == "true"
+LISTINGS_PATH = os.getenv("LISTINGS_PATH", os.path.join(os.path.dirname(__file__), "listings.csv"))
+
+# Report cache configuration (final reports of queries the local resolver resolves,
+# so nothing is cached with QUERY_RESOLVER_ENABLED off; served while the
+# latest price bar and fundamentals snapshot are unchanged; news is only seen through
+# the model's search, so entries older than the news TTL in seconds are rebuilt)
+REPORT_CACHE_ENABLED = os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true"
+REPORT_CACHE_NEWS_TTL = int(os.getenv("REPORT_CACHE_NEWS_TTL", str(60 * 60)))
+
 # Chart configuration
 CHART_OUTPUT_DIR = "charts"
 CHART_FORMAT = "png"
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0 renders inline
+CHART_CACHE_MAX_BYTES = 256 * 1024 * 1024
+CHART_CACHE_MAX_AGE = 7 * 24 * 60 * 60  # seconds
+
+# Persistent price store configuration (bars kept on disk between restarts)
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", "price_store")
+PRICE_STORE_ENABLED = os.getenv("PRICE_STORE_ENABLED", "true").lower() == "true"
 
 # Memory configuration
 MEMORY_COMPACTION_INTERVAL = 5
@@ -0,0 +1 @@
+"""Shared LLM model instances, API clients and per-model request limits."""
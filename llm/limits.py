@@ -0,0 +1,114 @@
+"""Per-model concurrency limits and request statistics."""
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+import asyncio
+import threading
+import time
+
+# Backoff bounds while a coroutine waits for a free slot, in seconds
+_POLL_MIN = 0.005
+_POLL_MAX = 0.05
+
+
+class ModelLimiter:
+    """Caps the number of in-flight requests to one model and counts them.
+
+    The same slots are shared by synchronous callers (tools running in
+    worker threads) and coroutines (agents on the event loop), so the cap
+    holds across both. Coroutines wait by polling with a short backoff
+    rather than blocking the loop.
+    """
+
+    def __init__(
+        self, model_name: str, max_concurrency: int, clock: Callable[[], float] = time.monotonic
+    ):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.clock = clock
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._waited = 0
+        self._wait_seconds = 0.0
+        self._busy_seconds = 0.0
+
+    def _enter(self, wait_started: float, waited: bool) -> float:
+        now = self.clock()
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            if waited:
+                self._waited += 1
+                self._wait_seconds += now - wait_started
+        return now
+
+    def _exit(self, started: float, failed: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._busy_seconds += self.clock() - started
+            if failed:
+                self._errors += 1
+        self._slots.release()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Holds a request slot, blocking the calling thread until one is free."""
+        wait_started = self.clock()
+        waited = not self._slots.acquire(blocking=False)
+        if waited:
+            self._slots.acquire()
+        started = self._enter(wait_started, waited)
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._exit(started, failed)
+
+    @asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[None]:
+        """Holds a request slot, yielding to the event loop until one is free."""
+        wait_started = self.clock()
+        waited = False
+        delay = _POLL_MIN
+        while not self._slots.acquire(blocking=False):
+            waited = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _POLL_MAX)
+        started = self._enter(wait_started, waited)
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._exit(started, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get request statistics.
+
+        Returns:
+            Dictionary with the limit, request and error counts, current and
+            peak in-flight requests, and time spent waiting for a slot
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "requests": self._requests,
+                "errors": self._errors,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "waited": self._waited,
+                "total_wait_seconds": round(self._wait_seconds, 3),
+                "total_busy_seconds": round(self._busy_seconds, 3),
+            }
@@ -0,0 +1,141 @@
+"""Process-wide registry of shared model instances.
+
+Every agent and tool asks the registry for its model instead of building
+its own. Each model name maps to one instance, so the google-genai client
+it creates (one per event loop, plus one for synchronous callers) and that
+client's HTTP connection pool, keep-alive connections and credentials are
+reused by all agents and tool calls. Requests to a model also pass through
+a shared ModelLimiter that caps concurrency and collects statistics.
+
+Names starting with STUB_MODEL_PREFIX get the offline StubLlm instead.
+"""
+
+from typing import Any, AsyncGenerator, Dict, Optional
+import threading
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import PrivateAttr
+from llm.limits import ModelLimiter
+from llm.stub import StubLlm, load_script
+from config.settings import (
+    DEFAULT_MODEL,
+    MAX_RETRY_ATTEMPTS,
+    RETRY_EXP_BASE,
+    RETRY_INITIAL_DELAY,
+    RETRY_HTTP_STATUS_CODES,
+    MODEL_MAX_CONCURRENCY,
+    MODEL_CONCURRENCY_LIMITS,
+    STUB_MODEL_PREFIX,
+    STUB_SCRIPT_PATH,
+)
+
+
+class PooledGemini(Gemini):
+    """Gemini model whose requests hold a slot of its model's limiter.
+
+    The slot is held only while the API request runs. Complete responses
+    are collected inside it and yielded after it is released, since the
+    agent runs tools while this generator is suspended at such a yield.
+    When streaming, partial chunks are yielded as they arrive, with the slot
+    still held; they only carry text to show and never trigger tools.
+    """
+
+    _limiter: Optional[ModelLimiter] = PrivateAttr(default=None)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self._limiter is None:
+            async for response in super().generate_content_async(llm_request, stream=stream):
+                yield response
+            return
+        responses = []
+        async with self._limiter.slot_async():
+            async for response in super().generate_content_async(llm_request, stream=stream):
+                if response.partial:
+                    yield response
+                else:
+                    responses.append(response)
+        for response in responses:
+            yield response
+
+
+class ModelRegistry:
+    """Hands out one shared model instance and limiter per model name."""
+
+    def __init__(
+        self,
+        default_max_concurrency: int = MODEL_MAX_CONCURRENCY,
+        max_concurrency: Optional[Dict[str, int]] = None,
+    ):
+        self.default_max_concurrency = default_max_concurrency
+        self.max_concurrency = dict(MODEL_CONCURRENCY_LIMITS if max_concurrency is None else max_concurrency)
+        self._models: Dict[str, BaseLlm] = {}
+        self._limiters: Dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+        self._retry_options = types.HttpRetryOptions(
+            attempts=MAX_RETRY_ATTEMPTS,
+            exp_base=RETRY_EXP_BASE,
+            initial_delay=RETRY_INITIAL_DELAY,
+            http_status_codes=RETRY_HTTP_STATUS_CODES,
+        )
+
+    def limiter(self, model_name: str) -> ModelLimiter:
+        """Get the request limiter of a model.
+
+        Args:
+            model_name: Model name (e.g., "gemini-2.5-flash-lite")
+
+        Returns:
+            The model's shared limiter
+        """
+        with self._lock:
+            limiter = self._limiters.get(model_name)
+            if limiter is None:
+                limit = self.max_concurrency.get(model_name, self.default_max_concurrency)
+                limiter = ModelLimiter(model_name, limit)
+                self._limiters[model_name] = limiter
+            return limiter
+
+    def get(self, model_name: str = DEFAULT_MODEL) -> BaseLlm:
+        """Get the shared instance of a model.
+
+        Args:
+            model_name: Model name (e.g., "gemini-2.5-flash-lite")
+
+        Returns:
+            Model instance shared by every caller asking for the same name
+        """
+        limiter = self.limiter(model_name)
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is None:
+                if model_name.startswith(STUB_MODEL_PREFIX):
+                    script = load_script(STUB_SCRIPT_PATH) if STUB_SCRIPT_PATH else {}
+                    model = StubLlm(model=model_name, script=script)
+                else:
+                    model = PooledGemini(model=model_name, retry_options=self._retry_options)
+                model._limiter = limiter
+                self._models[model_name] = model
+            return model
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get request statistics of every model used so far.
+
+        Returns:
+            Model name -> limiter statistics
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+model_registry = ModelRegistry()
+
+
+def get_model(model_name: str = DEFAULT_MODEL) -> BaseLlm:
+    """Get the shared instance of a model from the process-wide registry."""
+    return model_registry.get(model_name)
@@ -0,0 +1,298 @@
+"""Offline stand-in for the Gemini models.
+
+StubLlm answers every request locally with scripted or templated
+responses after a simulated latency, so the full agent pipeline can be
+run, load-tested and profiled without network access. It is selected by
+giving a model name the "stub/" prefix (e.g. DEFAULT_MODEL set to
+"stub/gemini-2.5-flash-lite"); the rest of the name keeps tools that
+check for a Gemini model, such as google_search, working.
+
+By default each agent calls the function tools it was given that take
+only a ticker (single-ticker queries) or a list of tickers (multi-ticker
+queries), all in one turn or tool_calls_per_turn at a time, then
+summarizes the tool statuses; that text reply takes latency_ms_per_ticker
+longer for each ticker it covers. The tickers come from a line starting with
+"Tickers:" in the agent's instruction (e.g. a research branch's focus)
+or else from the conversation. Tools whose successful results (or batch
+results) already appear in the instruction, e.g. prefetched into session
+state, are not called again. A JSON script can replace the text and tool
+calls per agent name ("*" for any agent):
+
+    {
+        "QueryAgent": {"text": "Tickers: {tickers}"},
+        "MarketAgent": {
+            "tool_calls": [{"name": "fetch_price_history", "args": {"ticker": "{ticker}"}}],
+            "text": "Market data for {ticker}: {tool_results}",
+            "latency_ms": 400
+        }
+    }
+
+Templates can use {agent}, {ticker} (first ticker), {tickers} (comma
+separated, or a list when it is a whole argument value) and
+{tool_results} (tool name -> status, in the final text).
+"""
+
+from typing import Any, AsyncGenerator, Dict, List, Optional
+import asyncio
+import inspect
+import json
+import math
+import random
+import re
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import Field, PrivateAttr
+from llm.limits import ModelLimiter
+from utils.tickers import parse_ticker_line, parse_tickers
+from config.settings import (
+    STUB_LATENCY_DISTRIBUTION,
+    STUB_LATENCY_MS,
+    STUB_LATENCY_SPREAD,
+    STUB_SEED,
+    STUB_TOOL_CALLS_PER_TURN,
+    STUB_LATENCY_MS_PER_TICKER,
+)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+_AGENT_NAME = re.compile(r'Your internal name is "([^"]+)"')
+_KNOWN_RESULT = re.compile(r'"(\w+)": \{"status": "success"')
+_CHARS_PER_TOKEN = 4
+
+
+def load_script(path: str) -> Dict[str, Dict[str, Any]]:
+    """Load a stub response script.
+
+    Args:
+        path: Path of a JSON file mapping agent names to responses
+
+    Returns:
+        Agent name -> scripted response
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _texts(contents: List[types.Content]) -> List[str]:
+    return [part.text for content in contents for part in content.parts or [] if part.text]
+
+
+def extract_tickers(contents: List[types.Content]) -> List[str]:
+    """Find the tickers a conversation is about.
+
+    The query agent's "Tickers: ..." line wins; otherwise upper-case words
+    of the conversation are taken as tickers.
+
+    Args:
+        contents: Conversation of the request
+
+    Returns:
+        Ticker symbols in order of first mention
+    """
+    texts = _texts(contents)
+    for text in reversed(texts):
+        tickers = parse_ticker_line(text)
+        if tickers is not None:
+            return tickers
+    return parse_tickers("\n".join(texts))
+
+
+def _instruction_tickers(instruction: str) -> Optional[List[str]]:
+    """Tickers of a line starting with "Tickers:" in an instruction."""
+    for line in instruction.splitlines():
+        if line.startswith("Tickers:"):
+            return parse_ticker_line(line)
+    return None
+
+
+def _instruction(llm_request: LlmRequest) -> str:
+    instruction = getattr(llm_request.config, "system_instruction", None) or ""
+    if isinstance(instruction, types.Content):
+        return " ".join(_texts([instruction]))
+    return str(instruction)
+
+
+def _agent_name(llm_request: LlmRequest) -> str:
+    match = _AGENT_NAME.search(_instruction(llm_request))
+    return match.group(1) if match else "Agent"
+
+
+def _fill(value: Any, fields: Dict[str, Any]) -> Any:
+    if value == "{tickers}":
+        return list(fields["ticker_list"])
+    if isinstance(value, str):
+        return value.format(**fields)
+    return value
+
+
+class StubLlm(BaseLlm):
+    """Local model that replies with scripted or templated responses."""
+
+    script: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    latency_distribution: str = STUB_LATENCY_DISTRIBUTION
+    latency_ms: float = STUB_LATENCY_MS
+    latency_spread: float = STUB_LATENCY_SPREAD
+    seed: int = STUB_SEED
+    tool_calls_per_turn: int = STUB_TOOL_CALLS_PER_TURN
+    latency_ms_per_ticker: float = STUB_LATENCY_MS_PER_TICKER
+
+    _limiter: Optional[ModelLimiter] = PrivateAttr(default=None)
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution {self.latency_distribution!r}, "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        self._rng = random.Random(self.seed)
+
+    def sample_latency(self, latency_ms: Optional[float] = None) -> float:
+        """Draw the latency of one response.
+
+        Args:
+            latency_ms: Center of the distribution (defaults to latency_ms)
+
+        Returns:
+            Latency in seconds
+        """
+        center = self.latency_ms if latency_ms is None else latency_ms
+        if center <= 0:
+            return 0.0
+        if self.latency_distribution == "uniform":
+            center *= 1 + self._rng.uniform(-self.latency_spread, self.latency_spread)
+        elif self.latency_distribution == "lognormal":
+            center *= math.exp(self._rng.gauss(0.0, self.latency_spread))
+        return max(center, 0.0) / 1000
+
+    def _default_tool_calls(self, llm_request: LlmRequest, tickers: List[str]) -> List[Dict[str, Any]]:
+        if not tickers:
+            return []
+        wanted = "ticker" if len(tickers) == 1 else "tickers"
+        known = set(_KNOWN_RESULT.findall(_instruction(llm_request)))
+        calls = []
+        for name, tool in llm_request.tools_dict.items():
+            func = getattr(tool, "func", None)
+            if func is None or name in known or f"{name}_batch" in known:
+                continue
+            required = [
+                parameter.name
+                for parameter in inspect.signature(func).parameters.values()
+                if parameter.default is inspect.Parameter.empty
+            ]
+            if required == [wanted]:
+                calls.append({"name": name, "args": {wanted: f"{{{wanted}}}"}})
+        return calls
+
+    def _default_text(self, agent: str, tickers: List[str], tool_results: Dict[str, str]) -> str:
+        if agent == "QueryAgent":
+            kind = "multi-ticker" if len(tickers) > 1 else "single-ticker"
+            return f"Tickers: {', '.join(tickers)}\nRequest type: {kind}"
+        summary = f"{agent} summary for {', '.join(tickers) or 'the query'}."
+        if tool_results:
+            summary += " Tools: " + ", ".join(f"{name}={status}" for name, status in tool_results.items())
+        return summary
+
+    def _tickers(self, llm_request: LlmRequest) -> List[str]:
+        tickers = _instruction_tickers(_instruction(llm_request))
+        if tickers is None:
+            tickers = extract_tickers(llm_request.contents or [])
+        return tickers
+
+    def _entry(self, agent: str) -> Dict[str, Any]:
+        return self.script.get(agent, self.script.get("*", {}))
+
+    def respond(self, llm_request: LlmRequest) -> types.Content:
+        """Build the reply to a request without waiting.
+
+        Args:
+            llm_request: Request built by the agent
+
+        Returns:
+            Model content with either function calls or the final text
+        """
+        agent = _agent_name(llm_request)
+        entry = self._entry(agent)
+
+        contents = llm_request.contents or []
+        tickers = self._tickers(llm_request)
+        fields: Dict[str, Any] = {
+            "agent": agent,
+            "ticker": tickers[0] if tickers else "",
+            "tickers": ", ".join(tickers),
+            "ticker_list": tickers,
+        }
+
+        # Tool responses of the current turn, which starts after the last text message
+        responses: List[types.FunctionResponse] = []
+        for content in reversed(contents):
+            parts = content.parts or []
+            if content.role == "user" and any(part.text for part in parts):
+                break
+            responses[:0] = [part.function_response for part in parts if part.function_response]
+
+        calls = entry.get("tool_calls")
+        if calls is None:
+            calls = self._default_tool_calls(llm_request, tickers)
+        answered = {response.name for response in responses}
+        pending = [call for call in calls if call["name"] not in answered]
+        if pending:
+            if self.tool_calls_per_turn > 0:
+                pending = pending[:self.tool_calls_per_turn]
+            return types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        function_call=types.FunctionCall(
+                            name=call["name"],
+                            args={key: _fill(value, fields) for key, value in call.get("args", {}).items()},
+                        )
+                    )
+                    for call in pending
+                ],
+            )
+
+        tool_results = {
+            response.name: str((response.response or {}).get("status", "ok")) for response in responses
+        }
+        if "text" in entry:
+            text = entry["text"].format(**fields, tool_results=json.dumps(tool_results))
+        else:
+            text = self._default_text(agent, tickers, tool_results)
+        return types.Content(role="model", parts=[types.Part(text=text)])
+
+    async def _generate(self, llm_request: LlmRequest) -> LlmResponse:
+        content = self.respond(llm_request)
+        latency_ms = self._entry(_agent_name(llm_request)).get("latency_ms")
+        latency = self.sample_latency(latency_ms)
+        if self.latency_ms_per_ticker > 0 and not content.parts[0].function_call:
+            # Writing about more tickers takes longer to decode
+            latency += self.latency_ms_per_ticker * len(self._tickers(llm_request)) / 1000
+        await asyncio.sleep(latency)
+
+        prompt_chars = sum(len(text) for text in _texts(llm_request.contents or []))
+        output_chars = sum(len(part.text or "") for part in content.parts)
+        prompt_tokens = prompt_chars // _CHARS_PER_TOKEN
+        output_tokens = output_chars // _CHARS_PER_TOKEN
+        return LlmResponse(
+            content=content,
+            model_version=self.model,
+            turn_complete=True,
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self._limiter is None:
+            yield await self._generate(llm_request)
+            return
+        async with self._limiter.slot_async():
+            response = await self._generate(llm_request)
+        yield response
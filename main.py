@@ -1,26 +1,28 @@
-"""Main entry point for the Financial Research Agent."""
+"""Main entry point for the Financial Research Agent.
+
+The ADK runtime, the agents and their tools take seconds to import, so they
+are imported where they are first used: the interactive prompt comes up
+immediately and the agent system is built on the first query.
+"""
+
+from __future__ import annotations
 
 import asyncio
 import os
 import sys
-from typing import Optional, Tuple
-from google.adk.agents import LlmAgent
-from google.adk.apps.app import App, EventsCompactionConfig
-from google.adk.runners import Runner
-from google.adk.sessions import DatabaseSessionService
-from google.adk.memory import InMemoryMemoryService
-from google.genai import types
-from agents.orchestrator_agent import create_orchestrator_agent
-from memory.session_store import get_session_service
-from memory.memory_bank import get_memory_service, save_session_to_memory
+from typing import TYPE_CHECKING, Optional, Tuple
 from config.settings import (
     GOOGLE_API_KEY,
     APP_NAME,
     DEFAULT_USER_ID,
     MEMORY_COMPACTION_INTERVAL,
     MEMORY_OVERLAP_SIZE,
+    REPORT_CACHE_ENABLED,
 )
 
+if TYPE_CHECKING:
+    from google.adk.runners import Runner
+
 
 # Set API key
 if not GOOGLE_API_KEY:
@@ -46,6 +48,12 @@ def setup_agent_system() -> Tuple[Runner, str]:
     Returns:
         Tuple of (Runner instance, app_name)
     """
+    from google.adk.apps.app import App, EventsCompactionConfig
+    from google.adk.runners import Runner
+    from agents.orchestrator_agent import create_orchestrator_agent
+    from memory.session_store import get_session_service
+    from memory.memory_bank import get_memory_service
+
     # Create orchestrator agent
     orchestrator = create_orchestrator_agent()
 
@@ -74,6 +82,26 @@ def setup_agent_system() -> Tuple[Runner, str]:
     return runner, APP_NAME
 
 
+async def _record_cached_turn(session_service, session, query_content, report: str) -> None:
+    """Add a turn answered from the report cache to the session, so follow-ups can refer to it."""
+    from google.adk.events import Event
+    from google.genai import types
+    from agents.report_agent import REPORT_AGENT_NAME
+
+    invocation_id = Event.new_id()
+    await session_service.append_event(
+        session, Event(invocation_id=invocation_id, author="user", content=query_content)
+    )
+    await session_service.append_event(
+        session,
+        Event(
+            invocation_id=invocation_id,
+            author=REPORT_AGENT_NAME,
+            content=types.Content(role="model", parts=[types.Part(text=report)]),
+        ),
+    )
+
+
 async def run_query(
     runner: Runner,
     app_name: str,
@@ -90,6 +118,11 @@ async def run_query(
         user_id: User identifier
         session_id: Optional session ID (creates new if None)
     """
+    from google.genai import types
+    from agents.report_agent import REPORT_AGENT_NAME
+    from memory.memory_bank import save_session_to_memory
+    from tools.report_cache import query_intent, report_cache
+
     if session_id is None:
         import uuid
         session_id = f"session_{uuid.uuid4().hex[:8]}"
@@ -113,31 +146,56 @@ async def run_query(
     # Create message content
     query_content = types.Content(role="user", parts=[types.Part(text=query)])
 
-    # Run agent
-    response_text = ""
-    try:
-        async for event in runner.run_async(
-            user_id=user_id, session_id=session.id, new_message=query_content
-        ):
-            if event.is_final_response() and event.content and event.content.parts:
-                for part in event.content.parts:
-                    if part.text:
-                        response_text += part.text
-                        print(part.text, end="", flush=True)
+    # A repeated query whose market data has not changed is answered from the report cache
+    intent = query_intent(query) if REPORT_CACHE_ENABLED else None
+    cached_report = None
+    if intent is not None:
+        try:
+            cached_report = await asyncio.to_thread(report_cache.get, intent)
+        except Exception as e:
+            print(f"Warning: Could not read the report cache: {e}")
 
+    if cached_report is not None:
+        await _record_cached_turn(session_service, session, query_content, cached_report)
+        response_text = cached_report
+        print(cached_report, end="", flush=True)
         print("\n")
-    except ExceptionGroup as eg:
-        print(f"\n\nError: TaskGroup exception occurred:")
-        for i, exc in enumerate(eg.exceptions):
-            print(f"  Exception {i+1}: {type(exc).__name__}: {exc}")
+    else:
+        # Run agent
+        response_text = ""
+        # Only the final report is cached; the other agents' answers are intermediate
+        report_text = ""
+        try:
+            async for event in runner.run_async(
+                user_id=user_id, session_id=session.id, new_message=query_content
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    for part in event.content.parts:
+                        if part.text:
+                            response_text += part.text
+                            if event.author == REPORT_AGENT_NAME:
+                                report_text += part.text
+                            print(part.text, end="", flush=True)
+
+            print("\n")
+        except ExceptionGroup as eg:
+            print(f"\n\nError: TaskGroup exception occurred:")
+            for i, exc in enumerate(eg.exceptions):
+                print(f"  Exception {i+1}: {type(exc).__name__}: {exc}")
+                import traceback
+                traceback.print_exception(type(exc), exc, exc.__traceback__)
+            raise
+        except Exception as e:
+            print(f"\n\nError: {type(e).__name__}: {e}")
             import traceback
-            traceback.print_exception(type(exc), exc, exc.__traceback__)
-        raise
-    except Exception as e:
-        print(f"\n\nError: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exception(type(e), e, e.__traceback__)
-        raise
+            traceback.print_exception(type(e), e, e.__traceback__)
+            raise
+
+        if intent is not None and report_text:
+            try:
+                await asyncio.to_thread(report_cache.store, intent, report_text)
+            except Exception as e:
+                print(f"Warning: Could not cache the report: {e}")
 
     # Auto-save to memory
     try:
@@ -149,7 +207,7 @@ async def run_query(
 
 
 async def interactive_mode(
-    runner: Runner,
+    runner: Optional[Runner],
     app_name: str,
     initial_user_id: str = DEFAULT_USER_ID,
     initial_session_id: Optional[str] = None,
@@ -157,7 +215,7 @@ async def interactive_mode(
     """Run in interactive CLI mode.
 
     Args:
-        runner: Runner instance
+        runner: Runner instance (built on the first query if None)
         app_name: Application name
         initial_user_id: User identifier to use for the session
         initial_session_id: Optional starting session ID
@@ -184,6 +242,11 @@ async def interactive_mode(
             elif not query:
                 continue
 
+            if runner is None:
+                print("Initializing Financial Research Agent...")
+                runner, app_name = setup_agent_system()
+                print("Agent system ready!\n")
+
             await run_query(runner, app_name, query, user_id, session_id)
 
         except KeyboardInterrupt:
@@ -236,13 +299,11 @@ def main():
 
     args = parser.parse_args()
 
-    # Set up agent system
-    print("Initializing Financial Research Agent...")
-    runner, app_name = setup_agent_system()
-    print("Agent system ready!\n")
-
     # Run query or interactive mode
     if args.query:
+        print("Initializing Financial Research Agent...")
+        runner, app_name = setup_agent_system()
+        print("Agent system ready!\n")
         asyncio.run(
             single_query_mode(
                 runner,
@@ -255,8 +316,8 @@ def main():
     else:
         asyncio.run(
             interactive_mode(
-                runner,
-                app_name,
+                None,
+                APP_NAME,
                 initial_user_id=args.user_id,
                 initial_session_id=args.session_id,
             )
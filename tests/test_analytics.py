@@ -0,0 +1,92 @@
+"""Unit tests for the risk/return analytics kernel."""
+
+import unittest
+import numpy as np
+import pandas as pd
+from tools.analytics import risk_return_metrics, metrics_for_row
+
+
+def _prices(seed: int, rows: int = 120) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, rows)))
+
+
+class TestRiskReturnMetrics(unittest.TestCase):
+    """Test cases for risk_return_metrics."""
+
+    def test_matches_pandas_reference(self):
+        """Test that the kernel agrees with the equivalent pandas pipeline."""
+        close = pd.Series(_prices(1))
+        returns = close.pct_change()
+        metrics = risk_return_metrics(close.to_numpy())
+
+        self.assertAlmostEqual(metrics["daily_volatility"], returns.std())
+        self.assertAlmostEqual(metrics["annualized_volatility"], returns.std() * np.sqrt(252))
+        self.assertAlmostEqual(metrics["average_daily_return"], returns.mean())
+        total = close.iloc[-1] / close.iloc[0] - 1
+        self.assertAlmostEqual(metrics["total_return"], total)
+        self.assertAlmostEqual(metrics["annualized_return"], (1 + total) ** (252 / len(close)) - 1)
+        self.assertAlmostEqual(metrics["max_drawdown"], (close / close.cummax() - 1).min())
+        self.assertAlmostEqual(
+            metrics["sharpe_ratio"], returns.mean() / returns.std() * np.sqrt(252)
+        )
+        downside = np.sqrt((np.minimum(returns.dropna(), 0) ** 2).mean())
+        self.assertAlmostEqual(metrics["downside_deviation"], downside)
+        self.assertAlmostEqual(
+            metrics["calmar_ratio"], metrics["annualized_return"] / -metrics["max_drawdown"]
+        )
+
+    def test_drawdown_dates(self):
+        """Test that the drawdown peak and trough are located correctly."""
+        closes = np.array([10.0, 12.0, 9.0, 11.0, 6.0, 13.0])
+        dates = pd.date_range("2024-01-01", periods=6).strftime("%Y-%m-%d")
+        metrics = risk_return_metrics(closes, dates=dates)
+        self.assertAlmostEqual(metrics["max_drawdown"], 6.0 / 12.0 - 1)
+        self.assertEqual(metrics["max_drawdown_peak"], "2024-01-02")
+        self.assertEqual(metrics["max_drawdown_trough"], "2024-01-05")
+
+    def test_no_drawdown(self):
+        """Test a monotonically rising series."""
+        metrics = risk_return_metrics(np.array([1.0, 2.0, 3.0]))
+        self.assertEqual(metrics["max_drawdown"], 0.0)
+        self.assertIsNone(metrics["max_drawdown_peak"])
+        self.assertTrue(np.isnan(metrics["calmar_ratio"]))
+
+    def test_two_dimensional_matches_rows(self):
+        """Test that a (tickers, time) array scores each row independently."""
+        matrix = np.vstack([_prices(seed) for seed in range(5)])
+        batch = risk_return_metrics(matrix)
+        for row in range(5):
+            single = risk_return_metrics(matrix[row])
+            for key, value in metrics_for_row(batch, row).items():
+                if value is None:
+                    self.assertIsNone(single[key])
+                else:
+                    self.assertAlmostEqual(value, single[key], msg=key)
+
+    def test_late_start_and_gaps(self):
+        """Test rows that start late or have missing bars."""
+        prices = _prices(3, rows=60)
+        late = prices.copy()
+        late[:20] = np.nan
+        gapped = prices.copy()
+        gapped[30] = np.nan
+        batch = risk_return_metrics(np.vstack([late, gapped]))
+
+        reference = risk_return_metrics(prices[20:])
+        self.assertAlmostEqual(batch["total_return"][0], reference["total_return"])
+        self.assertAlmostEqual(batch["daily_volatility"][0], reference["daily_volatility"])
+        self.assertEqual(batch["observations"][1], 59)
+        self.assertAlmostEqual(batch["total_return"][1], prices[-1] / prices[0] - 1)
+
+    def test_large_universe(self):
+        """Test that a 500-ticker universe is scored in one call."""
+        rng = np.random.default_rng(0)
+        matrix = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (500, 252)), axis=1))
+        metrics = risk_return_metrics(matrix)
+        self.assertEqual(metrics["sharpe_ratio"].shape, (500,))
+        self.assertFalse(np.isnan(metrics["daily_volatility"]).any())
+
+
+if __name__ == "__main__":
+    unittest.main()
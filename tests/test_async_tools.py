@@ -0,0 +1,63 @@
+"""Unit tests for the async tool variants."""
+
+import asyncio
+import inspect
+import threading
+import time
+import unittest
+from google.adk.tools import FunctionTool
+from tools.async_tools import make_async, fetch_price_history_async, tool_executor
+from tools.market_data_tool import fetch_price_history
+
+
+def slow_tool(ticker: str, delay: float = 0.2) -> dict:
+    """Sleeps like a slow network call."""
+    time.sleep(delay)
+    return {"status": "success", "data": {"ticker": ticker, "thread": threading.current_thread().name}}
+
+
+class TestAsyncTools(unittest.TestCase):
+    """Test cases for running blocking tools off the event loop."""
+
+    def test_wrapper_keeps_tool_declaration(self):
+        """Test that the async variant looks like the original to the model."""
+        self.assertTrue(inspect.iscoroutinefunction(fetch_price_history_async))
+        self.assertEqual(fetch_price_history_async.__name__, "fetch_price_history")
+        self.assertEqual(fetch_price_history_async.__doc__, fetch_price_history.__doc__)
+        self.assertEqual(
+            FunctionTool(fetch_price_history_async)._get_declaration(),
+            FunctionTool(fetch_price_history)._get_declaration(),
+        )
+
+    def test_calls_run_concurrently_off_the_loop(self):
+        """Test that blocking calls overlap and the event loop stays responsive."""
+        slow_tool_async = make_async(slow_tool)
+        ticks = []
+
+        async def heartbeat():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        async def main():
+            return await asyncio.gather(
+                *(slow_tool_async(t) for t in ["AAPL", "MSFT", "NVDA", "AMD"]), heartbeat()
+            )
+
+        start = time.monotonic()
+        results = asyncio.run(main())
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.2 * 4 / 2)
+        self.assertEqual([r["data"]["ticker"] for r in results[:4]], ["AAPL", "MSFT", "NVDA", "AMD"])
+        self.assertTrue(all(r["data"]["thread"].startswith("tool") for r in results[:4]))
+        # The heartbeat kept ticking while the tools were blocked in threads
+        self.assertLess(ticks[-1] - ticks[0], 0.2)
+
+    def test_executor_is_bounded(self):
+        """Test that the tool pool has a fixed number of workers."""
+        self.assertGreater(tool_executor._max_workers, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
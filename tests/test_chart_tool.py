@@ -2,7 +2,22 @@
 
 import unittest
 import os
-from tools.chart_tool import generate_price_chart
+import tempfile
+import time
+from unittest import mock
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import tools.chart_tool as chart_tool
+from tools.chart_tool import (
+    generate_price_chart,
+    generate_comparison_chart,
+    evict_charts,
+    _draw_candlesticks,
+)
+from tools.data_provider import SyntheticProvider, set_provider
+from tools.price_cache import price_cache
+from tests.test_price_store import use_temporary_price_store
 
 
 class TestChartTool(unittest.TestCase):
@@ -33,6 +48,181 @@ class TestChartTool(unittest.TestCase):
         self.assertIn("error_message", result)
 
 
+class TestCandlesticks(unittest.TestCase):
+    """Test cases for batched candlestick drawing."""
+
+    def test_artist_count_is_constant(self):
+        """Test that candles are drawn with a fixed number of artists."""
+        rows = 2000
+        close = np.linspace(100, 120, rows) + np.sin(np.arange(rows))
+        hist = pd.DataFrame(
+            {"Open": close - np.cos(np.arange(rows)), "Close": close},
+            index=pd.date_range("2024-01-02", periods=rows, freq="h", tz="America/New_York"),
+        )
+        hist["High"] = hist[["Open", "Close"]].max(axis=1) + 0.5
+        hist["Low"] = hist[["Open", "Close"]].min(axis=1) - 0.5
+
+        fig, ax = plt.subplots()
+        try:
+            _draw_candlesticks(ax, hist)
+            self.assertEqual(len(ax.lines), 4)
+            green_wicks = ax.lines[0].get_ydata()
+            rising = hist[hist["Close"] >= hist["Open"]]
+            np.testing.assert_allclose(green_wicks[0::3], rising["Low"])
+            np.testing.assert_allclose(green_wicks[1::3], rising["High"])
+            self.assertTrue(np.isnan(green_wicks[2::3]).all())
+        finally:
+            plt.close(fig)
+
+
+class TestChartCache(unittest.TestCase):
+    """Test cases for content-addressed charts and the render pool (offline)."""
+
+    def setUp(self):
+        """Serve synthetic bars and write charts to a temporary directory."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = tmp.name
+        self.hist = SyntheticProvider().history("AAPL", period="3mo")
+        patcher = mock.patch.object(chart_tool, "get_price_history", side_effect=lambda *a, **k: self.hist.copy())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_request_reuses_chart(self):
+        """Test that identical requests return the same file without rendering."""
+        with mock.patch.object(chart_tool, "CHART_RENDER_WORKERS", 0):
+            first = generate_price_chart("AAPL", period="3mo", output_dir=self.output_dir)
+            with mock.patch.object(chart_tool, "_render_chart") as render:
+                second = generate_price_chart("AAPL", period="3mo", output_dir=self.output_dir)
+            render.assert_not_called()
+        self.assertEqual(first["status"], "success")
+        self.assertFalse(first["data"]["cached"])
+        self.assertTrue(second["data"]["cached"])
+        self.assertEqual(first["chart_path"], second["chart_path"])
+        self.assertTrue(os.path.getsize(first["chart_path"]) > 0)
+
+    def test_long_history_is_downsampled(self):
+        """Test that the plotted resolution is reduced and reported."""
+        self.hist = SyntheticProvider().history("AAPL", period="max")
+        with mock.patch.object(chart_tool, "CHART_RENDER_WORKERS", 0):
+            line = generate_price_chart("AAPL", period="max", output_dir=self.output_dir)
+            candles = generate_price_chart(
+                "AAPL", period="max", chart_type="candlestick", output_dir=self.output_dir
+            )
+        self.assertEqual(line["data"]["resolution"]["method"], "lttb")
+        self.assertLess(line["data"]["resolution"]["plotted_points"], len(self.hist))
+        resolution = candles["data"]["resolution"]
+        self.assertEqual(resolution["method"], "ohlc")
+        self.assertEqual(resolution["interval"], f"{resolution['bars_per_candle']}d")
+        self.assertEqual(line["data"]["data_points"], len(self.hist))
+
+    def test_new_bar_or_chart_type_changes_key(self):
+        """Test that the chart is re-rendered for new data or another chart type."""
+        with mock.patch.object(chart_tool, "CHART_RENDER_WORKERS", 0):
+            line = generate_price_chart("AAPL", period="3mo", output_dir=self.output_dir)
+            candles = generate_price_chart(
+                "AAPL", period="3mo", chart_type="candlestick", output_dir=self.output_dir
+            )
+            self.hist.iloc[-1, self.hist.columns.get_loc("Close")] += 1.0
+            updated = generate_price_chart("AAPL", period="3mo", output_dir=self.output_dir)
+        paths = {line["chart_path"], candles["chart_path"], updated["chart_path"]}
+        self.assertEqual(len(paths), 3)
+        self.assertFalse(updated["data"]["cached"])
+
+    def test_render_in_process_pool(self):
+        """Test rendering through the worker process pool."""
+        with mock.patch.object(chart_tool, "CHART_RENDER_WORKERS", 2), mock.patch.object(
+            chart_tool, "_render_pool", None
+        ):
+            result = generate_price_chart(
+                "AAPL", period="3mo", chart_type="candlestick", output_dir=self.output_dir
+            )
+            chart_tool._render_pool.shutdown()
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(os.path.exists(result["chart_path"]))
+        self.assertEqual([f for f in os.listdir(self.output_dir) if f.endswith(".tmp")], [])
+
+    def test_eviction_by_age_then_size(self):
+        """Test that expired charts go first, then least recently used ones."""
+        for digit, age in [("0", 10_000), ("a", 300), ("b", 200), ("c", 100)]:
+            self.write_file(f"AAPL_1mo_{digit * 20}.png", age)
+
+        removed = evict_charts(self.output_dir, max_bytes=200, max_age=1_000)
+        self.assertEqual(removed, 2)
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)), [f"AAPL_1mo_{'b' * 20}.png", f"AAPL_1mo_{'c' * 20}.png"]
+        )
+
+    def test_eviction_skips_foreign_files(self):
+        """Test that images not named by a chart hash are never evicted."""
+        foreign = ["AAPL_1mo_20251127_192816.png", "logo.png"]
+        for name in foreign:
+            self.write_file(name, 10_000)
+        self.write_file(f"AAPL_1mo_{'0' * 20}.png", 10_000)
+
+        self.assertEqual(evict_charts(self.output_dir, max_bytes=0, max_age=1_000), 1)
+        self.assertEqual(sorted(os.listdir(self.output_dir)), foreign)
+
+    def write_file(self, name: str, age: float) -> None:
+        """Write a 100-byte file last used the given number of seconds ago."""
+        path = os.path.join(self.output_dir, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * 100)
+        now = time.time()
+        os.utime(path, (now - age, now - age))
+
+
+class TestComparisonChart(unittest.TestCase):
+    """Test cases for the multi-ticker comparison chart (offline)."""
+
+    def setUp(self):
+        """Route history through the synthetic provider and render inline."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = tmp.name
+        use_temporary_price_store(self)
+        set_provider(SyntheticProvider())
+        price_cache.clear()
+        for patcher in [
+            mock.patch("tools.price_cache.PRICE_STORE_ENABLED", False),
+            mock.patch.object(chart_tool, "CHART_RENDER_WORKERS", 0),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(set_provider, None)
+        self.addCleanup(price_cache.clear)
+
+    def test_one_bulk_fetch_and_one_render(self):
+        """Test that N tickers cost one history download and one render."""
+        tickers = ["AAPL", "MSFT", "NVDA", "AMD", "INTC", "TSLA", "F", "GM", "JPM", "XOM"]
+        bulk = mock.patch.object(price_cache, "bulk_loader", wraps=price_cache.bulk_loader)
+        render = mock.patch.object(
+            chart_tool, "_render_comparison_chart", wraps=chart_tool._render_comparison_chart
+        )
+        with bulk as bulk, render as render:
+            result = generate_comparison_chart(tickers + ["BAD_TICKER_1"], output_dir=self.output_dir)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(bulk.call_count, 1)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(os.listdir(self.output_dir), [os.path.basename(result["chart_path"])])
+
+        data = result["data"]
+        self.assertEqual(data["tickers"], tickers)
+        self.assertIn("BAD_TICKER_1", data["errors"])
+        returns = {t: p["total_return"] for t, p in data["performance"].items()}
+        self.assertEqual(data["best_performer"], max(returns, key=returns.get))
+
+        again = generate_comparison_chart(tickers, output_dir=self.output_dir)
+        self.assertTrue(again["data"]["cached"])
+        self.assertEqual(again["chart_path"], result["chart_path"])
+
+    def test_no_valid_tickers(self):
+        """Test comparison chart without any loadable ticker."""
+        result = generate_comparison_chart(["INVALID_TICKER_XYZ123"], output_dir=self.output_dir)
+        self.assertEqual(result["status"], "error")
+        self.assertIn("error_message", result)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,92 @@
+"""Tests for the conditional pipeline stage."""
+
+import unittest
+import asyncio
+from unittest import mock
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from agents import conditional_agent
+from agents.conditional_agent import ConditionalAgent
+from llm.registry import ModelRegistry
+
+MODEL = "stub/gemini-2.5-flash-lite"
+
+
+def run_stage(agent: ConditionalAgent, state: dict):
+    runner = InMemoryRunner(agent=agent, app_name="conditional_test")
+
+    async def run():
+        session = await runner.session_service.create_session(
+            app_name="conditional_test", user_id="u", state=state
+        )
+        message = types.Content(role="user", parts=[types.Part(text="Research NVDA")])
+        events = [
+            event async for event in runner.run_async(user_id="u", session_id=session.id, new_message=message)
+        ]
+        session = await runner.session_service.get_session(
+            app_name="conditional_test", user_id="u", session_id=session.id
+        )
+        return events, session.state
+
+    return asyncio.run(run())
+
+
+class TestConditionalAgent(unittest.TestCase):
+    """Test cases for ConditionalAgent."""
+
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        patch = mock.patch.object(conditional_agent, "tracer", provider.get_tracer(__name__))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def make_stage(self) -> ConditionalAgent:
+        return ConditionalAgent(
+            name="ComparisonStage",
+            sub_agents=[
+                LlmAgent(
+                    name="ComparisonAgent",
+                    model=self.registry.get(MODEL),
+                    instruction="Compare.",
+                    output_key="comparison_analysis",
+                )
+            ],
+            run_if=lambda state: state.get("ticker_count") != 1,
+            skip_reason="single-ticker query",
+        )
+
+    def test_runs_when_condition_holds(self):
+        """The sub-agent runs and nothing is marked as skipped."""
+        events, state = run_stage(self.make_stage(), {"ticker_count": 2})
+        self.assertEqual([event.author for event in events], ["ComparisonAgent"])
+        self.assertEqual(state["comparison_analysis"], "ComparisonAgent summary for NVDA.")
+        self.assertEqual(self.registry.stats()[MODEL]["requests"], 1)
+        self.assertEqual(self.exporter.get_finished_spans(), ())
+
+    def test_skips_when_condition_fails(self):
+        """A skipped stage calls no model but shows up in events and traces."""
+        events, state = run_stage(
+            self.make_stage(), {"ticker_count": 1, "comparison_analysis": "From an earlier query"}
+        )
+        self.assertEqual([event.author for event in events], ["ComparisonStage"])
+        self.assertEqual(
+            events[0].custom_metadata,
+            {"skipped_agents": ["ComparisonAgent"], "skip_reason": "single-ticker query"},
+        )
+        self.assertEqual(state["comparison_analysis"], "")
+        self.assertEqual(self.registry.stats()[MODEL]["requests"], 0)
+
+        spans = self.exporter.get_finished_spans()
+        self.assertEqual([span.name for span in spans], ["skip_agent ComparisonAgent"])
+        self.assertEqual(spans[0].attributes["skip.reason"], "single-ticker query")
+
+
+if __name__ == "__main__":
+    unittest.main()
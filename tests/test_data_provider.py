@@ -0,0 +1,126 @@
+"""Unit tests for the market data providers."""
+
+import unittest
+import pandas as pd
+from tools.data_provider import SyntheticProvider, create_provider, period_start, set_provider
+from tools.price_cache import get_price_history, price_cache
+from tools.indicators import indicator_engine
+from tools.market_data_tool import fetch_price_history, compute_volatility
+from tools.ratio_tool import calculate_valuation_metrics
+from tests.test_price_store import use_temporary_price_store
+from tests.test_ratio_tool import use_temporary_fundamentals_db
+
+
+class TestPeriodStart(unittest.TestCase):
+    """Test cases for period_start."""
+
+    def test_periods(self):
+        """Test calendar, year-to-date and trading-day periods."""
+        now = pd.Timestamp("2026-10-17 15:00", tz="UTC")
+        self.assertEqual(period_start("ytd", now), pd.Timestamp("2026-01-01", tz="UTC"))
+        self.assertEqual(period_start("3mo", now), pd.Timestamp("2026-07-17 15:00", tz="UTC"))
+        self.assertIsNone(period_start("5d", now))
+        self.assertIsNone(period_start("max", now))
+        with self.assertRaises(ValueError):
+            period_start("qtd", now)
+
+
+class TestSyntheticProvider(unittest.TestCase):
+    """Test cases for the offline synthetic provider."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.provider = SyntheticProvider(seed=7)
+
+    def test_history_is_deterministic(self):
+        """Test that the same seed yields the same bars."""
+        first = self.provider.history("AAPL", period="1mo")
+        second = SyntheticProvider(seed=7).history("AAPL", period="1mo")
+        pd.testing.assert_frame_equal(first, second)
+        self.assertFalse(first.empty)
+
+    def test_periods_overlap_consistently(self):
+        """Test that a shorter period is a suffix of a longer one."""
+        year = self.provider.history("MSFT", period="1y")
+        week = self.provider.history("MSFT", period="5d")
+        self.assertEqual(len(week), 5)
+        pd.testing.assert_frame_equal(week, year.iloc[-5:])
+
+    def test_start_returns_bars_from_start(self):
+        """Test incremental requests from a start timestamp."""
+        year = self.provider.history("MSFT", period="1y")
+        delta = self.provider.history("MSFT", start=year.index[-3])
+        pd.testing.assert_frame_equal(delta, year.iloc[-3:])
+
+    def test_ytd_history(self):
+        """Test that "ytd" covers only the current year."""
+        hist = self.provider.history("AAPL", period="ytd")
+        self.assertFalse(hist.empty)
+        self.assertEqual(hist.index[0].year, pd.Timestamp.now(tz="UTC").year)
+
+    def test_ohlc_is_consistent(self):
+        """Test that high/low bound open and close."""
+        bars = self.provider.history("TSLA", period="1y")
+        self.assertTrue((bars["High"] >= bars[["Open", "Close"]].max(axis=1)).all())
+        self.assertTrue((bars["Low"] <= bars[["Open", "Close"]].min(axis=1)).all())
+
+    def test_intraday_history(self):
+        """Test intraday bars within trading sessions."""
+        bars = self.provider.history("NVDA", period="5d", interval="5m")
+        self.assertEqual(len(bars), 5 * 78)
+
+    def test_invalid_ticker_has_no_data(self):
+        """Test that malformed symbols behave like unknown tickers."""
+        self.assertTrue(self.provider.history("INVALID_TICKER_XYZ123").empty)
+        self.assertEqual(self.provider.info("INVALID_TICKER_XYZ123"), {})
+
+    def test_bulk_history(self):
+        """Test bulk history omits unknown tickers."""
+        frames = self.provider.bulk_history(["TSLA", "F", "BAD_TICKER_1"], period="1mo")
+        self.assertEqual(set(frames), {"TSLA", "F"})
+
+    def test_unknown_provider_name(self):
+        """Test that an unknown provider name is rejected."""
+        with self.assertRaises(ValueError):
+            create_provider("nope")
+
+
+class TestToolsWithSyntheticProvider(unittest.TestCase):
+    """Test that the tools run offline through the synthetic provider."""
+
+    def setUp(self):
+        """Route the tools through the synthetic provider."""
+        set_provider(SyntheticProvider())
+        price_cache.clear()
+        indicator_engine.reset()
+        use_temporary_fundamentals_db(self)
+        use_temporary_price_store(self)
+        self.addCleanup(set_provider, None)
+        self.addCleanup(price_cache.clear)
+        self.addCleanup(indicator_engine.reset)
+
+    def test_market_data_tools(self):
+        """Test market data tools offline."""
+        result = fetch_price_history("AAPL", period="3mo")
+        self.assertEqual(result["status"], "success")
+        self.assertIsNotNone(result["data"]["sma_20"])
+        self.assertEqual(compute_volatility("AAPL", period="3mo")["status"], "success")
+
+    def test_indicators_cover_the_requested_period(self):
+        """Test that indicators are computed over the requested bars, whatever ran before."""
+        fetch_price_history("AAPL", period="1y")
+        data = fetch_price_history("AAPL", period="3mo")["data"]
+        close = get_price_history("AAPL", period="3mo")["Close"]
+        self.assertAlmostEqual(data["ema_12"], close.ewm(span=12, adjust=False).mean().iloc[-1], places=8)
+        self.assertAlmostEqual(data["sma_20"], close.iloc[-20:].mean(), places=8)
+
+    def test_valuation_metrics(self):
+        """Test valuation metrics offline."""
+        result = calculate_valuation_metrics("AAPL")
+        self.assertEqual(result["status"], "success")
+        self.assertIsNotNone(result["data"]["metrics"]["pe_ratio"])
+        self.assertEqual(calculate_valuation_metrics("INVALID_TICKER_XYZ123")["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
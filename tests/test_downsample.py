@@ -0,0 +1,96 @@
+"""Unit tests for chart downsampling."""
+
+import unittest
+import numpy as np
+import pandas as pd
+from tools.downsample import (
+    lttb_indices,
+    downsample_line,
+    aggregate_ohlc,
+    aggregation_factor,
+    plot_width_pixels,
+)
+
+
+def _bars(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) * 1.01,
+            "Low": np.minimum(open_, close) * 0.99,
+            "Close": close,
+            "Volume": rng.integers(1_000, 10_000, rows),
+        },
+        index=pd.date_range("2020-01-01", periods=rows, freq="min", tz="America/New_York"),
+    )
+
+
+class TestLttb(unittest.TestCase):
+    """Test cases for Largest-Triangle-Three-Buckets."""
+
+    def test_keeps_endpoints_and_count(self):
+        """Test the output size and that the endpoints are kept."""
+        y = np.random.default_rng(1).normal(size=10_000).cumsum()
+        idx = lttb_indices(y, 500)
+        self.assertEqual(len(idx), 500)
+        self.assertEqual((idx[0], idx[-1]), (0, 9_999))
+        self.assertTrue((np.diff(idx) > 0).all())
+
+    def test_keeps_spikes(self):
+        """Test that isolated extremes survive downsampling."""
+        y = np.zeros(10_000)
+        y[3_333] = 50.0
+        y[7_777] = -40.0
+        idx = lttb_indices(y, 100)
+        self.assertIn(3_333, idx)
+        self.assertIn(7_777, idx)
+
+    def test_short_series_unchanged(self):
+        """Test that series shorter than the target are returned whole."""
+        np.testing.assert_array_equal(lttb_indices(np.arange(10.0), 50), np.arange(10))
+
+    def test_downsample_line_envelope(self):
+        """Test that the high/low range still covers every source bar."""
+        bars = _bars(20_000)
+        small = downsample_line(bars, 1_000)
+        self.assertEqual(len(small), 1_000)
+        self.assertEqual(small["High"].max(), bars["High"].max())
+        self.assertEqual(small["Low"].min(), bars["Low"].min())
+        self.assertEqual(small.index[-1], bars.index[-1])
+
+
+class TestOhlcAggregation(unittest.TestCase):
+    """Test cases for OHLC bar aggregation."""
+
+    def test_matches_resample(self):
+        """Test aggregation against pandas resampling of 5 one-minute bars."""
+        bars = _bars(1_000)
+        bars["SMA_20"] = bars["Close"].rolling(20).mean()
+        result = aggregate_ohlc(bars, 5)
+        expected = bars.resample("5min").agg(
+            {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum", "SMA_20": "last"}
+        )
+        pd.testing.assert_frame_equal(result, expected, check_freq=False, check_dtype=False)
+
+    def test_partial_last_bar(self):
+        """Test that a trailing partial group becomes its own bar."""
+        bars = _bars(11)
+        result = aggregate_ohlc(bars, 5)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result["Close"].iloc[-1], bars["Close"].iloc[-1])
+        self.assertEqual(result["Volume"].iloc[-1], bars["Volume"].iloc[-1])
+
+    def test_aggregation_fits_budget(self):
+        """Test that the aggregated bar count fits the pixel budget."""
+        bars = _bars(50_000)
+        max_bars = plot_width_pixels(12, 150) // 4
+        result = aggregate_ohlc(bars, aggregation_factor(len(bars), max_bars))
+        self.assertLessEqual(len(result), max_bars)
+        self.assertEqual(result["High"].max(), bars["High"].max())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""Unit tests for the fundamentals snapshot cache."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from tools.fundamentals_cache import FundamentalsCache, reprice
+from config.settings import (
+    FUNDAMENTALS_PRICE_TTL,
+    FUNDAMENTALS_STATEMENT_TTL,
+    FUNDAMENTALS_MAX_STALE,
+)
+
+
+def _snapshot(price: float = 100.0, roe: float = 0.2) -> dict:
+    return {
+        "ticker": "AAPL",
+        "company_name": "Apple Inc.",
+        "current_price": price,
+        "metrics": {
+            "pe_ratio": 20.0,
+            "price_to_book": 5.0,
+            "market_cap": 1000.0,
+            "enterprise_value": 1100.0,
+            "ev_to_ebitda": 11.0,
+            "roe": roe,
+            "free_cash_flow": 50.0,
+        },
+    }
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestReprice(unittest.TestCase):
+    """Test cases for re-deriving price-dependent fields."""
+
+    def test_price_fields_follow_price(self):
+        """Test that multiples scale and statement fields stay put."""
+        data = reprice(_snapshot(), 110.0)
+        metrics = data["metrics"]
+        self.assertEqual(data["current_price"], 110.0)
+        self.assertAlmostEqual(metrics["pe_ratio"], 22.0)
+        self.assertAlmostEqual(metrics["price_to_book"], 5.5)
+        self.assertAlmostEqual(metrics["market_cap"], 1100.0)
+        # Net debt (100) is unchanged, EBITDA (100) is unchanged
+        self.assertAlmostEqual(metrics["enterprise_value"], 1200.0)
+        self.assertAlmostEqual(metrics["ev_to_ebitda"], 12.0)
+        self.assertEqual(metrics["roe"], 0.2)
+        self.assertEqual(metrics["free_cash_flow"], 50.0)
+
+    def test_missing_fields_are_kept(self):
+        """Test that None metrics survive repricing."""
+        snapshot = _snapshot()
+        snapshot["metrics"]["pe_ratio"] = None
+        self.assertIsNone(reprice(snapshot, 120.0)["metrics"]["pe_ratio"])
+
+
+class TestFundamentalsCache(unittest.TestCase):
+    """Test cases for the SQLite-backed snapshot cache."""
+
+    def setUp(self):
+        """Set up a cache over a temporary database."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_path = os.path.join(tmp.name, "cache.db")
+        self.clock = FakeClock()
+        self.loads = []
+        self.prices = {"AAPL": 110.0}
+        self.cache = FundamentalsCache(
+            loader=self.load,
+            db_path=self.db_path,
+            price_loader=self.prices.get,
+            clock=self.clock,
+        )
+
+    def load(self, ticker):
+        self.loads.append(ticker)
+        return _snapshot(roe=0.2 + 0.01 * len(self.loads)) if ticker.upper() == "AAPL" else None
+
+    def test_miss_loads_and_persists(self):
+        """Test that a miss downloads once and survives a new cache instance."""
+        first = self.cache.get("aapl")
+        self.assertEqual(self.loads, ["aapl"])
+        self.assertFalse(first["freshness"]["stale"])
+
+        reopened = FundamentalsCache(loader=self.load, db_path=self.db_path, clock=self.clock)
+        second = reopened.get("AAPL")
+        self.assertEqual(len(self.loads), 1)
+        self.assertEqual(second["metrics"], first["metrics"])
+
+    def test_unknown_ticker_is_not_cached(self):
+        """Test that tickers without data are not stored."""
+        self.assertIsNone(self.cache.get("NOPE"))
+        self.assertIsNone(self.cache.lookup("NOPE"))
+
+    def test_stale_prices_are_served_then_repriced(self):
+        """Test stale-while-revalidate for price-derived fields."""
+        self.cache.get("AAPL")
+        self.clock.now += FUNDAMENTALS_PRICE_TTL + 1
+
+        stale = self.cache.lookup("AAPL")
+        self.assertTrue(stale["freshness"]["stale"])
+        self.assertEqual(stale["metrics"]["pe_ratio"], 20.0)
+
+        self.cache.wait_for_refreshes()
+        fresh = self.cache.lookup("AAPL")
+        self.assertFalse(fresh["freshness"]["stale"])
+        self.assertAlmostEqual(fresh["metrics"]["pe_ratio"], 22.0)
+        self.assertEqual(fresh["current_price"], 110.0)
+        # Statement fields were not re-downloaded
+        self.assertEqual(self.loads, ["AAPL"])
+
+    def test_stale_statements_are_reloaded_in_background(self):
+        """Test that old statement fields trigger a full background reload."""
+        self.cache.get("AAPL")
+        self.clock.now += FUNDAMENTALS_STATEMENT_TTL + 1
+
+        stale = self.cache.get("AAPL")
+        self.assertTrue(stale["freshness"]["stale"])
+        self.assertAlmostEqual(stale["metrics"]["roe"], 0.21)
+
+        self.cache.wait_for_refreshes()
+        self.assertEqual(self.loads, ["AAPL", "AAPL"])
+        self.assertAlmostEqual(self.cache.lookup("AAPL")["metrics"]["roe"], 0.22)
+
+    def test_too_old_snapshot_blocks(self):
+        """Test that snapshots beyond the maximum staleness are reloaded inline."""
+        self.cache.get("AAPL")
+        self.clock.now += FUNDAMENTALS_MAX_STALE + 1
+        self.assertIsNone(self.cache.lookup("AAPL"))
+        result = self.cache.get("AAPL")
+        self.assertFalse(result["freshness"]["stale"])
+        self.assertEqual(len(self.loads), 2)
+
+    def test_refreshes_are_deduplicated(self):
+        """Test that concurrent stale reads schedule a single refresh."""
+        self.cache.get("AAPL")
+        self.clock.now += FUNDAMENTALS_STATEMENT_TTL + 1
+        release = threading.Event()
+        original = self.cache.loader
+
+        def blocking_load(ticker):
+            release.wait(5)
+            return original(ticker)
+
+        self.cache.loader = blocking_load
+        for _ in range(5):
+            self.cache.lookup("AAPL")
+        release.set()
+        self.cache.wait_for_refreshes()
+        self.assertEqual(len(self.loads), 2)
+
+    def test_table_is_created_in_database(self):
+        """Test that snapshots live in the fundamentals_cache table."""
+        self.cache.get("AAPL")
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT ticker FROM fundamentals_cache").fetchall()
+        self.assertEqual(rows, [("AAPL",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Unit tests for the streaming indicator engine."""
+
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from tools.indicators import IndicatorEngine, IndicatorState
+
+
+def _bars(rows: int = 120, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, rows)))
+    index = pd.date_range("2024-01-02", periods=rows, freq="B", tz="America/New_York")
+    return pd.DataFrame(
+        {"High": close * 1.01, "Low": close * 0.99, "Close": close}, index=index
+    )
+
+
+def _reference(frame: pd.DataFrame) -> dict:
+    """Full-history pandas computation of the same indicators."""
+    close = frame["Close"]
+    sma = close.rolling(20).mean()
+    std = close.rolling(20).std()
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    change = close.diff().dropna()
+    avg_gain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    prev_close = close.shift()
+    true_range = pd.concat(
+        [
+            frame["High"] - frame["Low"],
+            (frame["High"] - prev_close).abs(),
+            (frame["Low"] - prev_close).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    return {
+        "sma_20": sma.iloc[-1],
+        "ema_12": close.ewm(span=12, adjust=False).mean().iloc[-1],
+        "rolling_std_20": std.iloc[-1],
+        "macd": macd.iloc[-1],
+        "macd_signal": signal.iloc[-1],
+        "rsi_14": 100 - 100 / (1 + avg_gain.iloc[-1] / avg_loss.iloc[-1]),
+        "bollinger_upper": sma.iloc[-1] + 2 * std.iloc[-1],
+        "atr_14": true_range.ewm(alpha=1 / 14, adjust=False).mean().iloc[-1],
+    }
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    """Test cases for the indicator engine."""
+
+    def setUp(self):
+        """Set up a fresh engine."""
+        self.engine = IndicatorEngine()
+
+    def assertIndicatorsEqual(self, values, expected):
+        for key, value in expected.items():
+            self.assertAlmostEqual(values[key], value, places=8, msg=key)
+
+    def test_matches_full_recomputation(self):
+        """Test that streamed values equal a full pandas recomputation."""
+        bars = _bars()
+        values = self.engine.sync("AAPL", "1d", bars)
+        self.assertIndicatorsEqual(values, _reference(bars))
+
+    def test_incremental_updates(self):
+        """Test that a growing frame only applies its new bars."""
+        bars = _bars()
+        self.engine.sync("AAPL", "1d", bars.iloc[:60])
+        with mock.patch.object(IndicatorState, "update", autospec=True, side_effect=IndicatorState.update) as update:
+            for end in range(61, len(bars) + 1):
+                values = self.engine.sync("AAPL", "1d", bars.iloc[:end])
+        self.assertIndicatorsEqual(values, _reference(bars))
+        # The last seen bar is re-applied once per call in case it was revised
+        self.assertEqual(update.call_count, 2 * (len(bars) - 60))
+
+    def test_revised_last_bar_replaces_it(self):
+        """Test that an updated forming bar is replaced, not appended."""
+        bars = _bars()
+        provisional = bars.copy()
+        provisional.iloc[-1, provisional.columns.get_loc("Close")] *= 1.05
+        self.engine.sync("AAPL", "1d", provisional)
+        values = self.engine.sync("AAPL", "1d", bars)
+        self.assertIndicatorsEqual(values, _reference(bars))
+
+    def test_gap_rebuilds_stream(self):
+        """Test that a frame not connected to the stream rebuilds it."""
+        bars = _bars()
+        self.engine.sync("AAPL", "1d", bars.iloc[:40])
+        later = bars.iloc[70:]
+        values = self.engine.sync("AAPL", "1d", later)
+        self.assertIndicatorsEqual(values, _reference(later))
+
+    def test_adjusted_history_rebuilds_stream(self):
+        """Test that a changed settled bar (e.g. split adjustment) rebuilds."""
+        bars = _bars()
+        self.engine.sync("AAPL", "1d", bars)
+        adjusted = bars / 2
+        values = self.engine.sync("AAPL", "1d", adjusted)
+        self.assertIndicatorsEqual(values, _reference(adjusted))
+
+    def test_not_enough_bars(self):
+        """Test that indicators without enough history are None."""
+        values = self.engine.sync("AAPL", "1d", _bars(rows=10))
+        self.assertIsNone(values["sma_20"])
+        self.assertIsNone(values["macd"])
+        self.assertIsNotNone(values["ema_12"])
+
+    def test_values_depend_only_on_frame(self):
+        """Test that a shorter period is computed over its own bars, whatever ran before."""
+        bars = _bars(rows=250)
+        month = bars.iloc[-21:]
+        self.engine.sync("AAPL", "1d", bars)
+        values = self.engine.sync("AAPL", "1d", month)
+        self.assertEqual(values, IndicatorEngine().sync("AAPL", "1d", month))
+        self.assertAlmostEqual(
+            values["ema_12"], month["Close"].ewm(span=12, adjust=False).mean().iloc[-1], places=8
+        )
+        self.assertEqual(self.engine.latest("AAPL", "1d"), values)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Unit tests for deferred imports."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from utils.lazy import lazy_import
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImport(unittest.TestCase):
+    """Test cases for lazy_import."""
+
+    def test_imports_on_first_attribute_access(self):
+        """Test that the module body runs only when an attribute is used."""
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "lazy_target.py"), "w") as f:
+                f.write("LOADED = True\ndef double(x):\n    return 2 * x\n")
+            sys.path.insert(0, tmp)
+            self.addCleanup(sys.path.remove, tmp)
+            self.addCleanup(sys.modules.pop, "lazy_target", None)
+
+            module = lazy_import("lazy_target")
+            self.assertNotIn("lazy_target", sys.modules)
+            self.assertEqual(module.double(2), 4)
+            self.assertIn("lazy_target", sys.modules)
+            self.assertTrue(module.LOADED)
+
+    def test_tools_import_without_data_stack(self):
+        """Test that importing the tools does not load pandas or matplotlib."""
+        code = (
+            "import sys, tools.async_tools; "
+            "print(','.join(m for m in ('numpy', 'pandas', 'matplotlib') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
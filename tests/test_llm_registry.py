@@ -0,0 +1,168 @@
+"""Tests for the shared model registry and per-model limits."""
+
+import unittest
+import asyncio
+import threading
+import time
+from unittest import mock
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from llm.limits import ModelLimiter
+from llm.registry import ModelRegistry, PooledGemini
+
+
+class TestModelLimiter(unittest.TestCase):
+    """Test cases for ModelLimiter."""
+
+    def test_rejects_invalid_limit(self):
+        """A limit below one is rejected."""
+        with self.assertRaises(ValueError):
+            ModelLimiter("m", 0)
+
+    def test_caps_threads(self):
+        """Threads never exceed the limit and later ones wait."""
+        limiter = ModelLimiter("m", 2)
+
+        def call():
+            with limiter.slot():
+                time.sleep(0.02)
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = limiter.stats()
+        self.assertEqual(stats["requests"], 6)
+        self.assertEqual(stats["peak_in_flight"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertGreater(stats["waited"], 0)
+
+    def test_caps_coroutines(self):
+        """Coroutines share the same cap without blocking the loop."""
+        limiter = ModelLimiter("m", 3)
+
+        async def call():
+            async with limiter.slot_async():
+                await asyncio.sleep(0.02)
+
+        async def run():
+            await asyncio.gather(*(call() for _ in range(9)))
+
+        asyncio.run(run())
+        stats = limiter.stats()
+        self.assertEqual(stats["requests"], 9)
+        self.assertEqual(stats["peak_in_flight"], 3)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_counts_errors_and_releases_slot(self):
+        """A failing request is counted and gives its slot back."""
+        limiter = ModelLimiter("m", 1)
+        with self.assertRaises(RuntimeError):
+            with limiter.slot():
+                raise RuntimeError("boom")
+        with limiter.slot():
+            pass
+
+        stats = limiter.stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Test cases for ModelRegistry."""
+
+    def test_shares_instance_per_name(self):
+        """The same name returns the same model; other names do not."""
+        registry = ModelRegistry()
+        model = registry.get("gemini-2.5-flash-lite")
+        self.assertIsInstance(model, PooledGemini)
+        self.assertIs(registry.get("gemini-2.5-flash-lite"), model)
+        self.assertIsNot(registry.get("gemini-2.5-flash"), model)
+
+    def test_shares_retry_options(self):
+        """Every model uses the registry's retry options."""
+        registry = ModelRegistry()
+        first = registry.get("a")
+        second = registry.get("b")
+        self.assertIsNotNone(first.retry_options)
+        self.assertIs(first.retry_options, second.retry_options)
+
+    def test_per_model_limits(self):
+        """Configured limits override the default."""
+        registry = ModelRegistry(default_max_concurrency=4, max_concurrency={"slow": 1})
+        self.assertEqual(registry.limiter("slow").max_concurrency, 1)
+        self.assertEqual(registry.limiter("fast").max_concurrency, 4)
+        self.assertIs(registry.limiter("slow"), registry.limiter("slow"))
+        self.assertEqual(set(registry.stats()), {"slow", "fast"})
+
+    def test_model_holds_slot(self):
+        """Model requests go through the model's limiter."""
+        registry = ModelRegistry(max_concurrency={"m": 2})
+        model = registry.get("m")
+
+        async def fake_generate(self, llm_request, stream=False):
+            await asyncio.sleep(0.02)
+            yield LlmResponse()
+
+        async def call():
+            return [response async for response in model.generate_content_async(LlmRequest())]
+
+        async def run():
+            return await asyncio.gather(*(call() for _ in range(5)))
+
+        with mock.patch.object(Gemini, "generate_content_async", fake_generate):
+            results = asyncio.run(run())
+
+        self.assertTrue(all(len(responses) == 1 for responses in results))
+        stats = registry.stats()["m"]
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["peak_in_flight"], 2)
+
+    def test_slot_released_before_yield(self):
+        """A consumer suspended on a response (running tools) holds no slot."""
+        registry = ModelRegistry(max_concurrency={"m": 1})
+        model = registry.get("m")
+
+        async def fake_generate(self, llm_request, stream=False):
+            yield LlmResponse()
+            yield LlmResponse()
+
+        async def run():
+            in_flight = []
+            async for _ in model.generate_content_async(LlmRequest()):
+                in_flight.append(registry.stats()["m"]["in_flight"])
+            return in_flight
+
+        with mock.patch.object(Gemini, "generate_content_async", fake_generate):
+            self.assertEqual(asyncio.run(run()), [0, 0])
+
+    def test_streams_partial_chunks(self):
+        """Partial chunks arrive while the request runs; the final response after the slot is freed."""
+        registry = ModelRegistry(max_concurrency={"m": 1})
+        model = registry.get("m")
+        finished = []
+
+        async def fake_generate(self, llm_request, stream=False):
+            yield LlmResponse(partial=True, custom_metadata={"chunk": 1})
+            yield LlmResponse(partial=True, custom_metadata={"chunk": 2})
+            finished.append(True)
+            yield LlmResponse(custom_metadata={"chunk": 3})
+
+        async def run():
+            seen = []
+            async for response in model.generate_content_async(LlmRequest(), stream=True):
+                seen.append(
+                    (response.custom_metadata["chunk"], bool(finished), registry.stats()["m"]["in_flight"])
+                )
+            return seen
+
+        with mock.patch.object(Gemini, "generate_content_async", fake_generate):
+            self.assertEqual(asyncio.run(run()), [(1, False, 1), (2, False, 1), (3, True, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
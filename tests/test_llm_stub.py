@@ -0,0 +1,226 @@
+"""Tests for the offline stub model."""
+
+import unittest
+import asyncio
+from google.adk.agents import LlmAgent
+from google.adk.models.llm_request import LlmRequest
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import FunctionTool
+from google.genai import types
+from llm.registry import ModelRegistry
+from llm.stub import StubLlm, extract_tickers
+
+
+def lookup(ticker: str) -> dict:
+    """Looks up one ticker."""
+    return {"status": "success", "ticker": ticker}
+
+
+def lookup_batch(tickers: list[str]) -> dict:
+    """Looks up several tickers."""
+    return {"status": "success", "tickers": tickers}
+
+
+def lookup_again(ticker: str) -> dict:
+    """Looks up one ticker a second way."""
+    return {"status": "success", "ticker": ticker}
+
+
+def user(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def response(name: str) -> types.Content:
+    return types.Content(
+        role="user",
+        parts=[types.Part(function_response=types.FunctionResponse(name=name, response={"status": "success"}))],
+    )
+
+
+def request(agent: str, contents, tools=()) -> LlmRequest:
+    return LlmRequest(
+        contents=list(contents),
+        config=types.GenerateContentConfig(
+            system_instruction=f'You are an agent. Your internal name is "{agent}".'
+        ),
+        tools_dict={tool.name: tool for tool in tools},
+    )
+
+
+class TestLatency(unittest.TestCase):
+    """Test cases for the simulated latency."""
+
+    def test_fixed(self):
+        """Fixed latency is the configured value."""
+        model = StubLlm(model="stub/m", latency_ms=250)
+        self.assertEqual(model.sample_latency(), 0.25)
+        self.assertEqual(model.sample_latency(40), 0.04)
+
+    def test_uniform_within_spread(self):
+        """Uniform latency stays within the spread."""
+        model = StubLlm(model="stub/m", latency_ms=100, latency_distribution="uniform", latency_spread=0.2)
+        samples = [model.sample_latency() for _ in range(200)]
+        self.assertTrue(all(0.08 <= sample <= 0.12 for sample in samples))
+        self.assertGreater(len(set(samples)), 1)
+
+    def test_seeded(self):
+        """The same seed draws the same latencies."""
+        first = StubLlm(model="stub/m", latency_ms=100, latency_distribution="lognormal", seed=3)
+        second = StubLlm(model="stub/m", latency_ms=100, latency_distribution="lognormal", seed=3)
+        self.assertEqual(
+            [first.sample_latency() for _ in range(5)],
+            [second.sample_latency() for _ in range(5)],
+        )
+
+    def test_rejects_unknown_distribution(self):
+        """An unknown distribution is rejected."""
+        with self.assertRaises(ValueError):
+            StubLlm(model="stub/m", latency_distribution="pareto")
+
+
+class TestResponses(unittest.TestCase):
+    """Test cases for templated and scripted responses."""
+
+    def test_extract_tickers(self):
+        """The query agent's ticker line wins over other upper-case words."""
+        self.assertEqual(extract_tickers([user("Compare AAPL and MSFT vs AI names")]), ["AAPL", "MSFT"])
+        contents = [user("Research NVDA"), user("For context: [QueryAgent] said: Tickers: NVDA, AMD")]
+        self.assertEqual(extract_tickers(contents), ["NVDA", "AMD"])
+
+    def test_query_agent_text(self):
+        """The query agent lists the tickers and the request type."""
+        content = StubLlm(model="stub/m").respond(request("QueryAgent", [user("Compare AAPL and MSFT")]))
+        self.assertEqual(content.parts[0].text, "Tickers: AAPL, MSFT\nRequest type: multi-ticker")
+
+    def test_calls_matching_tools(self):
+        """Single-ticker tools are called for one ticker, batch tools for several."""
+        tools = [FunctionTool(lookup), FunctionTool(lookup_batch)]
+        model = StubLlm(model="stub/m")
+
+        single = model.respond(request("MarketAgent", [user("Research NVDA")], tools))
+        self.assertEqual([part.function_call.name for part in single.parts], ["lookup"])
+        self.assertEqual(single.parts[0].function_call.args, {"ticker": "NVDA"})
+
+        multi = model.respond(request("MarketAgent", [user("Compare AAPL and MSFT")], tools))
+        self.assertEqual([part.function_call.name for part in multi.parts], ["lookup_batch"])
+        self.assertEqual(multi.parts[0].function_call.args, {"tickers": ["AAPL", "MSFT"]})
+
+    def test_summarizes_tool_results(self):
+        """After the tools answer, the agent replies with text."""
+        response = types.Content(
+            role="user",
+            parts=[types.Part(function_response=types.FunctionResponse(name="lookup", response={"status": "error"}))],
+        )
+        content = StubLlm(model="stub/m").respond(
+            request("MarketAgent", [user("Research NVDA"), response], [FunctionTool(lookup)])
+        )
+        self.assertEqual(content.parts[0].text, "MarketAgent summary for NVDA. Tools: lookup=error")
+
+    def test_instruction_tickers(self):
+        """A tickers line in the instruction overrides the conversation."""
+        llm_request = request("MarketAgent", [user("Tickers: AAPL, MSFT")])
+        llm_request.config.system_instruction = (
+            "Tickers: MSFT\nAnalyze only MSFT.\n\n" + llm_request.config.system_instruction
+        )
+        content = StubLlm(model="stub/m").respond(llm_request)
+        self.assertEqual(content.parts[0].text, "MarketAgent summary for MSFT.")
+
+    def test_tool_calls_per_turn(self):
+        """Tools can be called one per turn, as models often do."""
+        tools = [FunctionTool(lookup), FunctionTool(lookup_batch), FunctionTool(lookup_again)]
+        model = StubLlm(model="stub/m", tool_calls_per_turn=1)
+        contents = [user("Research NVDA")]
+
+        first = model.respond(request("MarketAgent", contents, tools))
+        self.assertEqual([part.function_call.name for part in first.parts], ["lookup"])
+        contents += [first, response("lookup")]
+        second = model.respond(request("MarketAgent", contents, tools))
+        self.assertEqual([part.function_call.name for part in second.parts], ["lookup_again"])
+        contents += [second, response("lookup_again")]
+        final = model.respond(request("MarketAgent", contents, tools))
+        self.assertEqual(final.parts[0].text, "MarketAgent summary for NVDA. Tools: lookup=success, lookup_again=success")
+
+    def test_latency_per_ticker(self):
+        """Text replies about more tickers take longer."""
+        model = StubLlm(model="stub/m", latency_ms_per_ticker=30)
+
+        async def elapsed(text):
+            started = asyncio.get_running_loop().time()
+            async for _ in model.generate_content_async(request("ReportAgent", [user(text)])):
+                pass
+            return asyncio.get_running_loop().time() - started
+
+        self.assertGreaterEqual(asyncio.run(elapsed("Tickers: AAPL, MSFT, NVDA")), 0.09)
+        self.assertLess(asyncio.run(elapsed("Nothing to see")), 0.03)
+
+    def test_script(self):
+        """Scripted tool calls and text replace the templates."""
+        model = StubLlm(
+            model="stub/m",
+            script={
+                "*": {"text": "{agent} on {tickers}"},
+                "MarketAgent": {"tool_calls": [], "text": "Only {ticker}"},
+            },
+        )
+        market = model.respond(request("MarketAgent", [user("Research NVDA")], [FunctionTool(lookup)]))
+        self.assertEqual(market.parts[0].text, "Only NVDA")
+        report = model.respond(request("ReportAgent", [user("Research NVDA")]))
+        self.assertEqual(report.parts[0].text, "ReportAgent on NVDA")
+
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for running agents on the stub."""
+
+    def test_registry_selects_stub(self):
+        """Stub-prefixed names get a stub sharing the limiter machinery."""
+        registry = ModelRegistry()
+        model = registry.get("stub/gemini-2.5-flash-lite")
+        self.assertIsInstance(model, StubLlm)
+        self.assertIs(registry.get("stub/gemini-2.5-flash-lite"), model)
+
+    def test_slot_released_before_yield(self):
+        """The stub gives its slot back before the agent runs the returned tool calls."""
+        registry = ModelRegistry()
+        model = registry.get("stub/gemini-2.5-flash-lite")
+
+        async def run():
+            in_flight = []
+            async for _ in model.generate_content_async(request("MarketAgent", [user("Research NVDA")])):
+                in_flight.append(registry.stats()["stub/gemini-2.5-flash-lite"]["in_flight"])
+            return in_flight
+
+        self.assertEqual(asyncio.run(run()), [0])
+
+    def test_agent_runs_tools(self):
+        """An agent on the stub calls its tools and stores its answer."""
+        registry = ModelRegistry()
+        agent = LlmAgent(
+            name="MarketAgent",
+            model=registry.get("stub/gemini-2.5-flash-lite"),
+            instruction="Analyze the ticker.",
+            tools=[FunctionTool(lookup), FunctionTool(lookup_batch)],
+            output_key="market_analysis",
+        )
+        runner = InMemoryRunner(agent=agent, app_name="stub_test")
+
+        async def run():
+            session = await runner.session_service.create_session(app_name="stub_test", user_id="u")
+            events = [
+                event
+                async for event in runner.run_async(
+                    user_id="u", session_id=session.id, new_message=user("Research NVDA")
+                )
+            ]
+            session = await runner.session_service.get_session(
+                app_name="stub_test", user_id="u", session_id=session.id
+            )
+            return events, session.state
+
+        events, state = asyncio.run(run())
+        self.assertEqual(len(events), 3)
+        self.assertEqual(state["market_analysis"], "MarketAgent summary for NVDA. Tools: lookup=success")
+        self.assertEqual(registry.stats()["stub/gemini-2.5-flash-lite"]["requests"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
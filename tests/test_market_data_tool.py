@@ -1,7 +1,35 @@
 """Unit tests for market data tools."""
 
 import unittest
-from tools.market_data_tool import fetch_price_history, compute_volatility, compute_returns
+from unittest import mock
+import numpy as np
+import pandas as pd
+from tools.market_data_tool import (
+    fetch_price_history,
+    compute_volatility,
+    compute_returns,
+    fetch_price_history_batch,
+    compute_volatility_batch,
+    compute_returns_batch,
+)
+from tools.price_cache import price_cache
+from tools.indicators import indicator_engine
+
+
+def _synthetic_history(seed: int, rows: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-02", periods=rows, freq="B", tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    return pd.DataFrame(
+        {
+            "Open": close * 0.99,
+            "High": close * 1.01,
+            "Low": close * 0.98,
+            "Close": close,
+            "Volume": rng.integers(1_000, 10_000, rows),
+        },
+        index=index,
+    )
 
 
 class TestMarketDataTool(unittest.TestCase):
@@ -36,6 +64,76 @@ class TestMarketDataTool(unittest.TestCase):
         self.assertIn("total_return", result["data"])
 
 
+class TestMarketDataBatchTools(unittest.TestCase):
+    """Test cases for the batch market data tools (offline)."""
+
+    def setUp(self):
+        """Serve synthetic bars instead of downloading."""
+        self.histories = {"TSLA": _synthetic_history(1), "F": _synthetic_history(2)}
+        self.bulk_calls = []
+
+        def bulk_loader(tickers, period, interval):
+            self.bulk_calls.append(list(tickers))
+            return {t: self.histories[t] for t in tickers if t in self.histories}
+
+        def loader(ticker, period, interval):
+            return self.histories.get(ticker, pd.DataFrame())
+
+        price_cache.clear()
+        indicator_engine.reset()
+        patchers = [
+            mock.patch.object(price_cache, "bulk_loader", bulk_loader),
+            mock.patch.object(price_cache, "loader", loader),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(price_cache.clear)
+        self.addCleanup(indicator_engine.reset)
+
+    def test_batch_uses_one_bulk_download(self):
+        """Test that all tickers are fetched in a single bulk call."""
+        result = fetch_price_history_batch(["TSLA", "F", "NOPE"])
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(self.bulk_calls, [["TSLA", "F", "NOPE"]])
+        self.assertEqual(set(result["data"]["tickers"]), {"TSLA", "F"})
+        self.assertIn("NOPE", result["data"]["errors"])
+
+    def test_batch_matches_single_ticker_tools(self):
+        """Test that vectorized batch metrics equal the per-ticker results."""
+        volatility = compute_volatility_batch(["TSLA", "F"])["data"]["tickers"]
+        returns = compute_returns_batch(["TSLA", "F"])["data"]["tickers"]
+        prices = fetch_price_history_batch(["TSLA", "F"])["data"]["tickers"]
+        for ticker in ["TSLA", "F"]:
+            single_vol = compute_volatility(ticker)["data"]
+            single_ret = compute_returns(ticker)["data"]
+            single_price = fetch_price_history(ticker)["data"]
+            for key in ["daily_volatility", "max_drawdown"]:
+                self.assertAlmostEqual(volatility[ticker][key], single_vol[key])
+            for key in ["total_return", "annualized_return", "average_daily_return"]:
+                self.assertAlmostEqual(returns[ticker][key], single_ret[key])
+            for key in ["latest_price", "sma_20", "ema_12"]:
+                self.assertAlmostEqual(prices[ticker][key], single_price[key])
+
+    def test_batch_indicators_with_misaligned_calendars(self):
+        """Test that a date missing for one ticker does not skew its indicators."""
+        # F skips a session three bars from the end, e.g. a trading halt
+        self.histories["F"] = self.histories["F"].drop(self.histories["F"].index[-3])
+        prices = fetch_price_history_batch(["TSLA", "F"])["data"]["tickers"]
+        for ticker in ["TSLA", "F"]:
+            close = self.histories[ticker]["Close"]
+            self.assertAlmostEqual(prices[ticker]["sma_20"], close.iloc[-20:].mean())
+            self.assertAlmostEqual(prices[ticker]["ema_12"], close.ewm(span=12, adjust=False).mean().iloc[-1])
+            self.assertEqual(prices[ticker]["data_points"], len(close))
+            self.assertAlmostEqual(prices[ticker]["sma_20"], fetch_price_history(ticker)["data"]["sma_20"])
+
+    def test_batch_all_invalid(self):
+        """Test batch tools when no ticker has data."""
+        result = compute_returns_batch(["INVALID_TICKER_XYZ123"])
+        self.assertEqual(result["status"], "error")
+        self.assertIn("error_message", result)
+
+
 if __name__ == "__main__":
     unittest.main()
 
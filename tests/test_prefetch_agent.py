@@ -0,0 +1,118 @@
+"""Tests for the prefetch agent."""
+
+import unittest
+import asyncio
+import json
+import time
+from unittest import mock
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from agents import prefetch_agent
+from agents.prefetch_agent import (
+    PREFETCHED_MARKET_KEY,
+    PREFETCHED_VALUATION_KEY,
+    create_prefetch_agent,
+    prefetch_tool_results,
+)
+
+TOOL_DELAY = 0.05
+
+
+def fake_tool(name):
+    async def tool(**arguments):
+        await asyncio.sleep(TOOL_DELAY)
+        return {"status": "success", "data": {"tool": name, **arguments}}
+
+    return tool
+
+
+async def failing_tool(**arguments):
+    raise RuntimeError("provider down")
+
+
+TOOL_NAMES = [
+    "fetch_price_history",
+    "compute_volatility",
+    "compute_returns",
+    "fetch_price_history_batch",
+    "compute_volatility_batch",
+    "compute_returns_batch",
+    "calculate_valuation_metrics",
+    "calculate_valuation_metrics_batch",
+]
+
+
+class TestPrefetchAgent(unittest.TestCase):
+    """Test cases for the prefetch agent."""
+
+    def setUp(self):
+        self.patches = [
+            mock.patch.object(prefetch_agent, f"{name}_async", fake_tool(name)) for name in TOOL_NAMES
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_single_ticker(self):
+        """One ticker uses the single-ticker tools."""
+        state = asyncio.run(prefetch_tool_results(["NVDA"]))
+        market = json.loads(state[PREFETCHED_MARKET_KEY])
+        self.assertEqual(list(market), ["fetch_price_history", "compute_volatility", "compute_returns"])
+        self.assertEqual(market["compute_returns"]["data"], {"tool": "compute_returns", "ticker": "NVDA", "period": "1mo"})
+        valuation = json.loads(state[PREFETCHED_VALUATION_KEY])
+        self.assertEqual(list(valuation), ["calculate_valuation_metrics"])
+
+    def test_multi_ticker_runs_concurrently(self):
+        """Several tickers use the batch tools, all at once."""
+        started = time.perf_counter()
+        state = asyncio.run(prefetch_tool_results(["AAPL", "MSFT"]))
+        self.assertLess(time.perf_counter() - started, 3 * TOOL_DELAY)
+
+        market = json.loads(state[PREFETCHED_MARKET_KEY])
+        self.assertEqual(
+            list(market), ["fetch_price_history_batch", "compute_volatility_batch", "compute_returns_batch"]
+        )
+        self.assertEqual(market["fetch_price_history_batch"]["data"]["tickers"], ["AAPL", "MSFT"])
+
+    def test_tool_error(self):
+        """A failing tool is reported without losing the other results."""
+        with mock.patch.object(prefetch_agent, "compute_volatility_async", failing_tool):
+            state = asyncio.run(prefetch_tool_results(["NVDA"]))
+        market = json.loads(state[PREFETCHED_MARKET_KEY])
+        self.assertEqual(market["compute_volatility"]["status"], "error")
+        self.assertIn("provider down", market["compute_volatility"]["error_message"])
+        self.assertEqual(market["compute_returns"]["status"], "success")
+
+    def test_no_tickers(self):
+        """Without tickers the keys are cleared."""
+        state = asyncio.run(prefetch_tool_results([]))
+        self.assertEqual(state, {PREFETCHED_MARKET_KEY: "", PREFETCHED_VALUATION_KEY: ""})
+
+    def test_agent_writes_state(self):
+        """The agent reads the query analysis and writes the results to state."""
+        runner = InMemoryRunner(agent=create_prefetch_agent(), app_name="prefetch_test")
+
+        async def run():
+            session = await runner.session_service.create_session(
+                app_name="prefetch_test",
+                user_id="u",
+                state={"query_analysis": "Tickers: AAPL, MSFT\nRequest type: multi-ticker"},
+            )
+            message = types.Content(role="user", parts=[types.Part(text="Compare Apple and Microsoft")])
+            async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+                pass
+            session = await runner.session_service.get_session(
+                app_name="prefetch_test", user_id="u", session_id=session.id
+            )
+            return session.state
+
+        state = asyncio.run(run())
+        valuation = json.loads(state[PREFETCHED_VALUATION_KEY])
+        self.assertEqual(valuation["calculate_valuation_metrics_batch"]["data"]["tickers"], ["AAPL", "MSFT"])
+
+
+if __name__ == "__main__":
+    unittest.main()
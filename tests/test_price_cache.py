@@ -0,0 +1,127 @@
+"""Unit tests for the price history cache."""
+
+import unittest
+import threading
+import pandas as pd
+from tools.price_cache import PriceHistoryCache, ttl_for_interval
+
+
+def _make_history(rows: int = 30) -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=rows, freq="B")
+    close = pd.Series(range(100, 100 + rows), index=index, dtype=float)
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1000,
+        }
+    )
+
+
+class CountingLoader:
+    """Loader stub that records how often each key is downloaded."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, period, interval):
+        with self._lock:
+            self.calls.append((ticker, period, interval))
+        return self.frame
+
+
+class TestPriceHistoryCache(unittest.TestCase):
+    """Test cases for the price history cache."""
+
+    def test_repeated_requests_download_once(self):
+        """Test that a second request for the same key is a hit."""
+        loader = CountingLoader(_make_history())
+        cache = PriceHistoryCache(loader=loader)
+        cache.get("aapl", "1mo", "1d")
+        cache.get("AAPL", "1mo", "1d")
+        self.assertEqual(len(loader.calls), 1)
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_returned_frame_is_a_copy(self):
+        """Test that callers adding columns do not mutate the cache."""
+        cache = PriceHistoryCache(loader=CountingLoader(_make_history()))
+        first = cache.get("AAPL")
+        first["Returns"] = first["Close"].pct_change()
+        self.assertNotIn("Returns", cache.get("AAPL").columns)
+
+    def test_empty_history_is_not_cached(self):
+        """Test that empty results are retried on the next request."""
+        loader = CountingLoader(pd.DataFrame())
+        cache = PriceHistoryCache(loader=loader)
+        self.assertTrue(cache.get("BAD").empty)
+        cache.get("BAD")
+        self.assertEqual(len(loader.calls), 2)
+
+    def test_lru_eviction_by_memory(self):
+        """Test that the least recently used entry is evicted first."""
+        frame = _make_history()
+        size = int(frame.memory_usage(deep=True).sum())
+        cache = PriceHistoryCache(max_bytes=size * 2, loader=CountingLoader(frame))
+        cache.get("AAA")
+        cache.get("BBB")
+        cache.get("AAA")
+        cache.get("CCC")
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["size_bytes"], size * 2)
+        misses = stats["misses"]
+        cache.get("AAA")
+        self.assertEqual(cache.stats()["misses"], misses)
+
+    def test_key_locks_do_not_outlive_entries(self):
+        """Test that per-key locks are dropped with their entries."""
+        frame = _make_history()
+        size = int(frame.memory_usage(deep=True).sum())
+        cache = PriceHistoryCache(max_bytes=size * 2, loader=CountingLoader(frame))
+        for ticker in ["AAA", "BBB", "CCC", "DDD"]:
+            cache.get(ticker)
+        self.assertEqual(set(cache._key_locks), set(cache._entries))
+
+        cache.loader = CountingLoader(pd.DataFrame())
+        cache.get("BAD")
+        self.assertNotIn(cache.make_key("BAD", "1mo", "1d"), cache._key_locks)
+
+        cache.clear()
+        self.assertEqual(cache._key_locks, {})
+
+    def test_expired_entries_are_reloaded(self):
+        """Test that entries past their TTL are downloaded again."""
+        loader = CountingLoader(_make_history())
+        cache = PriceHistoryCache(loader=loader)
+        cache.get("AAPL", "5d", "1m")
+        key = cache.make_key("AAPL", "5d", "1m")
+        cache._entries[key].expires_at = 0
+        cache.get("AAPL", "5d", "1m")
+        self.assertEqual(len(loader.calls), 2)
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_ttl_depends_on_interval(self):
+        """Test that intraday data expires sooner than daily data."""
+        self.assertLess(ttl_for_interval("5m"), ttl_for_interval("1d"))
+
+    def test_concurrent_misses_share_one_download(self):
+        """Test that parallel requests for one key trigger one download."""
+        loader = CountingLoader(_make_history())
+        cache = PriceHistoryCache(loader=loader)
+        threads = [threading.Thread(target=cache.get, args=("AAPL",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(loader.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
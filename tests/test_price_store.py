@@ -0,0 +1,152 @@
+"""Unit tests for the persistent price store."""
+
+import unittest
+import shutil
+import tempfile
+from unittest import mock
+import pandas as pd
+from tools.price_store import PriceStore, price_store
+
+
+def use_temporary_price_store(test_case):
+    """Points the shared price store at a throwaway directory for one test."""
+    tmp = tempfile.TemporaryDirectory()
+    test_case.addCleanup(tmp.cleanup)
+    patcher = mock.patch.object(price_store, "root_dir", tmp.name)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+
+
+def _make_bars(end: pd.Timestamp, rows: int) -> pd.DataFrame:
+    index = pd.date_range(end=end, periods=rows, freq="D", tz="America/New_York", name="Date")
+    close = pd.Series(range(rows), index=index, dtype=float) + 100
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1000,
+            "Dividends": 0.0,
+        }
+    )
+
+
+class RecordingFetcher:
+    """Fetcher stub that serves bars from a fixed frame and records requests."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.calls = []
+
+    def __call__(self, ticker, interval, period=None, start=None):
+        self.calls.append({"period": period, "start": start})
+        if start is not None and not self.frame.empty:
+            return self.frame[self.frame.index >= start]
+        return self.frame
+
+
+class TestPriceStore(unittest.TestCase):
+    """Test cases for the price store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.store_dir = tempfile.mkdtemp()
+        self.today = pd.Timestamp.now(tz="America/New_York").normalize()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def test_first_request_downloads_full_period(self):
+        """Test that an empty store fetches the requested period."""
+        fetcher = RecordingFetcher(_make_bars(self.today, 400))
+        store = PriceStore(self.store_dir, fetcher=fetcher)
+        hist = store.get_history("AAPL", period="1y", interval="1d")
+        self.assertEqual(fetcher.calls, [{"period": "1y", "start": None}])
+        self.assertFalse(hist.empty)
+        self.assertEqual(list(hist.columns), ["Open", "High", "Low", "Close", "Volume"])
+
+    def test_restart_fetches_only_new_bars(self):
+        """Test that a held ticker costs one delta fetch after restart."""
+        bars = _make_bars(self.today, 400)
+        PriceStore(self.store_dir, fetcher=RecordingFetcher(bars.iloc[:-3])).get_history(
+            "AAPL", period="1y"
+        )
+
+        fetcher = RecordingFetcher(bars)
+        restarted = PriceStore(self.store_dir, fetcher=fetcher)
+        hist = restarted.get_history("AAPL", period="1y")
+
+        self.assertEqual(len(fetcher.calls), 1)
+        self.assertIsNotNone(fetcher.calls[0]["start"])
+        self.assertEqual(hist.index[-1], bars.index[-1])
+        self.assertEqual(float(hist["Close"].iloc[-1]), float(bars["Close"].iloc[-1]))
+
+    def test_shorter_period_is_served_from_longer_history(self):
+        """Test that a 1mo request after a 1y request needs only a delta."""
+        fetcher = RecordingFetcher(_make_bars(self.today, 400))
+        store = PriceStore(self.store_dir, fetcher=fetcher)
+        store.get_history("AAPL", period="1y")
+        hist = store.get_history("AAPL", period="1mo")
+        self.assertIsNotNone(fetcher.calls[-1]["start"])
+        self.assertLessEqual(len(hist), 32)
+
+    def test_longer_period_backfills(self):
+        """Test that a period reaching past the stored history is fetched in full."""
+        fetcher = RecordingFetcher(_make_bars(self.today, 400))
+        store = PriceStore(self.store_dir, fetcher=fetcher)
+        store.get_history("AAPL", period="1mo")
+        store.get_history("AAPL", period="1y")
+        self.assertEqual(fetcher.calls[-1], {"period": "1y", "start": None})
+
+    def test_max_is_fully_covered_once_stored(self):
+        """Test that a stored "max" history is refreshed with deltas only."""
+        fetcher = RecordingFetcher(_make_bars(self.today, 50))
+        store = PriceStore(self.store_dir, fetcher=fetcher)
+        store.get_history("AAPL", period="max")
+        hist = store.get_history("AAPL", period="max")
+        self.assertIsNotNone(fetcher.calls[-1]["start"])
+        self.assertEqual(len(hist), 50)
+
+    def test_ytd_is_sliced_and_repeatable(self):
+        """Test that "ytd" returns only this year's bars, also when served from the store."""
+        fetcher = RecordingFetcher(_make_bars(self.today, 800))
+        store = PriceStore(self.store_dir, fetcher=fetcher)
+        first = store.get_history("AAPL", period="ytd")
+        second = store.get_history("AAPL", period="ytd")
+
+        year_start = pd.Timestamp(year=self.today.year, month=1, day=1, tz="UTC")
+        for hist in (first, second):
+            self.assertFalse(hist.empty)
+            self.assertGreaterEqual(hist.index[0].tz_convert("UTC"), year_start)
+        self.assertEqual(len(second), len(first))
+        self.assertIsNotNone(fetcher.calls[-1]["start"])
+
+    def test_stored_bars_served_when_source_is_down(self):
+        """Test that stored bars are returned when the delta fetch is empty."""
+        store = PriceStore(self.store_dir, fetcher=RecordingFetcher(_make_bars(self.today, 30)))
+        store.get_history("AAPL", period="5d")
+        offline = PriceStore(self.store_dir, fetcher=RecordingFetcher(pd.DataFrame()))
+        hist = offline.get_history("AAPL", period="5d")
+        self.assertEqual(len(hist), 5)
+
+    def test_sources_are_stored_apart(self):
+        """Test that bars of one data source are never served for another."""
+        synthetic = RecordingFetcher(_make_bars(self.today, 30))
+        PriceStore(self.store_dir, fetcher=synthetic, source=lambda: "synthetic").get_history("AAPL", period="5d")
+
+        live_bars = _make_bars(self.today, 30) * 50
+        live = RecordingFetcher(live_bars)
+        hist = PriceStore(self.store_dir, fetcher=live, source=lambda: "yfinance").get_history("AAPL", period="5d")
+        self.assertEqual(live.calls, [{"period": "5d", "start": None}])
+        self.assertEqual(hist["Close"].iloc[-1], live_bars["Close"].iloc[-1])
+
+    def test_unknown_ticker_returns_empty(self):
+        """Test that a ticker without data yields an empty frame."""
+        store = PriceStore(self.store_dir, fetcher=RecordingFetcher(pd.DataFrame()))
+        self.assertTrue(store.get_history("INVALID_TICKER_XYZ123").empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
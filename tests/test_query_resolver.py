@@ -0,0 +1,122 @@
+"""Tests for the local query resolver."""
+
+import unittest
+from tools.data_provider import period_start
+from utils.query_resolver import (
+    PhraseMatcher,
+    QueryResolver,
+    get_resolver,
+    load_listings,
+    normalize_period,
+)
+
+LISTINGS = {
+    "AAPL": {"name": "Apple Inc.", "aliases": ["Apple"]},
+    "BAC": {"name": "Bank of America Corporation", "aliases": ["Bank of America"]},
+    "F": {"name": "Ford Motor Company", "aliases": ["Ford"]},
+    "TSLA": {"name": "Tesla, Inc.", "aliases": ["Tesla"]},
+    "T": {"name": "AT&T Inc.", "aliases": ["AT&T"]},
+    "TSM": {"name": "Taiwan Semiconductor Manufacturing Company Limited", "aliases": ["TSMC"]},
+}
+
+
+class TestPhraseMatcher(unittest.TestCase):
+    """Test cases for the Aho-Corasick automaton."""
+
+    def test_finds_overlapping_phrases(self):
+        """Every occurrence is found, including phrases inside other phrases."""
+        matcher = PhraseMatcher({"he": 1, "she": 2, "his": 3, "hers": 4})
+        self.assertEqual(
+            sorted(matcher.find("ushers")),
+            [(1, 4, 2), (2, 4, 1), (2, 6, 4)],
+        )
+
+    def test_no_match(self):
+        """Text without the phrases yields nothing."""
+        self.assertEqual(list(PhraseMatcher({"apple": "AAPL"}).find("an ample app")), [])
+
+
+class TestQueryResolver(unittest.TestCase):
+    """Test cases for QueryResolver."""
+
+    def setUp(self):
+        self.resolver = QueryResolver(LISTINGS)
+
+    def test_symbols_and_names(self):
+        """Symbols and company names resolve to tickers in query order."""
+        result = self.resolver.resolve("Compare TSLA and Ford")
+        self.assertEqual(result["tickers"], ["TSLA", "F"])
+        self.assertEqual(result["request_type"], "multi-ticker comparison")
+        self.assertTrue(result["analysis"].startswith("Tickers: TSLA, F\n"))
+
+    def test_longest_name_wins(self):
+        """Multi-word names and names with punctuation match as one mention."""
+        result = self.resolver.resolve("Compare Bank of America and AT&T")
+        self.assertEqual(result["tickers"], ["BAC", "T"])
+
+    def test_single_ticker_requirements(self):
+        """Requirement words are recognised and time phrases ignored."""
+        result = self.resolver.resolve("How has Apple's valuation and performance been over the last 6 months?")
+        self.assertEqual(result["tickers"], ["AAPL"])
+        self.assertEqual(result["request_type"], "single-ticker research")
+        self.assertEqual(result["requirements"], ["valuation", "price trends"])
+
+    def test_period(self):
+        """Time phrases are normalized to a period."""
+        self.assertEqual(self.resolver.resolve("Research Apple over the last 6 months")["period"], "6mo")
+        self.assertEqual(self.resolver.resolve("Apple performance this year")["period"], "ytd")
+        self.assertIsNone(self.resolver.resolve("Research Apple")["period"])
+        self.assertEqual(normalize_period("2 quarters"), "6mo")
+        self.assertEqual(normalize_period("the past 3 years"), "2y")
+        self.assertEqual(normalize_period("4 years"), "5y")
+        self.assertEqual(normalize_period("this week"), "5d")
+        self.assertEqual(normalize_period("30 years"), "max")
+        self.assertIsNone(normalize_period("recently"))
+
+    def test_periods_are_supported(self):
+        """Every period the resolver emits is one the market data tools accept."""
+        supported = {"1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"}
+        phrases = ["today", "ytd", "year to date", "recently", "lately"]
+        for unit in ["day", "week", "month", "quarter", "year", "d", "w", "wk", "m", "mo", "q", "y", "yr"]:
+            phrases.append(f"this {unit}")
+            phrases.extend(f"the last {count} {unit}s" for count in [1, 2, 3, 4, 6, 9, 12, 18, 40])
+        for phrase in phrases:
+            with self.subTest(phrase=phrase):
+                period = normalize_period(phrase)
+                if period is not None:
+                    self.assertIn(period, supported)
+                    period_start(period)
+
+    def test_name_alias_covers_symbol(self):
+        """An upper-case alias is not treated as an unknown symbol."""
+        self.assertEqual(self.resolver.resolve("Research TSMC")["tickers"], ["TSM"])
+
+    def test_word_boundaries(self):
+        """Names only match as whole words."""
+        self.assertIsNone(self.resolver.resolve("Research Fordham"))
+
+    def test_unsure(self):
+        """Queries the resolver cannot fully explain are left to the model."""
+        for query in [
+            "Research XYZQ",
+            "What about its valuation?",
+            "Compare Apple with its peers",
+            "Should I buy TSLA?",
+            "How has Apple's valuation changed?",
+            "Find cheap stocks",
+            "",
+        ]:
+            with self.subTest(query=query):
+                self.assertIsNone(self.resolver.resolve(query))
+
+    def test_bundled_listings(self):
+        """The bundled listing file loads and backs the shared resolver."""
+        listings = load_listings()
+        self.assertEqual(listings["NVDA"]["name"], "NVIDIA Corporation")
+        self.assertIn("Google", listings["GOOGL"]["aliases"])
+        self.assertIs(get_resolver(), get_resolver())
+        self.assertEqual(get_resolver().resolve("Compare Nvidia and GOOGL")["tickers"], ["NVDA", "GOOGL"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for the structured query state."""
+
+import unittest
+import asyncio
+from types import SimpleNamespace
+from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from agents.query_state import (
+    QUERY_ANALYSIS_KEY,
+    QUERY_TICKERS_KEY,
+    TICKER_COUNT_KEY,
+    query_tickers,
+    record_query_tickers,
+    resolve_query_locally,
+)
+from llm.registry import ModelRegistry
+
+MODEL = "stub/gemini-2.5-flash-lite"
+
+
+def user(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+class TestQueryState(unittest.TestCase):
+    """Test cases for the query state helpers."""
+
+    def test_record_query_tickers(self):
+        """The query analysis is turned into a ticker list and count."""
+        context = SimpleNamespace(state={"query_analysis": "Tickers: TSLA, F\nRequest type: multi-ticker"})
+        record_query_tickers(context)
+        self.assertEqual(context.state[QUERY_TICKERS_KEY], ["TSLA", "F"])
+        self.assertEqual(context.state[TICKER_COUNT_KEY], 2)
+
+    def test_record_without_tickers(self):
+        """An analysis without tickers records an empty list."""
+        context = SimpleNamespace(state={"query_analysis": "Tickers: N/A"})
+        record_query_tickers(context)
+        self.assertEqual(context.state[TICKER_COUNT_KEY], 0)
+
+    def test_query_tickers(self):
+        """The structured list wins; otherwise the analysis is parsed."""
+        self.assertEqual(
+            query_tickers({QUERY_TICKERS_KEY: ["NVDA"], "query_analysis": "Tickers: AAPL, MSFT"}), ["NVDA"]
+        )
+        self.assertEqual(query_tickers({"query_analysis": "Tickers: AAPL, MSFT"}), ["AAPL", "MSFT"])
+        self.assertEqual(query_tickers({}), [])
+
+    def test_resolve_query_locally(self):
+        """A resolved query writes the analysis and tickers and answers the turn."""
+        context = SimpleNamespace(state={}, user_content=user("Compare Tesla and Ford"))
+        content = resolve_query_locally(context)
+        self.assertTrue(content.parts[0].text.startswith("Tickers: TSLA, F\n"))
+        self.assertEqual(context.state[QUERY_ANALYSIS_KEY], content.parts[0].text)
+        self.assertEqual(context.state[QUERY_TICKERS_KEY], ["TSLA", "F"])
+        self.assertEqual(context.state[TICKER_COUNT_KEY], 2)
+
+    def test_resolve_query_locally_unsure(self):
+        """An unresolved query leaves the turn and the state to the model."""
+        context = SimpleNamespace(state={}, user_content=user("Compare Tesla with its peers"))
+        self.assertIsNone(resolve_query_locally(context))
+        self.assertEqual(context.state, {})
+
+    def test_pipeline_skips_query_model(self):
+        """A resolved query skips the query agent's model call but not the next stage."""
+        registry = ModelRegistry()
+        model = registry.get(MODEL)
+        pipeline = SequentialAgent(
+            name="Pipeline",
+            sub_agents=[
+                LlmAgent(
+                    name="QueryAgent",
+                    model=model,
+                    instruction="Find the tickers.",
+                    output_key=QUERY_ANALYSIS_KEY,
+                    before_agent_callback=resolve_query_locally,
+                    after_agent_callback=record_query_tickers,
+                ),
+                LlmAgent(name="ReportAgent", model=model, instruction="Report.", output_key="final_report"),
+            ],
+        )
+        runner = InMemoryRunner(agent=pipeline, app_name="query_state_test")
+
+        async def run(text):
+            session = await runner.session_service.create_session(app_name="query_state_test", user_id="u")
+            async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=user(text)):
+                pass
+            session = await runner.session_service.get_session(
+                app_name="query_state_test", user_id="u", session_id=session.id
+            )
+            return session.state
+
+        state = asyncio.run(run("Research NVDA"))
+        self.assertEqual(state[QUERY_TICKERS_KEY], ["NVDA"])
+        self.assertEqual(state["final_report"], "ReportAgent summary for NVDA.")
+        self.assertEqual(registry.stats()[MODEL]["requests"], 1)
+
+        state = asyncio.run(run("Research NVDA and its suppliers"))
+        self.assertEqual(state[TICKER_COUNT_KEY], 1)
+        self.assertEqual(registry.stats()[MODEL]["requests"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,64 @@
 """Unit tests for financial ratio tools."""
 
+import os
+import tempfile
 import unittest
-from tools.ratio_tool import calculate_valuation_metrics
+import threading
+import time
+from unittest import mock
+from tools.data_provider import SyntheticProvider, set_provider
+from tools.ratio_tool import (
+    calculate_valuation_metrics,
+    calculate_valuation_metrics_batch,
+    fundamentals_cache,
+)
+from tests.test_price_store import use_temporary_price_store
+
+
+def use_temporary_fundamentals_db(test_case):
+    """Points the fundamentals cache at a throwaway database for one test."""
+    tmp = tempfile.TemporaryDirectory()
+    test_case.addCleanup(tmp.cleanup)
+    patcher = mock.patch.object(fundamentals_cache, "db_path", os.path.join(tmp.name, "test.db"))
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    test_case.addCleanup(fundamentals_cache.wait_for_refreshes)
+
+
+class SlowProvider(SyntheticProvider):
+    """Synthetic provider with slow info calls that tracks concurrency."""
+
+    host = "slow.example.com"
+
+    def __init__(self, delay: float, hang: str = ""):
+        super().__init__()
+        self.delay = delay
+        self.hang = hang
+        self.active = 0
+        self.max_active = 0
+        self._active_lock = threading.Lock()
+
+    def info(self, ticker):
+        with self._active_lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(1.0 if ticker == self.hang else self.delay)
+            if ticker == "BOOM":
+                raise RuntimeError("connection reset")
+            return super().info(ticker)
+        finally:
+            with self._active_lock:
+                self.active -= 1
 
 
 class TestRatioTool(unittest.TestCase):
     """Test cases for ratio tools."""
 
+    def setUp(self):
+        """Keep cached snapshots out of the application database."""
+        use_temporary_fundamentals_db(self)
+
     def test_calculate_valuation_metrics_success(self):
         """Test successful valuation metrics calculation."""
         result = calculate_valuation_metrics("AAPL")
@@ -22,6 +74,83 @@ class TestRatioTool(unittest.TestCase):
         self.assertIn("error_message", result)
 
 
+class TestValuationMetricsBatch(unittest.TestCase):
+    """Test cases for the concurrent batch valuation tool (offline)."""
+
+    def setUp(self):
+        """Keep cached snapshots and stored bars out of the application data."""
+        use_temporary_fundamentals_db(self)
+        use_temporary_price_store(self)
+
+    def tearDown(self):
+        """Restore the configured provider."""
+        set_provider(None)
+
+    def test_batch_fetches_concurrently(self):
+        """Test that info requests overlap up to the per-host limit."""
+        provider = SlowProvider(delay=0.2)
+        set_provider(provider)
+        tickers = ["AAPL", "MSFT", "NVDA", "AMD", "INTC", "TSLA", "F", "GM"]
+        with mock.patch("tools.ratio_tool.FUNDAMENTALS_MAX_PER_HOST", 4):
+            start = time.monotonic()
+            result = calculate_valuation_metrics_batch(tickers)
+            elapsed = time.monotonic() - start
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(list(result["data"]["tickers"]), tickers)
+        self.assertLess(elapsed, 0.2 * len(tickers) / 2)
+        self.assertLessEqual(provider.max_active, 4)
+
+    def test_partial_results_with_errors(self):
+        """Test that failures and timeouts are reported per ticker."""
+        set_provider(SlowProvider(delay=0.01, hang="HANG"))
+        with mock.patch("tools.ratio_tool.FUNDAMENTALS_TIMEOUT_SECONDS", 0.3):
+            result = calculate_valuation_metrics_batch(
+                ["AAPL", "BOOM", "HANG", "INVALID_TICKER_XYZ123"]
+            )
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(list(result["data"]["tickers"]), ["AAPL"])
+        errors = result["data"]["errors"]
+        self.assertIn("connection reset", errors["BOOM"])
+        self.assertIn("Timed out", errors["HANG"])
+        self.assertIn("No data found", errors["INVALID_TICKER_XYZ123"])
+
+    def test_timeout_runs_from_submission(self):
+        """Test that tickers queued behind a slow request time out on schedule."""
+        provider = SlowProvider(delay=1.0)
+        provider.host = "serial.example.com"
+        set_provider(provider)
+        with mock.patch("tools.ratio_tool.FUNDAMENTALS_MAX_PER_HOST", 1), mock.patch(
+            "tools.ratio_tool.FUNDAMENTALS_TIMEOUT_SECONDS", 0.3
+        ), mock.patch.object(provider, "info", wraps=provider.info) as info:
+            start = time.monotonic()
+            result = calculate_valuation_metrics_batch(["AAPL", "MSFT", "NVDA"])
+            elapsed = time.monotonic() - start
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_message"].count("Timed out"), 3)
+        self.assertLess(elapsed, 0.6)
+        # Only the first ticker got a host slot; the others gave up waiting
+        info.assert_called_once()
+
+    def test_batch_all_invalid(self):
+        """Test batch with no valid ticker."""
+        set_provider(SyntheticProvider())
+        result = calculate_valuation_metrics_batch(["INVALID_TICKER_XYZ123"])
+        self.assertEqual(result["status"], "error")
+        self.assertIn("error_message", result)
+
+    def test_batch_uses_cached_snapshots(self):
+        """Test that a repeated batch only fetches tickers not yet cached."""
+        set_provider(SyntheticProvider())
+        calculate_valuation_metrics_batch(["AAPL", "MSFT"])
+        provider = SlowProvider(delay=0.01)
+        set_provider(provider)
+        with mock.patch.object(provider, "info", wraps=provider.info) as info:
+            result = calculate_valuation_metrics_batch(["AAPL", "MSFT", "NVDA"])
+        self.assertEqual(list(result["data"]["tickers"]), ["AAPL", "MSFT", "NVDA"])
+        info.assert_called_once_with("NVDA")
+        self.assertFalse(result["data"]["tickers"]["AAPL"]["freshness"]["stale"])
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,135 @@
+"""Unit tests for the research report cache."""
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from tools import report_cache
+from tools.report_cache import ReportCache, data_fingerprint, query_intent
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryIntent(unittest.TestCase):
+    """Test cases for intent normalization."""
+
+    def test_equivalent_queries_share_an_intent(self):
+        """Test that phrasing, symbol case and ticker order do not matter."""
+        self.assertEqual(query_intent("Research AAPL"), query_intent("Tell me about $AAPL"))
+        self.assertEqual(query_intent("Compare Apple and Microsoft"), query_intent("compare MSFT and AAPL"))
+
+    def test_sections_and_period_matter(self):
+        """Test that requested sections and periods are part of the intent."""
+        intent = query_intent("Compare Apple and Microsoft valuation over the last 6 months")
+        self.assertEqual(
+            intent,
+            {
+                "tickers": ["AAPL", "MSFT"],
+                "request_type": "multi-ticker comparison",
+                "sections": ["valuation"],
+                "period": "6mo",
+            },
+        )
+        self.assertNotEqual(intent, query_intent("Compare Apple and Microsoft valuation"))
+
+    def test_unresolved_queries_are_not_cached(self):
+        """Test that queries needing the model have no intent."""
+        self.assertIsNone(query_intent("What about its valuation?"))
+
+    def test_disabled_resolver_disables_caching(self):
+        """Test that no intent is derived while the local resolver is turned off."""
+        with mock.patch.object(report_cache, "QUERY_RESOLVER_ENABLED", False):
+            self.assertIsNone(query_intent("Research AAPL"))
+
+
+class TestDataFingerprint(unittest.TestCase):
+    """Test cases for the market data fingerprint."""
+
+    def setUp(self):
+        self.bars = {"AAPL": ["2026-10-16", 190.5]}
+        self.snapshots = {"AAPL": 1_000.0}
+        for patch in [
+            mock.patch.object(report_cache, "_latest_bar", self.bars.get),
+            mock.patch.object(report_cache, "fundamentals_cache", SimpleNamespace(snapshot_time=self.snapshots.get)),
+        ]:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_changes_with_data(self):
+        """Test that a new bar or fundamentals snapshot changes the fingerprint."""
+        first = data_fingerprint(["AAPL"])
+        self.assertEqual(data_fingerprint(["AAPL"]), first)
+        self.bars["AAPL"] = ["2026-10-17", 190.5]
+        second = data_fingerprint(["AAPL"])
+        self.assertNotEqual(second, first)
+        self.snapshots["AAPL"] = 2_000.0
+        self.assertNotEqual(data_fingerprint(["AAPL"]), second)
+
+    def test_missing_data(self):
+        """Test that tickers without data have no fingerprint."""
+        self.assertIsNone(data_fingerprint(["AAPL", "NOPE"]))
+
+
+class TestReportCache(unittest.TestCase):
+    """Test cases for the SQLite-backed report cache."""
+
+    def setUp(self):
+        """Set up a cache over a temporary database."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_path = os.path.join(tmp.name, "cache.db")
+        self.clock = FakeClock()
+        self.fingerprints = {"AAPL": "v1"}
+        self.cache = self.make_cache()
+        self.intent = query_intent("Research AAPL")
+
+    def make_cache(self) -> ReportCache:
+        return ReportCache(
+            db_path=self.db_path,
+            news_ttl=3600,
+            fingerprint=lambda tickers: self.fingerprints.get(tickers[0]),
+            clock=self.clock,
+        )
+
+    def test_hit_persists(self):
+        """Test that a stored report is served, also by a new cache instance."""
+        self.assertIsNone(self.cache.get(self.intent))
+        self.assertTrue(self.cache.store(self.intent, "AAPL report"))
+        self.assertEqual(self.cache.get(self.intent), "AAPL report")
+        self.assertEqual(self.make_cache().get(query_intent("Tell me about AAPL")), "AAPL report")
+
+    def test_data_change_invalidates(self):
+        """Test that a changed fingerprint drops the entry."""
+        self.cache.store(self.intent, "AAPL report")
+        self.fingerprints["AAPL"] = "v2"
+        self.assertIsNone(self.cache.get(self.intent))
+        self.fingerprints["AAPL"] = "v1"
+        self.assertIsNone(self.cache.get(self.intent))
+
+    def test_news_ttl(self):
+        """Test that entries older than the news TTL are rebuilt."""
+        self.cache.store(self.intent, "AAPL report")
+        self.clock.now += 3599
+        self.assertEqual(self.cache.get(self.intent), "AAPL report")
+        self.clock.now += 2
+        self.assertIsNone(self.cache.get(self.intent))
+
+    def test_unavailable_data_is_not_cached(self):
+        """Test that a report whose data cannot be fingerprinted is not stored."""
+        self.fingerprints.clear()
+        self.assertFalse(self.cache.store(self.intent, "AAPL report"))
+        self.fingerprints["AAPL"] = "v1"
+        self.assertIsNone(self.cache.get(self.intent))
+
+
+if __name__ == "__main__":
+    unittest.main()
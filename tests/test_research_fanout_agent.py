@@ -0,0 +1,102 @@
+"""Tests for the per-ticker research fan-out."""
+
+import unittest
+import asyncio
+import json
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from agents.research_fanout_agent import (
+    RESEARCH_BY_TICKER_KEY,
+    ResearchFanOutAgent,
+    ticker_groups,
+)
+from llm.registry import ModelRegistry
+
+MODEL = "stub/gemini-2.5-flash-lite"
+
+
+def run_fanout(agent: ResearchFanOutAgent, query_analysis: str) -> dict:
+    runner = InMemoryRunner(agent=agent, app_name="fanout_test")
+
+    async def run():
+        session = await runner.session_service.create_session(
+            app_name="fanout_test", user_id="u", state={"query_analysis": query_analysis}
+        )
+        message = types.Content(role="user", parts=[types.Part(text="Compare them")])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+        session = await runner.session_service.get_session(
+            app_name="fanout_test", user_id="u", session_id=session.id
+        )
+        return session.state
+
+    return asyncio.run(run())
+
+
+class TestTickerGroups(unittest.TestCase):
+    """Test cases for ticker_groups."""
+
+    def test_groups(self):
+        """Tickers are split in order into groups of the given size."""
+        self.assertEqual(ticker_groups(["A", "B", "C"], 1), [["A"], ["B"], ["C"]])
+        self.assertEqual(ticker_groups(["A", "B", "C"], 2), [["A", "B"], ["C"]])
+        self.assertEqual(ticker_groups(["A"], 0), [["A"]])
+
+    def test_no_tickers(self):
+        """Without tickers there is one unfocused branch."""
+        self.assertEqual(ticker_groups([], 1), [[]])
+
+
+class TestResearchFanOutAgent(unittest.TestCase):
+    """Test cases for ResearchFanOutAgent."""
+
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.model = self.registry.get(MODEL)
+        self.model.latency_ms = 20
+
+    def make_agent(self, **kwargs) -> ResearchFanOutAgent:
+        return ResearchFanOutAgent(
+            name="ResearchFanOut",
+            research_agents=[
+                LlmAgent(name="NewsAgent", model=self.model, instruction="News.", output_key="news_analysis"),
+                LlmAgent(name="MarketAgent", model=self.model, instruction="Market.", output_key="market_analysis"),
+            ],
+            **kwargs,
+        )
+
+    def test_branch_per_ticker(self):
+        """Each ticker gets focused agents and the outputs are merged by ticker."""
+        state = run_fanout(self.make_agent(), "Tickers: AAPL, BRK.B")
+
+        research = json.loads(state[RESEARCH_BY_TICKER_KEY])
+        self.assertEqual(list(research), ["AAPL", "BRK.B"])
+        self.assertEqual(research["BRK.B"]["news_analysis"], "NewsAgent_BRK_B summary for BRK.B.")
+        self.assertEqual(
+            state["market_analysis"],
+            "[AAPL]\nMarketAgent_AAPL summary for AAPL.\n\n[BRK.B]\nMarketAgent_BRK_B summary for BRK.B.",
+        )
+        # Per-branch outputs are invocation-scoped and not kept in the session
+        self.assertFalse([key for key in state if key.startswith("temp:")])
+
+    def test_single_group_keeps_plain_outputs(self):
+        """One branch writes its outputs unlabelled, as the fixed team did."""
+        state = run_fanout(self.make_agent(tickers_per_branch=2), "Tickers: AAPL, MSFT")
+        self.assertEqual(list(json.loads(state[RESEARCH_BY_TICKER_KEY])), ["AAPL, MSFT"])
+        self.assertEqual(state["news_analysis"], "NewsAgent_AAPL_MSFT summary for AAPL, MSFT.")
+
+    def test_branch_cap(self):
+        """No more than max_branches branches run at once."""
+        run_fanout(self.make_agent(max_branches=1), "Tickers: AAPL, MSFT, NVDA")
+        self.assertEqual(self.registry.stats()[MODEL]["peak_in_flight"], 2)
+
+        registry = ModelRegistry()
+        self.model = registry.get(MODEL)
+        self.model.latency_ms = 20
+        run_fanout(self.make_agent(max_branches=3), "Tickers: AAPL, MSFT, NVDA")
+        self.assertEqual(registry.stats()[MODEL]["peak_in_flight"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unit tests for the fundamentals screener."""
+
+import time
+import unittest
+import numpy as np
+from tools.data_provider import SyntheticProvider, set_provider
+from tools.ratio_tool import fundamentals_cache
+from tools.screener import build_table, parse_filter, screen, screen_stocks, METRIC_FIELDS
+from tests.test_price_store import use_temporary_price_store
+from tests.test_ratio_tool import use_temporary_fundamentals_db
+
+
+def _snapshot(ticker, sector, industry, **metrics):
+    return {
+        "ticker": ticker,
+        "company_name": f"{ticker} Corp",
+        "sector": sector,
+        "industry": industry,
+        "metrics": {field: metrics.get(field) for field in METRIC_FIELDS},
+    }
+
+
+SNAPSHOTS = {
+    "NVDA": _snapshot("NVDA", "Technology", "Semiconductors", ev_to_ebitda=45.0, roe=0.9),
+    "AMD": _snapshot("AMD", "Technology", "Semiconductors", ev_to_ebitda=30.0, roe=0.05),
+    "INTC": _snapshot("INTC", "Technology", "Semiconductors", ev_to_ebitda=12.0, roe=0.18),
+    "QCOM": _snapshot("QCOM", "Technology", "Semiconductors", ev_to_ebitda=None, roe=0.4),
+    "JPM": _snapshot("JPM", "Financial Services", "Banks - Diversified", ev_to_ebitda=8.0, roe=0.16),
+    "BAC": _snapshot("BAC", "Financial Services", "Banks - Diversified", ev_to_ebitda=9.0, roe=0.1),
+}
+
+
+class TestScreen(unittest.TestCase):
+    """Test cases for filtering and ranking the fundamentals table."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.table = build_table(SNAPSHOTS)
+
+    def test_table_is_columnar(self):
+        """Test that metrics become float columns with NaN for missing values."""
+        self.assertEqual(self.table["roe"].dtype, np.float64)
+        self.assertTrue(np.isnan(self.table.loc["QCOM", "ev_to_ebitda"]))
+
+    def test_cheapest_semis_with_high_roe(self):
+        """Test the canonical filter-and-rank query."""
+        result = screen(
+            self.table,
+            ["industry == semiconductors", "roe > 15%"],
+            sort_by="ev_to_ebitda",
+        )
+        self.assertEqual(list(result.index), ["INTC", "NVDA", "QCOM"])
+
+    def test_descending_with_limit(self):
+        """Test descending rank with a row limit."""
+        result = screen(self.table, sort_by="roe", ascending=False, limit=2)
+        self.assertEqual(list(result.index), ["NVDA", "QCOM"])
+
+    def test_percentile_rank(self):
+        """Test percentile columns over the whole universe."""
+        result = screen(self.table, ["roe_pct >= 0.8"], sort_by="roe_pct")
+        self.assertEqual(list(result.index), ["QCOM", "NVDA"])
+        self.assertAlmostEqual(result["roe_pct"].iloc[-1], 1.0)
+
+    def test_sector_z_score(self):
+        """Test z-scores relative to the ticker's sector."""
+        result = screen(self.table, sort_by="roe_sector_z")
+        banks = result.loc[["JPM", "BAC"], "roe_sector_z"]
+        self.assertAlmostEqual(banks.sum(), 0.0)
+        self.assertGreater(banks["JPM"], 0)
+        semis = result.loc[["NVDA", "AMD", "INTC", "QCOM"], "roe_sector_z"]
+        self.assertAlmostEqual(semis.mean(), 0.0)
+
+    def test_invalid_filters(self):
+        """Test that malformed or unknown filters are rejected."""
+        with self.assertRaises(ValueError):
+            parse_filter("roe is high")
+        with self.assertRaises(ValueError):
+            parse_filter("sector > Tech")
+        with self.assertRaises(ValueError):
+            screen(self.table, ["moat > 3"])
+
+    def test_screens_thousands_quickly(self):
+        """Test that a large universe screens well under a second."""
+        rng = np.random.default_rng(0)
+        snapshots = {
+            f"T{i:04d}": _snapshot(
+                f"T{i:04d}",
+                f"Sector {i % 11}",
+                f"Industry {i % 37}",
+                **{field: float(rng.normal()) for field in METRIC_FIELDS},
+            )
+            for i in range(5000)
+        }
+        start = time.perf_counter()
+        result = screen(
+            build_table(snapshots),
+            ["roe > 0", "ev_to_ebitda_sector_z < -0.5", "pe_ratio_pct < 0.5"],
+            sort_by="ev_to_ebitda",
+            limit=20,
+        )
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(len(result), 20)
+
+
+class TestScreenStocksTool(unittest.TestCase):
+    """Test cases for the screening tool (offline)."""
+
+    def setUp(self):
+        """Screen synthetic fundamentals in a temporary cache."""
+        use_temporary_fundamentals_db(self)
+        use_temporary_price_store(self)
+        set_provider(SyntheticProvider())
+        self.addCleanup(set_provider, None)
+
+    def test_screen_fetches_missing_then_uses_cache(self):
+        """Test that the universe is loaded once and then served from the cache."""
+        tickers = ["NVDA", "AMD", "INTC", "AAPL", "MSFT", "INVALID_TICKER_XYZ123"]
+        result = screen_stocks(tickers, ["roe > -1"], sort_by="ev_to_ebitda")
+        self.assertEqual(result["status"], "success")
+        data = result["data"]
+        self.assertEqual(data["universe_size"], 5)
+        self.assertIn("INVALID_TICKER_XYZ123", data["errors"])
+        ratios = [row["ev_to_ebitda"] for row in data["results"]]
+        self.assertEqual(ratios, sorted(ratios))
+
+        self.assertEqual(len(fundamentals_cache.lookup_many()), 5)
+        cached = screen_stocks([], [], sort_by="roe", ascending=False, limit=2)
+        self.assertEqual(cached["data"]["universe_size"], 5)
+        self.assertEqual(len(cached["data"]["results"]), 2)
+
+    def test_bad_filter_is_reported(self):
+        """Test that an invalid filter returns an error response."""
+        result = screen_stocks(["AAPL"], ["roe >> 1"])
+        self.assertEqual(result["status"], "error")
+        self.assertIn("roe >> 1", result["error_message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
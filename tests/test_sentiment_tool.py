@@ -0,0 +1,299 @@
+"""Unit tests for the news sentiment tool and its per-article cache."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+from google.genai import types
+from tools import sentiment_tool
+from tools.sentiment_cache import SentimentCache, article_key
+
+ARTICLES = [
+    {"title": "Apple beats earnings estimates", "snippet": "Record iPhone sales."},
+    {"title": "Regulators probe Apple App Store", "snippet": "EU opens an investigation."},
+    {"title": "Apple unveils new Mac", "snippet": "Launch event on Tuesday."},
+]
+
+RESULTS = {
+    "Apple beats earnings estimates": {"sentiment": "positive", "score": 0.9, "confidence": 8, "themes": ["earnings"]},
+    "Regulators probe Apple App Store": {"sentiment": "negative", "score": 0.2, "confidence": 6, "themes": ["regulation"]},
+    "Apple unveils new Mac": {"sentiment": "neutral", "score": 0.5, "confidence": 4, "themes": ["product launches", "earnings"]},
+}
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSentimentCache(unittest.TestCase):
+    """Test cases for the per-article sentiment cache."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.clock = FakeClock()
+        self.cache = SentimentCache(db_path=os.path.join(tmp.name, "cache.db"), ttl=3600, clock=self.clock)
+
+        scored = []
+        self.tickers = []
+
+        def fake_score(articles, tickers=None):
+            scored.append([a["title"] for a in articles])
+            self.tickers.append(tickers)
+            return [dict(RESULTS[a["title"]]) for a in articles]
+
+        self.scored = scored
+        patches = (
+            ("sentiment_cache", self.cache),
+            ("_score_articles", fake_score),
+            # Send every article to the (fake) model
+            ("SENTIMENT_LLM_FALLBACK_CONFIDENCE", 11),
+        )
+        for target, value in patches:
+            patcher = mock.patch.object(sentiment_tool, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_article_key_normalizes_text(self):
+        """Test that case and whitespace variants share a key."""
+        variant = {"title": "  APPLE beats\nearnings   estimates", "snippet": "record iPhone sales."}
+        self.assertEqual(article_key(ARTICLES[0]), article_key(variant))
+        self.assertNotEqual(article_key(ARTICLES[0]), article_key(ARTICLES[1]))
+
+    def test_article_key_includes_ticker(self):
+        """Test that an article judged for a ticker has its own key."""
+        self.assertEqual(article_key(ARTICLES[0], "aapl"), article_key(ARTICLES[0], "AAPL"))
+        self.assertNotEqual(article_key(ARTICLES[0], "AAPL"), article_key(ARTICLES[0], "MSFT"))
+        self.assertNotEqual(article_key(ARTICLES[0], "AAPL"), article_key(ARTICLES[0]))
+
+    def test_only_unseen_articles_reach_the_model(self):
+        """Test that a repeated call is served from the cache."""
+        first = sentiment_tool.analyze_news_sentiment(ARTICLES[:2])
+        second = sentiment_tool.analyze_news_sentiment(ARTICLES)
+
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(self.scored, [[a["title"] for a in ARTICLES[:2]], [ARTICLES[2]["title"]]])
+        self.assertEqual(second["data"]["cached_articles"], 2)
+        self.assertEqual(second["data"]["analyzed_articles"], 3)
+
+    def test_overall_rebuilt_from_articles(self):
+        """Test the confidence-weighted score, tone and themes."""
+        sentiment_tool.analyze_news_sentiment(ARTICLES)
+        result = sentiment_tool.analyze_news_sentiment(ARTICLES)
+        analysis = result["data"]["sentiment_analysis"]
+
+        self.assertEqual(len(self.scored), 1)
+        self.assertAlmostEqual(analysis["sentiment_score"], round((0.9 * 8 + 0.2 * 6 + 0.5 * 4) / 18, 3))
+        self.assertEqual(analysis["overall_sentiment"], "neutral")
+        self.assertEqual(analysis["key_themes"][0], "earnings")
+        self.assertEqual([a["article_number"] for a in analysis["articles"]], [1, 2, 3])
+
+    def test_entries_expire(self):
+        """Test that results older than the TTL are scored again."""
+        sentiment_tool.analyze_news_sentiment(ARTICLES[:1])
+        self.clock.now += 3601
+        sentiment_tool.analyze_news_sentiment(ARTICLES[:1])
+        self.assertEqual(len(self.scored), 2)
+
+    def test_duplicates_scored_once(self):
+        """Test that the same article twice in one call is sent once."""
+        result = sentiment_tool.analyze_news_sentiment([ARTICLES[0], dict(ARTICLES[0])])
+        self.assertEqual(self.scored, [[ARTICLES[0]["title"]]])
+        self.assertEqual(result["data"]["analyzed_articles"], 2)
+
+    def test_unusable_results_not_cached(self):
+        """Test that articles the model could not score fall back to the lexicon."""
+        with mock.patch.object(sentiment_tool, "_score_articles", return_value=[None]):
+            result = sentiment_tool.analyze_news_sentiment(ARTICLES[:1])
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["data"]["sentiment_analysis"]["articles"][0]["source"], "lexicon")
+        self.assertEqual(self.cache.get_many([article_key(ARTICLES[0])]), {})
+
+    def test_model_failure_falls_back_to_lexicon(self):
+        """Test that a failing model call still yields an analysis."""
+        with mock.patch.object(sentiment_tool, "_score_articles", side_effect=RuntimeError("quota")):
+            result = sentiment_tool.analyze_news_sentiment(ARTICLES)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["data"]["lexicon_articles"], 3)
+
+    def test_only_unsure_articles_escalate(self):
+        """Test that confident lexicon results skip the model."""
+        with mock.patch.object(sentiment_tool, "SENTIMENT_LLM_FALLBACK_CONFIDENCE", 6):
+            result = sentiment_tool.analyze_news_sentiment(ARTICLES)
+        # Only the launch headline has no sentiment words
+        self.assertEqual(self.scored, [[ARTICLES[2]["title"]]])
+        self.assertEqual((result["data"]["lexicon_articles"], result["data"]["llm_articles"]), (2, 1))
+
+    def test_batch_uses_one_model_pass(self):
+        """Test that all tickers' articles go to the model together."""
+        result = sentiment_tool.analyze_news_sentiment_batch(
+            {"aapl": ARTICLES[:2], "MSFT": ARTICLES[2:], "NVDA": []}
+        )
+        data = result["data"]
+
+        self.assertEqual(len(self.scored), 1)
+        self.assertEqual(self.tickers, [["AAPL", "AAPL", "MSFT"]])
+        self.assertEqual(list(data["tickers"]), ["AAPL", "MSFT"])
+        self.assertEqual(data["tickers"]["MSFT"]["sentiment_analysis"]["overall_sentiment"], "neutral")
+        self.assertEqual(data["tickers"]["AAPL"]["analyzed_articles"], 2)
+        self.assertIn("NVDA", data["errors"])
+
+    def test_batch_shares_the_cache(self):
+        """Test that a batch reuses results from earlier calls for the same ticker."""
+        sentiment_tool.analyze_news_sentiment_batch({"AAPL": ARTICLES[:2]})
+        result = sentiment_tool.analyze_news_sentiment_batch({"AAPL": ARTICLES})
+        self.assertEqual(self.scored[-1], [ARTICLES[2]["title"]])
+        self.assertEqual(result["data"]["tickers"]["AAPL"]["cached_articles"], 2)
+
+    def test_shared_article_scored_per_ticker(self):
+        """Test that one article under two tickers is judged for each of them."""
+        article = {"title": "Ford wins contract GM bid for", "snippet": "Detroit rivals compete."}
+        RESULTS[article["title"]] = {"sentiment": "neutral", "score": 0.5, "confidence": 5, "themes": []}
+        self.addCleanup(RESULTS.pop, article["title"])
+
+        sentiment_tool.analyze_news_sentiment_batch({"F": [article], "GM": [dict(article)]})
+        self.assertEqual(self.scored, [[article["title"], article["title"]]])
+        self.assertEqual(self.tickers, [["F", "GM"]])
+
+        result = sentiment_tool.analyze_news_sentiment_batch({"F": [article], "GM": [article]})
+        self.assertEqual(len(self.scored), 1)
+        self.assertEqual(result["data"]["tickers"]["GM"]["cached_articles"], 1)
+
+    def test_batch_without_articles(self):
+        """Test the error when no ticker has articles."""
+        result = sentiment_tool.analyze_news_sentiment_batch({"AAPL": []})
+        self.assertEqual(result["status"], "error")
+
+    def test_clean_result(self):
+        """Test validation of model output."""
+        self.assertIsNone(sentiment_tool._clean_result({"sentiment": "bullish"}))
+        cleaned = sentiment_tool._clean_result({"sentiment": "Negative", "score": 3, "themes": "Risks"})
+        self.assertEqual(cleaned, {"sentiment": "negative", "score": 1.0, "confidence": 5, "themes": ["risks"]})
+
+    def test_no_articles(self):
+        """Test the error for an empty article list."""
+        result = sentiment_tool.analyze_news_sentiment([])
+        self.assertEqual(result["status"], "error")
+
+
+class FakeModels:
+    """Stands in for the genai models API, answering from canned results."""
+
+    def __init__(self, max_articles=None):
+        self.calls = []
+        self.max_articles = max_articles
+
+    def generate_content(self, model, contents, config):
+        self.calls.append((contents, config))
+        ids = [int(line[1:line.index("]")]) for line in contents.splitlines() if line.startswith("[")]
+        truncated = self.max_articles is not None and len(ids) > self.max_articles
+        candidate = mock.Mock(finish_reason=types.FinishReason.MAX_TOKENS if truncated else types.FinishReason.STOP)
+        parsed = None if truncated else {
+            "articles": [
+                {"article_id": i, "sentiment": "positive", "score": 0.7, "confidence": 7, "themes": []}
+                for i in ids
+            ]
+        }
+        return mock.Mock(candidates=[candidate], parsed=parsed)
+
+
+class TestStructuredRequests(unittest.TestCase):
+    """Test cases for batched model requests."""
+
+    def use_models(self, models):
+        model = mock.Mock(model="test-model")
+        model.api_client.models = models
+        patcher = mock.patch.object(sentiment_tool, "_get_model", return_value=model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_single_request_with_schema(self):
+        """Test that a batch is one request using the JSON schema mode."""
+        models = FakeModels()
+        self.use_models(models)
+        results = sentiment_tool._score_articles(ARTICLES, tickers=["AAPL", "AAPL", "MSFT"])
+
+        self.assertEqual(len(models.calls), 1)
+        prompt, config = models.calls[0]
+        self.assertEqual(config.response_mime_type, "application/json")
+        self.assertEqual(config.response_schema, sentiment_tool.RESPONSE_SCHEMA)
+        self.assertIn("Articles about AAPL:", prompt)
+        self.assertIn("Articles about MSFT:\n[3]", prompt)
+        self.assertEqual([r["sentiment"] for r in results], ["positive"] * 3)
+
+    def test_splits_near_the_token_budget(self):
+        """Test that batches are split to fit the input and output budgets."""
+        models = FakeModels()
+        self.use_models(models)
+        articles = [{"title": f"Headline {i}", "snippet": "x" * 400} for i in range(10)]
+        with mock.patch.object(sentiment_tool, "SENTIMENT_BATCH_MAX_INPUT_TOKENS", 600):
+            results = sentiment_tool._score_articles(articles)
+            chunks = sentiment_tool._token_chunks(articles, [None] * 10)
+
+        self.assertEqual(len(models.calls), len(chunks))
+        self.assertEqual([end - start for start, end in chunks], [3, 3, 3, 1])
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(results))
+        with mock.patch.object(sentiment_tool, "SENTIMENT_BATCH_MAX_OUTPUT_TOKENS", 150):
+            self.assertEqual(len(sentiment_tool._token_chunks(articles, [None] * 10)), 5)
+
+    def test_truncated_response_is_split(self):
+        """Test that a response cut off at the output limit is retried in halves."""
+        models = FakeModels(max_articles=2)
+        self.use_models(models)
+        articles = [{"title": f"Headline {i}", "snippet": ""} for i in range(6)]
+        results = sentiment_tool._score_articles(articles)
+        self.assertTrue(all(results))
+        self.assertGreater(len(models.calls), 1)
+
+
+class TestLexiconScorer(unittest.TestCase):
+    """Test cases for the local lexicon scorer."""
+
+    def score(self, title, snippet=""):
+        return sentiment_tool.score_articles_locally([{"title": title, "snippet": snippet}])[0]
+
+    def test_polarity(self):
+        """Test clear positive and negative headlines."""
+        positive = self.score("Nvidia shares surge after record revenue beats estimates")
+        negative = self.score("Tesla stock plunges as deliveries miss and margins weaken")
+        self.assertEqual(positive["sentiment"], "positive")
+        self.assertEqual(negative["sentiment"], "negative")
+        self.assertGreaterEqual(positive["confidence"], 7)
+        self.assertEqual(positive["source"], "lexicon")
+
+    def test_negation_flips_positive_words(self):
+        """Test that a negated positive word counts as negative."""
+        self.assertEqual(self.score("Results did not beat expectations")["sentiment"], "negative")
+
+    def test_mixed_and_empty_are_unsure(self):
+        """Test that conflicting or missing signals give low confidence."""
+        self.assertLess(self.score("Revenue growth strong but losses widen")["confidence"], 6)
+        self.assertEqual(self.score("Apple to hold event on Tuesday")["confidence"], 2)
+
+    def test_uncertainty_lowers_confidence(self):
+        """Test that hedging words reduce confidence."""
+        plain = self.score("Profit rises")["confidence"]
+        hedged = self.score("Profit may possibly rise")["confidence"]
+        self.assertLess(hedged, plain)
+
+    def test_themes(self):
+        """Test theme keyword matching."""
+        result = self.score("Microsoft to acquire startup", "Regulators review the deal; dividend unchanged")
+        self.assertEqual(result["themes"], ["regulation", "mergers and acquisitions", "capital returns"])
+
+    def test_batch_matches_single(self):
+        """Test that batch scoring matches scoring articles one at a time."""
+        batch = sentiment_tool.score_articles_locally(ARTICLES)
+        self.assertEqual(batch, [sentiment_tool.score_articles_locally([a])[0] for a in ARTICLES])
+        self.assertEqual(sentiment_tool.score_articles_locally([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+"""Tests for ticker symbol parsing."""
+
+import unittest
+from utils.tickers import parse_ticker_line, parse_tickers
+
+
+class TestParseTickers(unittest.TestCase):
+    """Test cases for parse_tickers."""
+
+    def test_ticker_line_wins(self):
+        """The tickers line is preferred over other upper-case words."""
+        text = "Tickers: TSLA, F\n- Request type: multi-ticker\n- Focus: EPS and AI spend"
+        self.assertEqual(parse_tickers(text), ["TSLA", "F"])
+
+    def test_markdown_ticker_line(self):
+        """Formatted labels are recognized."""
+        self.assertEqual(parse_ticker_line("**Extracted ticker symbols:** NVDA, AMD"), ["NVDA", "AMD"])
+        self.assertEqual(parse_ticker_line("- Ticker: BRK.B"), ["BRK.B"])
+
+    def test_empty_ticker_line(self):
+        """A tickers line without symbols yields no tickers."""
+        self.assertEqual(parse_tickers("Tickers: N/A\nThe query names no company."), [])
+        self.assertIsNone(parse_ticker_line("Compare Apple and Microsoft"))
+
+    def test_free_text(self):
+        """Without a tickers line, symbol-like words are used in order."""
+        self.assertEqual(parse_tickers("Compare $AAPL and MSFT vs AAPL in Q3 (USD)"), ["AAPL", "MSFT"])
+        self.assertEqual(parse_tickers("Research RDS-A and US-listed GOOGL."), ["RDS-A", "GOOGL"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Vectorized risk/return analytics over close-price arrays."""
+
+from __future__ import annotations
+
+from typing import Dict, Any, Optional, Sequence
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def _forward_fill(prices: np.ndarray) -> np.ndarray:
+    """Forward-fills NaNs along the time axis of a 2-D array (leading NaNs stay)."""
+    valid = ~np.isnan(prices)
+    index = np.where(valid, np.arange(prices.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    return prices[np.arange(prices.shape[0])[:, None], index]
+
+
+def risk_return_metrics(
+    closes: Any,
+    dates: Optional[Sequence[Any]] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    risk_free_rate: float = 0.0,
+) -> Dict[str, Any]:
+    """Computes risk and return metrics for one or many close-price series.
+
+    All metrics share a single returns array, so the prices are scanned once
+    per quantity instead of once per pandas pipeline. ``closes`` may be a
+    1-D array (one series) or a 2-D array shaped (tickers, time); rows may
+    start late or contain gaps (NaN), which are forward-filled.
+
+    Args:
+        closes: Close prices, shape (time,) or (tickers, time)
+        dates: Optional timestamps for the time axis, used for drawdown dates
+        periods_per_year: Bars per year used for annualization
+        risk_free_rate: Annual risk-free rate for Sharpe and Sortino ratios
+
+    Returns:
+        Dictionary of metrics. Values are floats for 1-D input and arrays of
+        shape (tickers,) for 2-D input. Keys: observations, daily_volatility,
+        annualized_volatility, max_drawdown, max_drawdown_peak,
+        max_drawdown_trough (indices, or dates when ``dates`` is given),
+        total_return, annualized_return, average_daily_return,
+        downside_deviation, sharpe_ratio, sortino_ratio, calmar_ratio.
+    """
+    prices = np.asarray(closes, dtype=np.float64)
+    single = prices.ndim == 1
+    prices = np.ascontiguousarray(np.atleast_2d(prices))
+    n_series, n_bars = prices.shape
+    rows = np.arange(n_series)
+
+    observations = np.count_nonzero(~np.isnan(prices), axis=1)
+    filled = _forward_fill(prices)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Returns (NaN before each series starts)
+        returns = filled[:, 1:] / filled[:, :-1] - 1
+        return_count = np.count_nonzero(~np.isnan(returns), axis=1)
+        mean_return = np.nansum(returns, axis=1) / return_count
+        deviations = returns - mean_return[:, None]
+        daily_volatility = np.sqrt(
+            np.nansum(deviations * deviations, axis=1) / (return_count - 1)
+        )
+
+        period_risk_free = risk_free_rate / periods_per_year
+        shortfall = np.minimum(returns - period_risk_free, 0.0)
+        downside_deviation = np.sqrt(np.nansum(shortfall * shortfall, axis=1) / return_count)
+
+        # Drawdown against the running peak (NaN-safe: fmax skips NaNs)
+        running_max = np.fmax.accumulate(filled, axis=1)
+        drawdown = filled / running_max - 1
+        trough = np.argmin(np.where(np.isnan(drawdown), np.inf, drawdown), axis=1)
+        max_drawdown = drawdown[rows, trough]
+        peak_value = running_max[rows, trough]
+        before_trough = np.arange(n_bars)[None, :] <= trough[:, None]
+        peak = np.argmax(before_trough & (filled == peak_value[:, None]), axis=1)
+
+        first_index = np.argmax(~np.isnan(prices), axis=1)
+        first_price = prices[rows, first_index]
+        last_price = filled[:, -1]
+        total_return = last_price / first_price - 1
+        annualized_return = np.where(
+            observations > 0,
+            (1 + total_return) ** (periods_per_year / np.maximum(observations, 1)) - 1,
+            0.0,
+        )
+
+        annualization = np.sqrt(periods_per_year)
+        annualized_volatility = daily_volatility * annualization
+        excess = mean_return - period_risk_free
+        sharpe_ratio = np.where(daily_volatility > 0, excess / daily_volatility * annualization, np.nan)
+        sortino_ratio = np.where(
+            downside_deviation > 0, excess / downside_deviation * annualization, np.nan
+        )
+        calmar_ratio = np.where(max_drawdown < 0, annualized_return / -max_drawdown, np.nan)
+
+    has_drawdown = max_drawdown < 0
+    if dates is not None:
+        labels = np.asarray(dates, dtype=object)
+        peak_label = np.where(has_drawdown, labels[peak], None)
+        trough_label = np.where(has_drawdown, labels[trough], None)
+    else:
+        peak_label = np.where(has_drawdown, peak, None)
+        trough_label = np.where(has_drawdown, trough, None)
+
+    metrics = {
+        "observations": observations,
+        "daily_volatility": daily_volatility,
+        "annualized_volatility": annualized_volatility,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_peak": peak_label,
+        "max_drawdown_trough": trough_label,
+        "total_return": total_return,
+        "annualized_return": annualized_return,
+        "average_daily_return": mean_return,
+        "downside_deviation": downside_deviation,
+        "sharpe_ratio": sharpe_ratio,
+        "sortino_ratio": sortino_ratio,
+        "calmar_ratio": calmar_ratio,
+    }
+
+    if single:
+        return {key: _scalar(value[0]) for key, value in metrics.items()}
+    return metrics
+
+
+def _scalar(value: Any) -> Any:
+    """Converts a NumPy scalar to a JSON-friendly Python value."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def metrics_for_row(metrics: Dict[str, Any], row: int) -> Dict[str, Any]:
+    """Extracts the scalar metrics of one series from a 2-D result."""
+    return {key: _scalar(value[row]) for key, value in metrics.items()}
@@ -0,0 +1,68 @@
+"""Non-blocking async variants of the tool functions.
+
+The tools in this package do blocking network and CPU work. ADK calls
+synchronous tools directly on the event loop, so one slow request stalls
+every other agent in a ParallelAgent. The variants here run the same
+functions on a dedicated bounded thread pool and await the result.
+
+Each variant keeps the name, signature and docstring of the wrapped tool,
+so the function declarations the model sees are unchanged.
+"""
+
+from typing import Any, Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+from tools.market_data_tool import (
+    fetch_price_history,
+    compute_volatility,
+    compute_returns,
+    fetch_price_history_batch,
+    compute_volatility_batch,
+    compute_returns_batch,
+)
+from tools.ratio_tool import calculate_valuation_metrics, calculate_valuation_metrics_batch
+from tools.screener import screen_stocks
+from tools.chart_tool import generate_price_chart, generate_comparison_chart
+from tools.sentiment_tool import analyze_news_sentiment, analyze_news_sentiment_batch
+from config.settings import TOOL_EXECUTOR_WORKERS
+
+# Dedicated pool so tool work never competes with the loop's default executor
+tool_executor = ThreadPoolExecutor(max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="tool")
+
+
+def make_async(func: Callable[..., Any]) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Wraps a blocking tool function in a coroutine run on the tool executor.
+
+    Args:
+        func: Synchronous tool function
+
+    Returns:
+        Async function with the same name, signature and docstring
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        # Carry context variables (e.g. the active trace) into the worker thread
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(tool_executor, call)
+
+    return wrapper
+
+
+fetch_price_history_async = make_async(fetch_price_history)
+compute_volatility_async = make_async(compute_volatility)
+compute_returns_async = make_async(compute_returns)
+fetch_price_history_batch_async = make_async(fetch_price_history_batch)
+compute_volatility_batch_async = make_async(compute_volatility_batch)
+compute_returns_batch_async = make_async(compute_returns_batch)
+calculate_valuation_metrics_async = make_async(calculate_valuation_metrics)
+calculate_valuation_metrics_batch_async = make_async(calculate_valuation_metrics_batch)
+screen_stocks_async = make_async(screen_stocks)
+generate_price_chart_async = make_async(generate_price_chart)
+generate_comparison_chart_async = make_async(generate_comparison_chart)
+analyze_news_sentiment_async = make_async(analyze_news_sentiment)
+analyze_news_sentiment_batch_async = make_async(analyze_news_sentiment_batch)
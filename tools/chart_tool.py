@@ -1,12 +1,294 @@
 """Chart generation tools for financial data visualization."""
 
-from typing import Dict, Any, Optional
-import yfinance as yf
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Any, Callable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import math
+import multiprocessing
 import os
-from datetime import datetime
+import re
+import threading
+import time
+from tools.price_cache import get_price_history, get_price_history_wide
+from tools.downsample import (
+    MIN_CANDLE_PIXELS,
+    plot_width_pixels,
+    downsample_line,
+    aggregate_ohlc,
+    aggregation_factor,
+)
+from config.settings import (
+    CHART_FORMAT,
+    CHART_RENDER_WORKERS,
+    CHART_CACHE_MAX_BYTES,
+    CHART_CACHE_MAX_AGE,
+)
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+CHART_FIGSIZE = (12, 6)
+CHART_DPI = 150
+# Names of content-addressed chart files ("<ticker>_<period>_<20 hex digits>.png");
+# only these are evicted, other images in the output directory are left alone
+CACHED_CHART_NAME = re.compile(rf"_[0-9a-f]{{20}}\.{re.escape(CHART_FORMAT)}$")
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_lock = threading.Lock()
+
+
+def _segment_path(x: np.ndarray, start: np.ndarray, end: np.ndarray):
+    """Interleaves vertical segments into one path broken by NaN/NaT gaps."""
+    xs = np.repeat(x, 3)
+    xs[2::3] = np.datetime64("NaT")
+    ys = np.empty(len(xs))
+    ys[0::3] = start
+    ys[1::3] = end
+    ys[2::3] = np.nan
+    return xs, ys
+
+
+def _draw_candlesticks(ax: Axes, hist: pd.DataFrame) -> None:
+    """Draws candlesticks as a few batched line paths.
+
+    Wicks and bodies of each color are a single Line2D whose vertical
+    segments are separated by gaps, so the artist count does not grow
+    with the number of bars.
+
+    Args:
+        ax: Axes to draw on
+        hist: OHLC price history indexed by timestamp
+    """
+    index = hist.index
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    x = index.to_numpy()
+    open_, high, low, close = (hist[col].to_numpy(dtype=float) for col in ["Open", "High", "Low", "Close"])
+    rising = close >= open_
+    for mask, color in ((rising, "green"), (~rising, "red")):
+        if not mask.any():
+            continue
+        ax.plot(*_segment_path(x[mask], low[mask], high[mask]), color=color, linewidth=1)
+        ax.plot(*_segment_path(x[mask], open_[mask], close[mask]), color=color, linewidth=3)
+
+
+def _save_figure(fig: Figure, chart_path: str) -> None:
+    """Saves a figure under a temporary name and renames it into place,
+    so readers never see a partial chart."""
+    tmp_path = f"{chart_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fig.savefig(tmp_path, dpi=CHART_DPI, bbox_inches="tight", format=CHART_FORMAT)
+    os.replace(tmp_path, chart_path)
+
+
+def _scale_interval(interval: str, factor: int) -> str:
+    """Describes the bar size after merging `factor` bars (e.g., "5m" x 3 -> "15m")."""
+    match = re.match(r"^(\d+)([a-z]+)$", interval)
+    if factor == 1:
+        return interval
+    if not match:
+        return f"{factor}x{interval}"
+    return f"{int(match.group(1)) * factor}{match.group(2)}"
+
+
+def _prepare_plot_frame(
+    hist: pd.DataFrame, interval: str, chart_type: str
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Downsamples price history to what the chart can actually show.
+
+    The SMA is computed on the full history first. Line charts keep the
+    LTTB-selected points, candlestick charts merge bars so each candle is
+    at least MIN_CANDLE_PIXELS wide.
+
+    Args:
+        hist: OHLC price history
+        interval: Data interval of the history
+        chart_type: Type of chart ("line" or "candlestick")
+
+    Returns:
+        Tuple of (frame to plot, resolution details)
+    """
+    plot = hist[["Open", "High", "Low", "Close"]].copy()
+    if len(hist) >= 20:
+        plot["SMA_20"] = hist["Close"].rolling(window=20).mean()
+
+    max_points = plot_width_pixels(CHART_FIGSIZE[0], CHART_DPI)
+    resolution: Dict[str, Any] = {"source_points": len(hist)}
+    if chart_type.lower() == "candlestick":
+        max_bars = max_points // MIN_CANDLE_PIXELS
+        factor = aggregation_factor(len(plot), max_bars)
+        plot = aggregate_ohlc(plot, factor)
+        resolution.update(
+            method="ohlc" if factor > 1 else "none",
+            bars_per_candle=factor,
+            interval=_scale_interval(interval, factor),
+        )
+    else:
+        plot = downsample_line(plot, max_points)
+        resolution.update(
+            method="lttb" if len(plot) < len(hist) else "none",
+            interval=interval,
+        )
+    resolution["plotted_points"] = len(plot)
+    return plot, resolution
+
+
+def _render_chart(
+    hist: pd.DataFrame, ticker: str, period: str, chart_type: str, chart_path: str
+) -> str:
+    """Renders a price chart to a file.
+
+    Uses a standalone Figure rather than pyplot's global state, so it is
+    safe to run in worker processes or threads.
+
+    Args:
+        hist: OHLC price history prepared by _prepare_plot_frame
+        ticker: Stock ticker symbol
+        period: Time period shown in the title
+        chart_type: Type of chart ("line" or "candlestick")
+        chart_path: Destination file path
+
+    Returns:
+        The chart path
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=CHART_FIGSIZE)
+    ax = fig.subplots()
+
+    if chart_type.lower() == "candlestick":
+        # Candlesticks using actual dates on x-axis
+        _draw_candlesticks(ax, hist)
+    else:
+        # Line chart
+        ax.plot(hist.index, hist["Close"], label="Close Price", linewidth=2)
+        ax.fill_between(hist.index, hist["Low"], hist["High"], alpha=0.3, label="Range")
+
+    # Add moving averages if enough data
+    if "SMA_20" in hist:
+        ax.plot(hist.index, hist["SMA_20"], label="SMA 20", linestyle="--", alpha=0.7)
+
+    # Formatting
+    ax.set_title(f"{ticker} Price Chart ({period})", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Date", fontsize=12)
+    ax.set_ylabel("Price ($)", fontsize=12)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+
+    _save_figure(fig, chart_path)
+    return chart_path
+
+
+def _get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """Gets the shared render process pool (None renders inline)."""
+    global _render_pool
+    if CHART_RENDER_WORKERS <= 0:
+        return None
+    with _render_pool_lock:
+        if _render_pool is None:
+            # Spawned workers do not inherit the parent's threads and locks
+            _render_pool = ProcessPoolExecutor(
+                max_workers=CHART_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _render_pool
+
+
+def _render_once(render: Callable[..., str], chart_path: str, output_dir: str, *args: Any) -> bool:
+    """Renders a chart unless its content-addressed file already exists.
+
+    Args:
+        render: Top-level render function taking (*args, chart_path)
+        chart_path: Destination file path
+        output_dir: Chart directory, evicted after a new render
+        *args: Arguments for the render function
+
+    Returns:
+        True if the existing file was reused
+    """
+    if os.path.exists(chart_path):
+        # Mark as recently used for eviction
+        os.utime(chart_path)
+        return True
+
+    pool = _get_render_pool()
+    if pool is None:
+        render(*args, chart_path)
+    else:
+        pool.submit(render, *args, chart_path).result()
+    evict_charts(output_dir)
+    return False
+
+
+def chart_key(
+    ticker: str, period: str, interval: str, chart_type: str, hist: pd.DataFrame
+) -> str:
+    """Builds the content hash that names a chart file.
+
+    The last bar's timestamp and close are part of the key, so a chart is
+    re-rendered when a new bar arrives or the forming bar changes.
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Time period
+        interval: Data interval
+        chart_type: Type of chart
+        hist: Price history being charted
+
+    Returns:
+        Hex digest identifying the chart
+    """
+    last_bar = f"{hist.index[-1].isoformat()}|{float(hist['Close'].iloc[-1])!r}"
+    raw = "|".join([ticker.upper(), period, interval, chart_type.lower(), last_bar])
+    return hashlib.sha256(raw.encode()).hexdigest()[:20]
+
+
+def evict_charts(
+    output_dir: str,
+    max_bytes: int = CHART_CACHE_MAX_BYTES,
+    max_age: float = CHART_CACHE_MAX_AGE,
+) -> int:
+    """Removes old chart files, then the least recently used ones over the size limit.
+
+    Only files named by the chart tools' content hash are considered.
+
+    Args:
+        output_dir: Chart directory
+        max_bytes: Maximum total size of the chart files
+        max_age: Maximum age in seconds since a chart was last served
+
+    Returns:
+        Number of files removed
+    """
+    now = time.time()
+    charts = []
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and CACHED_CHART_NAME.search(entry.name):
+                stat = entry.stat()
+                charts.append((stat.st_mtime, stat.st_size, entry.path))
+
+    charts.sort()
+    total = sum(size for _, size, _ in charts)
+    removed = 0
+    for mtime, size, path in charts:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
 
 
 def generate_price_chart(
@@ -18,6 +300,11 @@ def generate_price_chart(
 ) -> Dict[str, Any]:
     """Generates a price chart for a given ticker.
 
+    Charts are named by a hash of their inputs, so a repeated request for
+    the same data returns the existing file without re-rendering. Long
+    histories are downsampled to the chart's pixel width; data["resolution"]
+    reports the method and the number of points plotted.
+
     Args:
         ticker: Stock ticker symbol
         period: Time period for the chart
@@ -34,9 +321,8 @@ def generate_price_chart(
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
 
-        # Fetch data
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period, interval=interval)
+        # Fetch data (shared with the market data tools through the cache)
+        hist = get_price_history(ticker, period=period, interval=interval)
 
         if hist.empty:
             return {
@@ -44,56 +330,18 @@ def generate_price_chart(
                 "error_message": f"No data found for ticker {ticker}",
             }
 
-        # Create figure
-        fig, ax = plt.subplots(figsize=(12, 6))
-
-        if chart_type.lower() == "candlestick":
-            # Simple candlestick-like visualization using actual dates on x-axis
-            for ts, row in hist.iterrows():
-                color = "green" if row["Close"] >= row["Open"] else "red"
-                ax.plot(
-                    [ts, ts],
-                    [row["Low"], row["High"]],
-                    color=color,
-                    linewidth=1,
-                )
-                ax.plot(
-                    [ts, ts],
-                    [row["Open"], row["Close"]],
-                    color=color,
-                    linewidth=3,
-                )
-        else:
-            # Line chart
-            ax.plot(hist.index, hist["Close"], label="Close Price", linewidth=2)
-            ax.fill_between(hist.index, hist["Low"], hist["High"], alpha=0.3, label="Range")
-
-        # Add moving averages if enough data
-        if len(hist) >= 20:
-            hist["SMA_20"] = hist["Close"].rolling(window=20).mean()
-            ax.plot(hist.index, hist["SMA_20"], label="SMA 20", linestyle="--", alpha=0.7)
-
-        # Formatting
-        ax.set_title(f"{ticker} Price Chart ({period})", fontsize=14, fontweight="bold")
-        ax.set_xlabel("Date", fontsize=12)
-        ax.set_ylabel("Price ($)", fontsize=12)
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        # Save chart
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{ticker}_{period}_{timestamp}.png"
+        filename = f"{ticker}_{period}_{chart_key(ticker, period, interval, chart_type, hist)}.{CHART_FORMAT}"
         chart_path = os.path.join(output_dir, filename)
-        plt.savefig(chart_path, dpi=150, bbox_inches="tight")
-        plt.close()
+        plot, resolution = _prepare_plot_frame(hist, interval, chart_type)
+        cached = _render_once(_render_chart, chart_path, output_dir, plot, ticker, period, chart_type)
 
         data = {
             "ticker": ticker,
             "period": period,
             "chart_type": chart_type,
             "data_points": len(hist),
+            "resolution": resolution,
+            "cached": cached,
             "price_range": {
                 "high": float(hist["High"].max()),
                 "low": float(hist["Low"].min()),
@@ -113,3 +361,148 @@ def generate_price_chart(
             "error_message": f"Error generating chart for {ticker}: {str(e)}",
         }
 
+
+def _render_comparison_chart(
+    closes: pd.DataFrame, highs: pd.DataFrame, lows: pd.DataFrame, period: str, chart_path: str
+) -> str:
+    """Renders a normalized-performance overlay and a small-multiples grid in one figure.
+
+    Args:
+        closes: Time x ticker close prices
+        highs: Time x ticker high prices
+        lows: Time x ticker low prices
+        period: Time period shown in the titles
+        chart_path: Destination file path
+
+    Returns:
+        The chart path
+    """
+    from matplotlib.figure import Figure
+
+    tickers = list(closes.columns)
+    ncols = min(4, len(tickers))
+    nrows = math.ceil(len(tickers) / ncols)
+    fig = Figure(figsize=(12, 5 + 2.5 * nrows))
+    grid = fig.add_gridspec(1 + nrows, ncols, height_ratios=[2.5] + [1] * nrows)
+
+    # Overlay of performance rebased to 100 at each ticker's first bar
+    overlay = fig.add_subplot(grid[0, :])
+    rebased = closes / closes.bfill().iloc[0] * 100
+    colors = {}
+    for ticker in tickers:
+        series = rebased[ticker].dropna()
+        (line,) = overlay.plot(series.index, series.to_numpy(), label=ticker, linewidth=1.5)
+        colors[ticker] = line.get_color()
+    overlay.axhline(100, color="gray", linewidth=0.8, linestyle=":")
+    overlay.set_title(f"Relative Performance ({period}, rebased to 100)", fontsize=14, fontweight="bold")
+    overlay.set_ylabel("Indexed Price", fontsize=12)
+    overlay.legend(ncol=min(len(tickers), 5), fontsize=9)
+    overlay.grid(True, alpha=0.3)
+
+    # One small panel per ticker with its own price scale
+    first_panel = None
+    for i, ticker in enumerate(tickers):
+        ax = fig.add_subplot(grid[1 + i // ncols, i % ncols], sharex=first_panel)
+        first_panel = first_panel or ax
+        close = closes[ticker].dropna()
+        ax.plot(close.index, close.to_numpy(), color=colors[ticker], linewidth=1)
+        ax.fill_between(
+            close.index,
+            lows[ticker].loc[close.index],
+            highs[ticker].loc[close.index],
+            color=colors[ticker],
+            alpha=0.3,
+        )
+        ax.set_title(ticker, fontsize=10)
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis="both", labelsize=8)
+        ax.tick_params(axis="x", labelrotation=45)
+
+    fig.tight_layout()
+    _save_figure(fig, chart_path)
+    return chart_path
+
+
+def generate_comparison_chart(
+    tickers: List[str],
+    period: str = "1y",
+    interval: str = "1d",
+    output_dir: str = "charts",
+) -> Dict[str, Any]:
+    """Generates one comparison chart for several tickers.
+
+    The figure has a normalized-performance overlay (all tickers rebased
+    to 100) above a small-multiples grid with one price panel per ticker.
+    History for all tickers comes from a single bulk download.
+
+    Args:
+        tickers: Stock ticker symbols (e.g., ["TSLA", "F", "GM"])
+        period: Time period for the chart
+        interval: Data interval
+        output_dir: Directory to save the chart
+
+    Returns:
+        Dictionary with status and chart file path.
+        Success: {"status": "success", "chart_path": "...", "data": {...}}
+        Error: {"status": "error", "error_message": "..."}
+    """
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    try:
+        if not symbols:
+            return {"status": "error", "error_message": "No tickers provided"}
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        wide, errors = get_price_history_wide(symbols, period=period, interval=interval)
+        if not wide:
+            return {
+                "status": "error",
+                "error_message": f"No data found for tickers {', '.join(symbols)}",
+            }
+
+        closes, highs, lows = wide["Close"], wide["High"], wide["Low"]
+        charted = list(closes.columns)
+        last_bars = "|".join(
+            f"{closes[t].last_valid_index().isoformat()}:{float(closes[t].dropna().iloc[-1])!r}"
+            for t in charted
+        )
+        raw = "|".join(["comparison", ",".join(charted), period, interval, last_bars])
+        digest = hashlib.sha256(raw.encode()).hexdigest()[:20]
+        filename = f"comparison_{'_'.join(charted[:4])}_{period}_{digest}.{CHART_FORMAT}"
+        chart_path = os.path.join(output_dir, filename)
+
+        cached = _render_once(
+            _render_comparison_chart, chart_path, output_dir, closes, highs, lows, period
+        )
+
+        performance = {}
+        for ticker in charted:
+            close = closes[ticker].dropna()
+            performance[ticker] = {
+                "total_return": float(close.iloc[-1] / close.iloc[0] - 1),
+                "current": float(close.iloc[-1]),
+            }
+        ranked = sorted(performance, key=lambda t: performance[t]["total_return"], reverse=True)
+
+        data = {
+            "tickers": charted,
+            "period": period,
+            "data_points": len(closes),
+            "cached": cached,
+            "performance": performance,
+            "best_performer": ranked[0],
+            "worst_performer": ranked[-1],
+            "errors": errors,
+        }
+
+        return {
+            "status": "success",
+            "chart_path": chart_path,
+            "data": data,
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error generating comparison chart for {', '.join(symbols)}: {str(e)}",
+        }
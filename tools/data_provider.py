@@ -0,0 +1,391 @@
+"""Market data providers used by the market, chart and ratio tools.
+
+All tools obtain bars and fundamentals through :func:`get_provider`, so the
+data vendor can be swapped (or replaced by an offline synthetic source for
+benchmarks and CI) with the ``MARKET_DATA_PROVIDER`` setting.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Any, List, Optional, Protocol
+import re
+import threading
+import zlib
+from config.settings import MARKET_DATA_PROVIDER, SYNTHETIC_DATA_SEED
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+_PERIOD_OFFSETS = {
+    "mo": lambda n: pd.DateOffset(months=n),
+    "y": lambda n: pd.DateOffset(years=n),
+}
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[pd.Timestamp]:
+    """Get the UTC start time covered by a calendar period.
+
+    Args:
+        period: Period string such as "1mo", "1y", "ytd" or "max"
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        Start timestamp, or None for "max" and trading-day periods ("5d"),
+        which are resolved by session count instead.
+    """
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    if period == "max" or session_count(period) is not None:
+        return None
+    match = re.fullmatch(r"(\d+)(mo|y)", period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    return now - _PERIOD_OFFSETS[match.group(2)](int(match.group(1)))
+
+
+def session_count(period: str) -> Optional[int]:
+    """Get the number of trading sessions in a trading-day period ("5d" -> 5)."""
+    match = re.fullmatch(r"(\d+)d", period)
+    return int(match.group(1)) if match else None
+
+
+class MarketDataProvider(Protocol):
+    """Interface every market data source implements."""
+
+    name: str
+    # Remote host the provider talks to, used for per-host concurrency limits
+    host: str
+
+    def history(
+        self,
+        ticker: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """Get OHLCV bars for a period or from a start time (empty if unknown)."""
+        ...
+
+    def bulk_history(
+        self, tickers: List[str], period: str, interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """Get OHLCV bars for several tickers, omitting tickers without data."""
+        ...
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        """Get the fundamentals/info dictionary for a ticker (empty if unknown)."""
+        ...
+
+
+class YFinanceProvider:
+    """Provider backed by the Yahoo Finance API through yfinance."""
+
+    name = "yfinance"
+    host = "query2.finance.yahoo.com"
+
+    def history(
+        self,
+        ticker: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+    def bulk_history(
+        self, tickers: List[str], period: str, interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        raw = yf.download(
+            tickers,
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            progress=False,
+            threads=True,
+        )
+        frames = {}
+        if raw is None or raw.empty:
+            return frames
+        available = set(raw.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker not in available:
+                continue
+            frame = raw[ticker].dropna(how="all")
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        import yfinance as yf
+
+        return yf.Ticker(ticker).info
+
+
+_SYMBOL_PATTERN = re.compile(r"^\^?[A-Z][A-Z0-9]{0,5}([.\-][A-Z0-9]{1,3})?$")
+
+_SECTORS = [
+    ("Technology", "Semiconductors"),
+    ("Technology", "Consumer Electronics"),
+    ("Technology", "Software - Infrastructure"),
+    ("Consumer Cyclical", "Auto Manufacturers"),
+    ("Financial Services", "Banks - Diversified"),
+    ("Healthcare", "Drug Manufacturers - General"),
+    ("Energy", "Oil & Gas Integrated"),
+    ("Communication Services", "Internet Content & Information"),
+]
+
+_INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+
+
+class SyntheticProvider:
+    """Deterministic offline provider for benchmarks, load tests and CI.
+
+    Daily bars follow a geometric Brownian motion seeded per ticker, so the
+    same ticker always yields the same series, and requests for different
+    periods return consistent, overlapping bars. Fundamentals are canned
+    values derived from the same seed. Symbols that do not look like
+    ticker symbols return no data, like an unknown ticker would.
+    """
+
+    name = "synthetic"
+    host = "localhost"
+    epoch = "2000-01-03"
+
+    def __init__(self, seed: int = SYNTHETIC_DATA_SEED):
+        self.seed = seed
+        self._daily: Dict[tuple, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, ticker: str, *parts: Any) -> np.random.Generator:
+        key = "|".join([ticker, *map(str, parts)]).encode()
+        return np.random.default_rng([self.seed, zlib.crc32(key)])
+
+    def _params(self, ticker: str) -> Dict[str, float]:
+        rng = self._rng(ticker, "params")
+        return {
+            "start_price": float(rng.uniform(10, 300)),
+            "drift": float(rng.uniform(-0.05, 0.25)),
+            "volatility": float(rng.uniform(0.15, 0.6)),
+            "volume": float(rng.uniform(1e6, 5e7)),
+        }
+
+    def is_known(self, ticker: str) -> bool:
+        """Check whether a symbol has synthetic data."""
+        return bool(_SYMBOL_PATTERN.match(ticker.strip().upper()))
+
+    def _daily_bars(self, ticker: str) -> pd.DataFrame:
+        today = pd.Timestamp.now(tz="America/New_York").normalize().tz_localize(None)
+        key = (ticker, today)
+        with self._lock:
+            cached = self._daily.get(key)
+        if cached is not None:
+            return cached
+
+        # np.is_busday is much faster than pd.bdate_range over decades of days
+        days = np.arange(
+            np.datetime64(self.epoch),
+            (today + pd.Timedelta(days=1)).to_datetime64(),
+            dtype="datetime64[D]",
+        )
+        dates = pd.DatetimeIndex(days[np.is_busday(days)])
+        params = self._params(ticker)
+        rng = self._rng(ticker, "daily")
+        n = len(dates)
+        dt = 1 / 252
+        sigma = params["volatility"]
+        log_returns = rng.normal((params["drift"] - sigma**2 / 2) * dt, sigma * np.sqrt(dt), n)
+        close = params["start_price"] * np.exp(np.cumsum(log_returns))
+        gap = np.exp(rng.normal(0, sigma * np.sqrt(dt) / 4, n))
+        open_ = np.concatenate([[params["start_price"]], close[:-1]]) * gap
+        wick = np.abs(rng.normal(0, sigma * np.sqrt(dt) / 2, (2, n)))
+        high = np.maximum(open_, close) * np.exp(wick[0])
+        low = np.minimum(open_, close) * np.exp(-wick[1])
+        volume = (params["volume"] * rng.lognormal(0, 0.3, n)).astype(np.int64)
+
+        frame = pd.DataFrame(
+            {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+            index=pd.DatetimeIndex(dates.tz_localize("America/New_York"), name="Date"),
+        )
+        with self._lock:
+            self._daily = {k: v for k, v in self._daily.items() if k[1] == today}
+            self._daily[key] = frame
+        return frame
+
+    def _intraday_bars(self, ticker: str, daily: pd.DataFrame, minutes: int) -> pd.DataFrame:
+        sigma = self._params(ticker)["volatility"]
+        per_session = max(1, 390 // minutes)
+        frames = []
+        for day, row in daily.iterrows():
+            rng = self._rng(ticker, "intraday", minutes, day.date())
+            steps = rng.normal(0, sigma * np.sqrt(minutes / (390 * 252)), per_session)
+            close = row["Open"] * np.exp(np.cumsum(steps))
+            open_ = np.concatenate([[row["Open"]], close[:-1]])
+            wick = np.abs(rng.normal(0, sigma * np.sqrt(minutes / (390 * 252)) / 2, (2, per_session)))
+            index = day + pd.Timedelta(hours=9, minutes=30) + pd.to_timedelta(
+                np.arange(per_session) * minutes, unit="min"
+            )
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "Open": open_,
+                        "High": np.maximum(open_, close) * np.exp(wick[0]),
+                        "Low": np.minimum(open_, close) * np.exp(-wick[1]),
+                        "Close": close,
+                        "Volume": np.full(per_session, int(row["Volume"]) // per_session),
+                    },
+                    index=pd.DatetimeIndex(index, name="Datetime"),
+                )
+            )
+        return pd.concat(frames) if frames else pd.DataFrame()
+
+    def history(
+        self,
+        ticker: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        symbol = ticker.strip().upper()
+        if not self.is_known(symbol):
+            return pd.DataFrame()
+
+        daily = self._daily_bars(symbol)
+        if start is not None:
+            start = pd.Timestamp(start)
+            start = start.tz_convert("America/New_York") if start.tz else start.tz_localize("America/New_York")
+            daily = daily[daily.index >= start.normalize()]
+        elif period is not None:
+            sessions = session_count(period)
+            if sessions is not None:
+                daily = daily.iloc[-sessions:]
+            else:
+                begin = period_start(period)
+                if begin is not None:
+                    daily = daily[daily.index >= begin]
+
+        if interval in _INTRADAY_MINUTES:
+            # Keep intraday requests bounded like real vendors do.
+            frame = self._intraday_bars(symbol, daily.iloc[-60:], _INTRADAY_MINUTES[interval])
+            if start is not None and not frame.empty:
+                frame = frame[frame.index >= start]
+            return frame
+        if interval == "1wk":
+            return self._resample(daily, "W-FRI")
+        if interval in ("1mo", "3mo"):
+            return self._resample(daily, "ME" if interval == "1mo" else "QE")
+        return daily.copy()
+
+    @staticmethod
+    def _resample(daily: pd.DataFrame, rule: str) -> pd.DataFrame:
+        return (
+            daily.resample(rule)
+            .agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
+            .dropna(subset=["Close"])
+        )
+
+    def bulk_history(
+        self, tickers: List[str], period: str, interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        frames = {}
+        for ticker in tickers:
+            frame = self.history(ticker, period=period, interval=interval)
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        symbol = ticker.strip().upper()
+        if not self.is_known(symbol):
+            return {}
+
+        rng = self._rng(symbol, "info")
+        price = float(self._daily_bars(symbol)["Close"].iloc[-1])
+        shares = float(rng.uniform(2e8, 1.5e10))
+        market_cap = price * shares
+        revenue = market_cap / rng.uniform(1, 12)
+        ebitda = revenue * rng.uniform(0.08, 0.45)
+        net_debt = market_cap * rng.uniform(-0.1, 0.4)
+        trailing_eps = price / rng.uniform(8, 60)
+        sector, industry = _SECTORS[int(rng.integers(len(_SECTORS)))]
+        return {
+            "symbol": symbol,
+            "longName": f"{symbol} Synthetic Holdings Inc.",
+            "sector": sector,
+            "industry": industry,
+            "regularMarketPrice": price,
+            "currentPrice": price,
+            "sharesOutstanding": shares,
+            "marketCap": market_cap,
+            "enterpriseValue": market_cap + net_debt,
+            "trailingPE": price / trailing_eps,
+            "forwardPE": price / (trailing_eps * rng.uniform(0.9, 1.4)),
+            "pegRatio": float(rng.uniform(0.5, 3.5)),
+            "enterpriseToEbitda": (market_cap + net_debt) / ebitda,
+            "priceToBook": float(rng.uniform(0.8, 25)),
+            "priceToSalesTrailing12Months": market_cap / revenue,
+            "returnOnEquity": float(rng.uniform(-0.1, 0.6)),
+            "returnOnAssets": float(rng.uniform(-0.05, 0.25)),
+            "profitMargins": float(rng.uniform(-0.05, 0.35)),
+            "operatingMargins": float(rng.uniform(0.0, 0.45)),
+            "revenueGrowth": float(rng.uniform(-0.15, 0.6)),
+            "earningsGrowth": float(rng.uniform(-0.3, 0.9)),
+            "earningsQuarterlyGrowth": float(rng.uniform(-0.3, 0.9)),
+            "freeCashflow": revenue * rng.uniform(-0.02, 0.3),
+            "operatingCashflow": revenue * rng.uniform(0.05, 0.4),
+            "debtToEquity": float(rng.uniform(0, 250)),
+            "currentRatio": float(rng.uniform(0.6, 4)),
+            "quickRatio": float(rng.uniform(0.4, 3.5)),
+        }
+
+
+_PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "synthetic": SyntheticProvider,
+}
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(name: str) -> MarketDataProvider:
+    """Create a provider by name.
+
+    Args:
+        name: Provider name ("yfinance" or "synthetic")
+
+    Returns:
+        Provider instance
+    """
+    try:
+        return _PROVIDERS[name.lower()]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown market data provider '{name}'. Available: {', '.join(_PROVIDERS)}"
+        ) from None
+
+
+def get_provider() -> MarketDataProvider:
+    """Get the process-wide provider selected by ``MARKET_DATA_PROVIDER``."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_provider(MARKET_DATA_PROVIDER)
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """Override the process-wide provider (None restores the configured one)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,146 @@
+"""Pixel-aware downsampling of price series for charting.
+
+Line charts use Largest-Triangle-Three-Buckets (LTTB), which keeps the
+points that define the visual shape of a series (peaks, troughs, turns).
+Candlestick charts aggregate consecutive bars into coarser OHLC bars, so
+every candle still shows the true open, high, low and close of its span.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+import math
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Narrowest candle (wick plus body) that stays readable, in pixels
+MIN_CANDLE_PIXELS = 4
+
+
+def plot_width_pixels(fig_width_inches: float, dpi: float, axes_fraction: float = 0.8) -> int:
+    """Estimates the width of a chart's plotting area in pixels.
+
+    Args:
+        fig_width_inches: Figure width
+        dpi: Output resolution
+        axes_fraction: Share of the figure width taken by the axes
+
+    Returns:
+        Plot area width in pixels
+    """
+    return max(1, int(fig_width_inches * dpi * axes_fraction))
+
+
+def lttb_indices(y: np.ndarray, n_out: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """Selects points of a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The rest of the series is
+    split into n_out - 2 buckets, and from each bucket the point forming
+    the largest triangle with the previously selected point and the mean
+    of the next bucket is kept.
+
+    Args:
+        y: Series values (without NaN)
+        n_out: Number of points to keep
+        x: Point positions (defaults to evenly spaced)
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # Bucket boundaries for the n_out - 2 inner buckets over points 1 .. n-2
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x, starts) / counts
+    mean_y = np.add.reduceat(y, starts) / counts
+    # The bucket after the last inner bucket is the final point itself
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = starts[i], edges[i + 1]
+        bx = x[start:end]
+        by = y[start:end]
+        area = np.abs((x[a] - next_x[i]) * (by - y[a]) - (x[a] - bx) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_line(frame: pd.DataFrame, max_points: int, column: str = "Close") -> pd.DataFrame:
+    """Reduces a price frame to the LTTB-selected points of one column.
+
+    High and Low become the extremes over each selected point's span, so
+    a shaded high/low range still covers every bar.
+
+    Args:
+        frame: Price history indexed by timestamp
+        max_points: Maximum number of points to keep
+        column: Column whose shape LTTB preserves
+
+    Returns:
+        Downsampled frame (the input itself if it is already small enough)
+    """
+    if len(frame) <= max_points:
+        return frame
+    x = frame.index.as_unit("ns").asi8 if isinstance(frame.index, pd.DatetimeIndex) else None
+    idx = lttb_indices(frame[column].to_numpy(dtype=float), max_points, x)
+    result = frame.iloc[idx].copy()
+    for name, reduce in (("High", np.fmax), ("Low", np.fmin)):
+        if name in frame:
+            result[name] = reduce.reduceat(frame[name].to_numpy(dtype=float), idx)
+    return result
+
+
+def aggregate_ohlc(frame: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """Aggregates every `factor` consecutive bars into one OHLC bar.
+
+    Each bar is stamped with the time of its first source bar. Extra
+    columns (e.g. indicators) take the value of the last source bar.
+
+    Args:
+        frame: OHLC(V) history indexed by timestamp
+        factor: Number of source bars per aggregated bar
+
+    Returns:
+        Aggregated frame
+    """
+    if factor <= 1:
+        return frame
+    n = len(frame)
+    starts = np.arange(0, n, factor)
+    ends = np.minimum(starts + factor, n) - 1
+
+    data = {}
+    for name in frame.columns:
+        values = frame[name].to_numpy()
+        if name == "Open":
+            data[name] = values[starts]
+        elif name == "High":
+            data[name] = np.fmax.reduceat(values.astype(float), starts)
+        elif name == "Low":
+            data[name] = np.fmin.reduceat(values.astype(float), starts)
+        elif name == "Volume":
+            data[name] = np.add.reduceat(values, starts)
+        else:
+            data[name] = values[ends]
+    return pd.DataFrame(data, index=frame.index[starts])
+
+
+def aggregation_factor(n_bars: int, max_bars: int) -> int:
+    """Number of source bars merged per bar to fit max_bars."""
+    return max(1, math.ceil(n_bars / max(1, max_bars)))
@@ -0,0 +1,302 @@
+"""Persistent fundamentals snapshot cache with per-field staleness rules.
+
+Cleaned valuation metrics are stored per ticker in the application SQLite
+database. Two groups of fields age differently:
+
+* statement-derived fields (margins, growth, cash flow, debt ratios) only
+  change when new financial statements are filed, so the full snapshot is
+  re-downloaded after ``FUNDAMENTALS_STATEMENT_TTL``;
+* price-derived fields (market cap, enterprise value, P/E, P/B, P/S,
+  EV/EBITDA) move with the share price, so after ``FUNDAMENTALS_PRICE_TTL``
+  they are re-derived from the latest close instead of re-downloading the
+  whole info dictionary.
+
+Stale snapshots are served immediately while a refresh runs in the
+background (stale-while-revalidate); callers only block on a missing
+snapshot or one older than ``FUNDAMENTALS_MAX_STALE``.
+"""
+
+from typing import Dict, Any, Callable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import threading
+import time
+from tools.price_cache import get_price_history
+from utils.db import connect, sqlite_path_from_url
+from config.settings import (
+    FUNDAMENTALS_PRICE_TTL,
+    FUNDAMENTALS_STATEMENT_TTL,
+    FUNDAMENTALS_MAX_STALE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Valuation fields that scale with the share price
+PRICE_SCALED_FIELDS = [
+    "pe_ratio",
+    "forward_pe",
+    "peg_ratio",
+    "price_to_book",
+    "price_to_sales",
+    "market_cap",
+]
+PRICE_DERIVED_FIELDS = PRICE_SCALED_FIELDS + ["enterprise_value", "ev_to_ebitda"]
+
+
+def _latest_close(ticker: str) -> Optional[float]:
+    """Get the latest close through the shared price history cache."""
+    hist = get_price_history(ticker, period="5d")
+    if hist.empty:
+        return None
+    return float(hist["Close"].iloc[-1])
+
+
+def reprice(data: Dict[str, Any], price: float) -> Dict[str, Any]:
+    """Re-derives the price-dependent metrics of a snapshot at a new price.
+
+    Args:
+        data: Valuation data with "current_price" and "metrics"
+        price: New share price
+
+    Returns:
+        Updated copy of the valuation data
+    """
+    old_price = data.get("current_price")
+    if not old_price or not price:
+        return data
+    ratio = price / old_price
+    metrics = dict(data["metrics"])
+    old_market_cap = metrics.get("market_cap")
+    for field in PRICE_SCALED_FIELDS:
+        if isinstance(metrics.get(field), float):
+            metrics[field] = metrics[field] * ratio
+    enterprise_value = metrics.get("enterprise_value")
+    if isinstance(enterprise_value, float) and isinstance(old_market_cap, float):
+        # Debt and cash come from the balance sheet; only the equity part moves.
+        new_enterprise_value = enterprise_value + old_market_cap * (ratio - 1)
+        ev_to_ebitda = metrics.get("ev_to_ebitda")
+        if isinstance(ev_to_ebitda, float) and ev_to_ebitda:
+            ebitda = enterprise_value / ev_to_ebitda
+            metrics["ev_to_ebitda"] = new_enterprise_value / ebitda
+        metrics["enterprise_value"] = new_enterprise_value
+    return {**data, "current_price": price, "metrics": metrics}
+
+
+class FundamentalsCache:
+    """SQLite-backed cache of valuation data with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        loader: Callable[[str], Optional[Dict[str, Any]]],
+        db_path: Optional[str] = None,
+        price_loader: Callable[[str], Optional[float]] = _latest_close,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.loader = loader
+        self.db_path = db_path or sqlite_path_from_url()
+        self.price_loader = price_loader
+        self.clock = clock
+        self._initialized_path: Optional[str] = None
+        self._inflight: set = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fundamentals-refresh")
+
+    def _ensure_table(self) -> None:
+        if self._initialized_path == self.db_path:
+            return
+        with connect(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS fundamentals_cache (
+                    ticker TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    statement_fetched_at REAL NOT NULL,
+                    price_updated_at REAL NOT NULL
+                )"""
+            )
+        self._initialized_path = self.db_path
+
+    def _read(self, ticker: str) -> Optional[Dict[str, Any]]:
+        self._ensure_table()
+        with connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT data, statement_fetched_at, price_updated_at "
+                "FROM fundamentals_cache WHERE ticker = ?",
+                (ticker,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"data": json.loads(row[0]), "statement_fetched_at": row[1], "price_updated_at": row[2]}
+
+    def _write(
+        self, ticker: str, data: Dict[str, Any], statement_fetched_at: float, price_updated_at: float
+    ) -> None:
+        self._ensure_table()
+        with connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fundamentals_cache "
+                "(ticker, data, statement_fetched_at, price_updated_at) VALUES (?, ?, ?, ?)",
+                (ticker, json.dumps(data), statement_fetched_at, price_updated_at),
+            )
+
+    def store(self, ticker: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Stores a freshly downloaded snapshot.
+
+        Args:
+            ticker: Stock ticker symbol
+            data: Valuation data
+
+        Returns:
+            The data annotated with its freshness
+        """
+        now = self.clock()
+        symbol = ticker.strip().upper()
+        self._write(symbol, data, now, now)
+        return self._annotate(data, now, now, stale=False)
+
+    def snapshot_time(self, ticker: str) -> Optional[float]:
+        """Get when the statement fields of a ticker were last downloaded."""
+        entry = self._read(ticker.strip().upper())
+        return entry["statement_fetched_at"] if entry else None
+
+    def lookup(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Gets a cached snapshot without blocking on the network.
+
+        Stale snapshots are returned as-is and a background refresh is
+        scheduled for them.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Annotated valuation data, or None if nothing usable is cached
+        """
+        symbol = ticker.strip().upper()
+        entry = self._read(symbol)
+        if entry is None:
+            return None
+        return self._serve(symbol, entry)
+
+    def lookup_many(self, tickers: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Gets cached snapshots for many tickers with a single query.
+
+        Args:
+            tickers: Stock ticker symbols, or None for every cached ticker
+
+        Returns:
+            Annotated valuation data keyed by upper-case symbol; tickers with
+            nothing usable cached are omitted
+        """
+        self._ensure_table()
+        query = "SELECT ticker, data, statement_fetched_at, price_updated_at FROM fundamentals_cache"
+        with connect(self.db_path) as conn:
+            if tickers is None:
+                rows = conn.execute(query).fetchall()
+            else:
+                symbols = list(dict.fromkeys(t.strip().upper() for t in tickers))
+                rows = []
+                # Stay below SQLite's bound-parameter limit
+                for i in range(0, len(symbols), 900):
+                    chunk = symbols[i:i + 900]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows += conn.execute(f"{query} WHERE ticker IN ({placeholders})", chunk).fetchall()
+
+        snapshots = {}
+        for symbol, data, statement_fetched_at, price_updated_at in rows:
+            entry = {
+                "data": json.loads(data),
+                "statement_fetched_at": statement_fetched_at,
+                "price_updated_at": price_updated_at,
+            }
+            served = self._serve(symbol, entry)
+            if served is not None:
+                snapshots[symbol] = served
+        return snapshots
+
+    def _serve(self, symbol: str, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Annotates a stored entry, scheduling a refresh if it is stale."""
+        now = self.clock()
+        statement_age = now - entry["statement_fetched_at"]
+        price_age = now - entry["price_updated_at"]
+        if statement_age > FUNDAMENTALS_MAX_STALE:
+            return None
+
+        if statement_age > FUNDAMENTALS_STATEMENT_TTL:
+            self._revalidate(symbol, self._refresh_all)
+        elif price_age > FUNDAMENTALS_PRICE_TTL:
+            self._revalidate(symbol, self._refresh_prices)
+        else:
+            return self._annotate(
+                entry["data"], entry["statement_fetched_at"], entry["price_updated_at"], stale=False
+            )
+        return self._annotate(
+            entry["data"], entry["statement_fetched_at"], entry["price_updated_at"], stale=True
+        )
+
+    def get(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Gets a snapshot, downloading it only if nothing usable is cached.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Annotated valuation data, or None if the ticker is unknown
+        """
+        cached = self.lookup(ticker)
+        if cached is not None:
+            return cached
+        data = self.loader(ticker)
+        if data is None:
+            return None
+        return self.store(ticker, data)
+
+    def _revalidate(self, symbol: str, refresh: Callable[[str], None]) -> None:
+        with self._lock:
+            if symbol in self._inflight:
+                return
+            self._inflight.add(symbol)
+
+        def run() -> None:
+            try:
+                refresh(symbol)
+            except Exception as e:
+                logger.warning(f"Background fundamentals refresh failed for {symbol}: {e}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(symbol)
+
+        self._executor.submit(run)
+
+    def _refresh_all(self, symbol: str) -> None:
+        data = self.loader(symbol)
+        if data is not None:
+            self.store(symbol, data)
+
+    def _refresh_prices(self, symbol: str) -> None:
+        entry = self._read(symbol)
+        price = self.price_loader(symbol)
+        if entry is None or price is None:
+            return
+        self._write(symbol, reprice(entry["data"], price), entry["statement_fetched_at"], self.clock())
+
+    def wait_for_refreshes(self) -> None:
+        """Blocks until scheduled background refreshes finish (for tests and shutdown)."""
+        self._executor.submit(lambda: None).result()
+        while True:
+            with self._lock:
+                if not self._inflight:
+                    return
+            time.sleep(0.01)
+
+    @staticmethod
+    def _annotate(
+        data: Dict[str, Any], statement_fetched_at: float, price_updated_at: float, stale: bool
+    ) -> Dict[str, Any]:
+        return {
+            **data,
+            "freshness": {
+                "statement_fetched_at": statement_fetched_at,
+                "price_updated_at": price_updated_at,
+                "stale": stale,
+            },
+        }
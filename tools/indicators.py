@@ -0,0 +1,324 @@
+"""Streaming technical indicators with constant-time per-bar updates.
+
+Each (ticker, interval) stream keeps an :class:`IndicatorState` holding a
+small ring buffer of recent closes plus the recursive state of the
+exponential indicators. A new bar updates SMA, EMA, rolling standard
+deviation, RSI, MACD, Bollinger Bands and ATR in O(1) without re-scanning
+the history. Re-sending the most recent bar (an intraday update of a bar
+that is still forming) replaces it instead of appending a new one.
+
+Values are always those of a full computation over the frame passed in
+(the requested period), so they do not depend on earlier calls: a stream
+is only extended by a frame that starts at the same bar, and any other
+frame rebuilds it.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Any, Optional, Tuple
+import math
+import threading
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+SMA_WINDOW = 20
+EMA_SPAN = 12
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+BOLLINGER_STD = 2.0
+
+# Running sums are recomputed from the ring buffer at this cadence to stop
+# floating point drift from accumulating.
+_RESUM_INTERVAL = 1024
+
+
+def _ema_alpha(span: int) -> float:
+    return 2.0 / (span + 1)
+
+
+class IndicatorState:
+    """Incremental indicator state for one price stream."""
+
+    __slots__ = (
+        "window",
+        "count",
+        "sum",
+        "sum_sq",
+        "ema",
+        "ema_fast",
+        "ema_slow",
+        "macd_signal",
+        "avg_gain",
+        "avg_loss",
+        "atr",
+        "prev_close",
+        "last_close",
+        "first_ts",
+        "last_ts",
+        "prev_ts",
+        "_checkpoint",
+    )
+
+    def __init__(self):
+        self.window = np.zeros(SMA_WINDOW, dtype=np.float64)
+        self.count = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.ema = math.nan
+        self.ema_fast = math.nan
+        self.ema_slow = math.nan
+        self.macd_signal = math.nan
+        self.avg_gain = math.nan
+        self.avg_loss = math.nan
+        self.atr = math.nan
+        self.prev_close = math.nan
+        self.last_close = math.nan
+        self.first_ts: Optional[int] = None
+        self.last_ts: Optional[int] = None
+        self.prev_ts: Optional[int] = None
+        self._checkpoint: Optional[Tuple[Any, ...]] = None
+
+    def _snapshot(self) -> Tuple[Any, ...]:
+        return (
+            self.window.copy(),
+            self.count,
+            self.sum,
+            self.sum_sq,
+            self.ema,
+            self.ema_fast,
+            self.ema_slow,
+            self.macd_signal,
+            self.avg_gain,
+            self.avg_loss,
+            self.atr,
+            self.prev_close,
+            self.last_close,
+            self.last_ts,
+            self.prev_ts,
+        )
+
+    def _restore(self, snapshot: Tuple[Any, ...]) -> None:
+        (
+            window,
+            self.count,
+            self.sum,
+            self.sum_sq,
+            self.ema,
+            self.ema_fast,
+            self.ema_slow,
+            self.macd_signal,
+            self.avg_gain,
+            self.avg_loss,
+            self.atr,
+            self.prev_close,
+            self.last_close,
+            self.last_ts,
+            self.prev_ts,
+        ) = snapshot
+        self.window[:] = window
+
+    def update(self, ts: int, high: float, low: float, close: float) -> None:
+        """Applies one bar.
+
+        Args:
+            ts: Bar timestamp in nanoseconds since the epoch
+            high: Bar high
+            low: Bar low
+            close: Bar close
+        """
+        if self.last_ts is not None and ts < self.last_ts:
+            return
+        if ts == self.last_ts and self._checkpoint is not None:
+            # Revised last bar: roll back to the state before it and re-apply.
+            self._restore(self._checkpoint)
+        self._checkpoint = self._snapshot()
+
+        # Rolling window (SMA, rolling std, Bollinger)
+        slot = self.count % SMA_WINDOW
+        if self.count >= SMA_WINDOW:
+            evicted = self.window[slot]
+            self.sum -= evicted
+            self.sum_sq -= evicted * evicted
+        self.window[slot] = close
+        self.sum += close
+        self.sum_sq += close * close
+        self.count += 1
+        if self.count % _RESUM_INTERVAL == 0:
+            self.sum = float(self.window.sum())
+            self.sum_sq = float(np.dot(self.window, self.window))
+
+        # Exponential averages (seeded with the first close, like adjust=False)
+        if math.isnan(self.ema):
+            self.ema = self.ema_fast = self.ema_slow = close
+        else:
+            self.ema += _ema_alpha(EMA_SPAN) * (close - self.ema)
+            self.ema_fast += _ema_alpha(MACD_FAST) * (close - self.ema_fast)
+            self.ema_slow += _ema_alpha(MACD_SLOW) * (close - self.ema_slow)
+        macd = self.ema_fast - self.ema_slow
+        if math.isnan(self.macd_signal):
+            self.macd_signal = macd
+        else:
+            self.macd_signal += _ema_alpha(MACD_SIGNAL) * (macd - self.macd_signal)
+
+        # Wilder smoothing for RSI and ATR
+        previous = self.last_close
+        if math.isnan(previous):
+            true_range = high - low
+        else:
+            change = close - previous
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if math.isnan(self.avg_gain):
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                self.avg_gain += (gain - self.avg_gain) / RSI_PERIOD
+                self.avg_loss += (loss - self.avg_loss) / RSI_PERIOD
+            true_range = max(high - low, abs(high - previous), abs(low - previous))
+        if math.isnan(self.atr):
+            self.atr = true_range
+        else:
+            self.atr += (true_range - self.atr) / ATR_PERIOD
+
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.prev_close = previous
+        self.prev_ts = self.last_ts
+        self.last_close = close
+        self.last_ts = ts
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Gets the latest indicator values (None until enough bars were seen)."""
+        full = self.count >= SMA_WINDOW
+        sma = self.sum / SMA_WINDOW if full else None
+        std = None
+        if full:
+            variance = (self.sum_sq - SMA_WINDOW * sma * sma) / (SMA_WINDOW - 1)
+            std = math.sqrt(max(variance, 0.0))
+
+        rsi = None
+        if self.count > RSI_PERIOD:
+            if self.avg_loss == 0:
+                rsi = 100.0
+            else:
+                rsi = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+        def finite(value: float) -> Optional[float]:
+            return None if math.isnan(value) else float(value)
+
+        macd = self.ema_fast - self.ema_slow
+        return {
+            "sma_20": sma,
+            "ema_12": finite(self.ema),
+            "rolling_std_20": std,
+            "rsi_14": rsi,
+            "macd": finite(macd) if self.count >= MACD_SLOW else None,
+            "macd_signal": finite(self.macd_signal) if self.count >= MACD_SLOW else None,
+            "macd_histogram": finite(macd - self.macd_signal) if self.count >= MACD_SLOW else None,
+            "bollinger_upper": sma + BOLLINGER_STD * std if full else None,
+            "bollinger_lower": sma - BOLLINGER_STD * std if full else None,
+            "atr_14": finite(self.atr) if self.count > ATR_PERIOD else None,
+        }
+
+
+def _timestamps(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").as_unit("ns").asi8
+
+
+class IndicatorEngine:
+    """Registry of per-(ticker, interval) indicator streams."""
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _lock_for(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _feed(self, state: IndicatorState, frame: pd.DataFrame) -> None:
+        if frame is None or frame.empty:
+            return
+        ts = _timestamps(frame.index)
+        start = 0
+        if state.last_ts is not None:
+            start = int(np.searchsorted(ts, state.last_ts, side="left"))
+        highs = frame["High"].to_numpy(dtype=np.float64)
+        lows = frame["Low"].to_numpy(dtype=np.float64)
+        closes = frame["Close"].to_numpy(dtype=np.float64)
+        for i in range(start, len(ts)):
+            state.update(int(ts[i]), highs[i], lows[i], closes[i])
+
+    @staticmethod
+    def _is_continuation(state: IndicatorState, frame: pd.DataFrame) -> bool:
+        """Checks that a frame starts where the stream did and extends it without revisions."""
+        if state.last_ts is None or frame.empty:
+            return False
+        ts = _timestamps(frame.index)
+        if ts[0] != state.first_ts:
+            # A different window (another period, or the period has moved on).
+            return False
+        position = int(np.searchsorted(ts, state.last_ts))
+        if position >= len(ts) or ts[position] != state.last_ts:
+            # The frame does not reach the last seen bar.
+            return False
+        if state.prev_ts is not None and position > 0 and ts[position - 1] == state.prev_ts:
+            previous_close = float(frame["Close"].iloc[position - 1])
+            if not math.isclose(previous_close, state.prev_close, rel_tol=1e-9):
+                # Settled history changed (e.g. split/dividend adjustment).
+                return False
+        return True
+
+    def sync(self, ticker: str, interval: str, frame: pd.DataFrame) -> Dict[str, Optional[float]]:
+        """Brings a stream up to date with the bars in a frame.
+
+        When the frame starts at the stream's first bar, only bars at or
+        after the last seen timestamp are applied. Otherwise (another
+        period, a gap or adjusted history) the stream is rebuilt from the
+        frame, so the result always equals a full computation over it.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Data interval
+            frame: Price history with High, Low and Close columns
+
+        Returns:
+            Latest indicator values
+        """
+        key = (ticker.strip().upper(), interval)
+        # Streams of different tickers update in parallel
+        with self._lock_for(key):
+            state = self._states.get(key)
+            if state is None or not self._is_continuation(state, frame):
+                state = IndicatorState()
+                with self._lock:
+                    self._states[key] = state
+            self._feed(state, frame)
+            return state.values()
+
+    def latest(self, ticker: str, interval: str = "1d") -> Optional[Dict[str, Optional[float]]]:
+        """Gets the latest values of a stream without touching any data."""
+        key = (ticker.strip().upper(), interval)
+        with self._lock_for(key):
+            state = self._states.get(key)
+            return state.values() if state is not None else None
+
+    def reset(self) -> None:
+        """Drops all streams."""
+        with self._lock:
+            self._states.clear()
+            self._locks.clear()
+
+
+# Global indicator engine instance
+indicator_engine = IndicatorEngine()
@@ -1,9 +1,15 @@
 """Market data tools for fetching stock prices, volatility, and returns."""
 
-from typing import Dict, Any, Optional
-import yfinance as yf
-import pandas as pd
-import numpy as np
+from __future__ import annotations
+
+from typing import Dict, Any, List, Optional
+from tools.price_cache import get_price_history, get_price_history_wide
+from tools.analytics import risk_return_metrics, metrics_for_row
+from tools.indicators import indicator_engine
+from utils.lazy import lazy_import
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 
 def fetch_price_history(
@@ -22,8 +28,7 @@ def fetch_price_history(
         Error: {"status": "error", "error_message": "..."}
     """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period, interval=interval)
+        hist = get_price_history(ticker, period=period, interval=interval)
 
         if hist.empty:
             return {
@@ -31,9 +36,8 @@ def fetch_price_history(
                 "error_message": f"No data found for ticker {ticker}",
             }
 
-        # Calculate moving averages
-        hist["SMA_20"] = hist["Close"].rolling(window=20).mean()
-        hist["EMA_12"] = hist["Close"].ewm(span=12, adjust=False).mean()
+        # Moving averages and other indicators over the requested bars, from the incremental engine
+        indicators = indicator_engine.sync(ticker, interval, hist)
 
         # Prepare response data
         latest = hist.iloc[-1]
@@ -43,8 +47,9 @@ def fetch_price_history(
             "interval": interval,
             "latest_price": float(latest["Close"]),
             "latest_volume": int(latest["Volume"]),
-            "sma_20": float(latest["SMA_20"]) if not pd.isna(latest["SMA_20"]) else None,
-            "ema_12": float(latest["EMA_12"]) if not pd.isna(latest["EMA_12"]) else None,
+            "sma_20": indicators["sma_20"],
+            "ema_12": indicators["ema_12"],
+            "indicators": indicators,
             "high": float(hist["High"].max()),
             "low": float(hist["Low"].min()),
             "data_points": len(hist),
@@ -60,6 +65,42 @@ def fetch_price_history(
         }
 
 
+def _date_labels(index: pd.Index) -> np.ndarray:
+    """Formats a bar index as ISO date strings for JSON responses."""
+    return np.asarray(index.strftime("%Y-%m-%d"))
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if pd.isna(value) else float(value)
+
+
+def _volatility_fields(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Selects the volatility fields from risk/return kernel output."""
+    return {
+        "daily_volatility": float(metrics["daily_volatility"]),
+        "annualized_volatility": float(metrics["annualized_volatility"]),
+        "max_drawdown": float(metrics["max_drawdown"]),
+        "max_drawdown_peak_date": metrics["max_drawdown_peak"],
+        "max_drawdown_trough_date": metrics["max_drawdown_trough"],
+        "downside_deviation": float(metrics["downside_deviation"]),
+        "volatility_percentage": float(metrics["annualized_volatility"] * 100),
+    }
+
+
+def _return_fields(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Selects the return and risk-adjusted return fields from kernel output."""
+    return {
+        "total_return": float(metrics["total_return"]),
+        "total_return_percentage": float(metrics["total_return"] * 100),
+        "average_daily_return": float(metrics["average_daily_return"]),
+        "annualized_return": float(metrics["annualized_return"]),
+        "annualized_return_percentage": float(metrics["annualized_return"] * 100),
+        "sharpe_ratio": _optional_float(metrics["sharpe_ratio"]),
+        "sortino_ratio": _optional_float(metrics["sortino_ratio"]),
+        "calmar_ratio": _optional_float(metrics["calmar_ratio"]),
+    }
+
+
 def compute_volatility(ticker: str, period: str = "1mo") -> Dict[str, Any]:
     """Computes volatility metrics for a given ticker.
 
@@ -71,8 +112,7 @@ def compute_volatility(ticker: str, period: str = "1mo") -> Dict[str, Any]:
         Dictionary with status and volatility metrics.
     """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
+        hist = get_price_history(ticker, period=period)
 
         if hist.empty:
             return {
@@ -80,27 +120,8 @@ def compute_volatility(ticker: str, period: str = "1mo") -> Dict[str, Any]:
                 "error_message": f"No data found for ticker {ticker}",
             }
 
-        # Calculate daily returns
-        hist["Returns"] = hist["Close"].pct_change()
-
-        # Volatility metrics
-        daily_volatility = hist["Returns"].std()
-        annualized_volatility = daily_volatility * np.sqrt(252)  # Trading days per year
-
-        # Max drawdown
-        cumulative = (1 + hist["Returns"]).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        max_drawdown = drawdown.min()
-
-        data = {
-            "ticker": ticker,
-            "period": period,
-            "daily_volatility": float(daily_volatility),
-            "annualized_volatility": float(annualized_volatility),
-            "max_drawdown": float(max_drawdown),
-            "volatility_percentage": float(annualized_volatility * 100),
-        }
+        metrics = risk_return_metrics(hist["Close"].to_numpy(), dates=_date_labels(hist.index))
+        data = {"ticker": ticker, "period": period, **_volatility_fields(metrics)}
 
         return {"status": "success", "data": data}
 
@@ -122,8 +143,7 @@ def compute_returns(ticker: str, period: str = "1mo") -> Dict[str, Any]:
         Dictionary with status and return metrics.
     """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
+        hist = get_price_history(ticker, period=period)
 
         if hist.empty:
             return {
@@ -131,30 +151,150 @@ def compute_returns(ticker: str, period: str = "1mo") -> Dict[str, Any]:
                 "error_message": f"No data found for ticker {ticker}",
             }
 
-        # Calculate returns
-        hist["Returns"] = hist["Close"].pct_change()
-        total_return = (hist["Close"].iloc[-1] / hist["Close"].iloc[0]) - 1
-        average_daily_return = hist["Returns"].mean()
+        metrics = risk_return_metrics(hist["Close"].to_numpy())
+        data = {"ticker": ticker, "period": period, **_return_fields(metrics)}
 
-        # Annualized return
-        days = len(hist)
-        annualized_return = ((1 + total_return) ** (252 / days)) - 1 if days > 0 else 0
+        return {"status": "success", "data": data}
 
-        data = {
-            "ticker": ticker,
-            "period": period,
-            "total_return": float(total_return),
-            "total_return_percentage": float(total_return * 100),
-            "average_daily_return": float(average_daily_return),
-            "annualized_return": float(annualized_return),
-            "annualized_return_percentage": float(annualized_return * 100),
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error computing returns for {ticker}: {str(e)}",
         }
 
-        return {"status": "success", "data": data}
+
+def _batch_response(
+    per_ticker: Dict[str, Dict[str, Any]], errors: Dict[str, str], **fields: Any
+) -> Dict[str, Any]:
+    """Builds the standard response for a batch tool."""
+    if not per_ticker:
+        return {
+            "status": "error",
+            "error_message": "; ".join(errors.values()) or "No tickers provided",
+        }
+    return {
+        "status": "success",
+        "data": {**fields, "tickers": per_ticker, "errors": errors},
+    }
+
+
+def fetch_price_history_batch(
+    tickers: List[str], period: str = "1mo", interval: str = "1d"
+) -> Dict[str, Any]:
+    """Fetches historical price data for several tickers in one bulk download.
+
+    Args:
+        tickers: Stock ticker symbols (e.g., ["TSLA", "F", "GM"])
+        period: Valid periods: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
+        interval: Valid intervals: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
+
+    Returns:
+        Dictionary with status and per-ticker price history data.
+        Success: {"status": "success", "data": {"tickers": {...}, "errors": {...}}}
+        Error: {"status": "error", "error_message": "..."}
+    """
+    try:
+        wide, errors = get_price_history_wide(tickers, period, interval)
+        if not wide:
+            return _batch_response({}, errors)
+
+        close = wide["Close"]
+        high = wide["High"].max()
+        low = wide["Low"].min()
+        counts = close.count()
+
+        per_ticker = {}
+        for ticker in close.columns:
+            column = close[ticker]
+            last = column.last_valid_index()
+            # The wide index is the union of all calendars; each ticker's
+            # indicators run over its own bars, like fetch_price_history
+            bars = pd.DataFrame({field: wide[field][ticker] for field in wide}).dropna(
+                subset=["Close"]
+            )
+            indicators = indicator_engine.sync(ticker, interval, bars)
+            per_ticker[ticker] = {
+                "ticker": ticker,
+                "latest_price": float(column[last]),
+                "latest_volume": int(wide["Volume"][ticker][last]),
+                "sma_20": indicators["sma_20"],
+                "ema_12": indicators["ema_12"],
+                "high": float(high[ticker]),
+                "low": float(low[ticker]),
+                "data_points": int(counts[ticker]),
+                "price_history": bars[["Close", "Volume", "High", "Low", "Open"]]
+                .tail(10)
+                .to_dict("records"),
+            }
+
+        return _batch_response(per_ticker, errors, period=period, interval=interval)
 
     except Exception as e:
         return {
             "status": "error",
-            "error_message": f"Error computing returns for {ticker}: {str(e)}",
+            "error_message": f"Error fetching price history for {tickers}: {str(e)}",
+        }
+
+
+def compute_volatility_batch(tickers: List[str], period: str = "1mo") -> Dict[str, Any]:
+    """Computes volatility metrics for several tickers in one bulk download.
+
+    Args:
+        tickers: Stock ticker symbols
+        period: Time period for volatility calculation
+
+    Returns:
+        Dictionary with status and per-ticker volatility metrics.
+    """
+    try:
+        wide, errors = get_price_history_wide(tickers, period)
+        if not wide:
+            return _batch_response({}, errors)
+
+        close = wide["Close"]
+        metrics = risk_return_metrics(
+            np.ascontiguousarray(close.to_numpy().T), dates=_date_labels(close.index)
+        )
+        per_ticker = {
+            ticker: {"ticker": ticker, **_volatility_fields(metrics_for_row(metrics, row))}
+            for row, ticker in enumerate(close.columns)
+        }
+
+        return _batch_response(per_ticker, errors, period=period)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error computing volatility for {tickers}: {str(e)}",
         }
 
+
+def compute_returns_batch(tickers: List[str], period: str = "1mo") -> Dict[str, Any]:
+    """Computes return metrics for several tickers in one bulk download.
+
+    Args:
+        tickers: Stock ticker symbols
+        period: Time period for return calculation
+
+    Returns:
+        Dictionary with status and per-ticker return metrics.
+    """
+    try:
+        wide, errors = get_price_history_wide(tickers, period)
+        if not wide:
+            return _batch_response({}, errors)
+
+        close = wide["Close"]
+        metrics = risk_return_metrics(np.ascontiguousarray(close.to_numpy().T))
+        per_ticker = {
+            ticker: {"ticker": ticker, **_return_fields(metrics_for_row(metrics, row))}
+            for row, ticker in enumerate(close.columns)
+        }
+
+        return _batch_response(per_ticker, errors, period=period)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error computing returns for {tickers}: {str(e)}",
+        }
@@ -0,0 +1,350 @@
+"""Process-wide cache for OHLCV price history shared by the market and chart tools."""
+
+from __future__ import annotations
+
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+from tools.data_provider import get_provider
+from tools.price_store import price_store
+from config.settings import (
+    PRICE_CACHE_TTL_INTRADAY,
+    PRICE_CACHE_TTL_DAILY,
+    PRICE_CACHE_MAX_BYTES,
+    PRICE_STORE_ENABLED,
+)
+from utils.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
+CacheKey = Tuple[str, str, str]
+
+
+def ttl_for_interval(interval: str) -> float:
+    """Get the time-to-live for cached history of a given bar interval.
+
+    Args:
+        interval: Data interval (e.g., "1m", "1d")
+
+    Returns:
+        TTL in seconds
+    """
+    if interval in INTRADAY_INTERVALS:
+        return PRICE_CACHE_TTL_INTRADAY
+    return PRICE_CACHE_TTL_DAILY
+
+
+def _download_history(ticker: str, period: str, interval: str) -> pd.DataFrame:
+    """Load price history from the on-disk store, or the provider if disabled."""
+    if PRICE_STORE_ENABLED:
+        return price_store.get_history(ticker, period=period, interval=interval)
+    return get_provider().history(ticker, period=period, interval=interval)
+
+
+def _download_history_bulk(
+    tickers: List[str], period: str, interval: str
+) -> Dict[str, pd.DataFrame]:
+    """Download price history for several tickers in one bulk request."""
+    frames = get_provider().bulk_history(tickers, period=period, interval=interval)
+    if PRICE_STORE_ENABLED:
+        for ticker, frame in frames.items():
+            price_store.ingest(ticker, period, interval, frame)
+    return frames
+
+
+class _CacheEntry:
+    """A cached price history frame with its expiry and memory footprint."""
+
+    __slots__ = ("frame", "expires_at", "size_bytes")
+
+    def __init__(self, frame: pd.DataFrame, expires_at: float, size_bytes: int):
+        self.frame = frame
+        self.expires_at = expires_at
+        self.size_bytes = size_bytes
+
+
+class PriceHistoryCache:
+    """LRU cache of price history keyed by (ticker, period, interval).
+
+    Entries expire after an interval-dependent TTL and the least recently
+    used entries are evicted once the total memory footprint exceeds
+    ``max_bytes``. Concurrent misses for the same key share one download.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = PRICE_CACHE_MAX_BYTES,
+        loader: Optional[Callable[[str, str, str], pd.DataFrame]] = None,
+        bulk_loader: Optional[
+            Callable[[List[str], str, str], Dict[str, pd.DataFrame]]
+        ] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.loader = loader or _download_history
+        self.bulk_loader = bulk_loader or _download_history_bulk
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._key_locks: Dict[CacheKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(ticker: str, period: str, interval: str) -> CacheKey:
+        """Build the normalized cache key for a request."""
+        return (ticker.strip().upper(), period, interval)
+
+    def get(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        """Get price history, downloading it only on a miss.
+
+        Args:
+            ticker: Stock ticker symbol
+            period: Time period of the history
+            interval: Data interval
+
+        Returns:
+            A copy of the cached DataFrame (callers may add columns freely).
+            An empty DataFrame is returned, but not cached, when the source
+            has no data.
+        """
+        key = self.make_key(ticker, period, interval)
+
+        frame = self._lookup(key)
+        if frame is not None:
+            return frame.copy()
+
+        with self._lock_for(key):
+            # Another thread may have loaded the key while we waited.
+            frame = self._lookup(key, count=False)
+            if frame is not None:
+                with self._lock:
+                    self.hits += 1
+                return frame.copy()
+
+            with self._lock:
+                self.misses += 1
+            frame = self.loader(key[0], period, interval)
+            if frame is not None and not frame.empty:
+                self._store(key, frame, ttl_for_interval(interval))
+                frame = frame.copy()
+
+        with self._lock:
+            if key not in self._entries:
+                # Nothing was cached (no data, or too large to keep)
+                self._prune_lock(key)
+        return frame if frame is not None else pd.DataFrame()
+
+    def get_many(
+        self, tickers: List[str], period: str = "1mo", interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """Get price history for several tickers with one bulk download.
+
+        Tickers already cached are served from memory; all remaining tickers
+        are fetched together in a single bulk request and cached individually.
+
+        Args:
+            tickers: Stock ticker symbols
+            period: Time period of the history
+            interval: Data interval
+
+        Returns:
+            Dictionary mapping each normalized ticker to a copy of its
+            DataFrame (empty if no data was found)
+        """
+        symbols = list(dict.fromkeys(t.strip().upper() for t in tickers))
+        result = {}
+        missing = []
+        for symbol in symbols:
+            frame = self._lookup(self.make_key(symbol, period, interval))
+            if frame is not None:
+                result[symbol] = frame.copy()
+            else:
+                missing.append(symbol)
+
+        if missing:
+            with self._lock:
+                self.misses += len(missing)
+            downloaded = self.bulk_loader(missing, period, interval)
+            for symbol in missing:
+                frame = downloaded.get(symbol)
+                if frame is None or frame.empty:
+                    result[symbol] = pd.DataFrame()
+                    continue
+                self._store(
+                    self.make_key(symbol, period, interval), frame, ttl_for_interval(interval)
+                )
+                result[symbol] = frame.copy()
+
+        return {symbol: result[symbol] for symbol in symbols}
+
+    def put(
+        self, ticker: str, period: str, interval: str, frame: pd.DataFrame
+    ) -> None:
+        """Insert an already downloaded history frame into the cache."""
+        if frame is None or frame.empty:
+            return
+        self._store(
+            self.make_key(ticker, period, interval), frame, ttl_for_interval(interval)
+        )
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """Drop cached entries for one ticker, or all entries if none is given."""
+        with self._lock:
+            symbol = ticker.strip().upper() if ticker else None
+            for key in list(self._entries):
+                if symbol is None or key[0] == symbol:
+                    self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            # Keep only the locks of loads still in progress
+            self._key_locks = {key: lock for key, lock in self._key_locks.items() if lock.locked()}
+            self._current_bytes = 0
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and memory usage
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _lock_for(self, key: CacheKey) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _lookup(self, key: CacheKey, count: bool = True) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry.frame
+
+    def _store(self, key: CacheKey, frame: pd.DataFrame, ttl: float) -> None:
+        frame = frame.copy()
+        size_bytes = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size_bytes > self.max_bytes:
+                return
+            self._entries[key] = _CacheEntry(frame, time.monotonic() + ttl, size_bytes)
+            self._current_bytes += size_bytes
+            while self._current_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._current_bytes -= entry.size_bytes
+        self._prune_lock(key)
+
+    def _prune_lock(self, key: CacheKey) -> None:
+        """Drops a key's lock unless a load holds it (caller holds self._lock)."""
+        lock = self._key_locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._key_locks[key]
+
+
+# Global price history cache instance
+price_cache = PriceHistoryCache()
+
+
+def get_price_history(
+    ticker: str, period: str = "1mo", interval: str = "1d"
+) -> pd.DataFrame:
+    """Get price history through the process-wide cache.
+
+    Args:
+        ticker: Stock ticker symbol
+        period: Time period of the history
+        interval: Data interval
+
+    Returns:
+        DataFrame with Open, High, Low, Close and Volume columns
+    """
+    return price_cache.get(ticker, period=period, interval=interval)
+
+
+def get_price_history_batch(
+    tickers: List[str], period: str = "1mo", interval: str = "1d"
+) -> Dict[str, pd.DataFrame]:
+    """Get price history for several tickers through the process-wide cache.
+
+    Args:
+        tickers: Stock ticker symbols
+        period: Time period of the history
+        interval: Data interval
+
+    Returns:
+        Dictionary mapping each normalized ticker to its DataFrame
+    """
+    return price_cache.get_many(tickers, period=period, interval=interval)
+
+
+def get_price_history_wide(
+    tickers: List[str], period: str, interval: str = "1d"
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """Get history for several tickers with one bulk download, pivoted wide.
+
+    Args:
+        tickers: Stock ticker symbols
+        period: Time period of the history
+        interval: Data interval
+
+    Returns:
+        Tuple of (dictionary of time x ticker frames keyed by price field,
+        dictionary of per-ticker error messages)
+    """
+    frames = get_price_history_batch(tickers, period=period, interval=interval)
+    errors = {
+        ticker: f"No data found for ticker {ticker}"
+        for ticker, frame in frames.items()
+        if frame.empty
+    }
+    valid = {ticker: frame for ticker, frame in frames.items() if not frame.empty}
+    if not valid:
+        return {}, errors
+
+    if interval not in INTRADAY_INTERVALS:
+        # Align daily bars by calendar date so symbols from exchanges in
+        # different timezones share rows.
+        for ticker, frame in valid.items():
+            index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+            valid[ticker] = frame.set_axis(index.normalize())
+
+    wide = {
+        field: pd.concat({ticker: frame[field] for ticker, frame in valid.items()}, axis=1)
+        for field in ["Open", "High", "Low", "Close", "Volume"]
+    }
+    return wide, errors
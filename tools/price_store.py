@@ -0,0 +1,272 @@
+"""Persistent on-disk OHLCV store with incremental refresh.
+
+Bars are kept per provider, ticker and interval as a NumPy structured
+array (``<dir>/<provider>/<interval>/<TICKER>.npy``) that is memory-mapped
+on read, with a small JSON sidecar describing the timezone and how far back
+the stored history is known to be complete. Keeping each provider's bars
+apart stops e.g. synthetic test data from being served as settled history
+by a later yfinance run. Requests are served from disk and only the
+bars after the last stored timestamp are downloaded.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Any, Callable, Optional, Tuple
+import json
+import os
+import re
+import threading
+import time
+from tools.data_provider import get_provider, period_start, session_count
+from config.settings import PRICE_STORE_DIR
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Structured dtype of the stored bars, as a spec numpy accepts wherever a dtype is expected
+BAR_DTYPE = [
+    ("ts", "<i8"),
+    ("Open", "<f8"),
+    ("High", "<f8"),
+    ("Low", "<f8"),
+    ("Close", "<f8"),
+    ("Volume", "<i8"),
+]
+
+
+def _fetch_from_source(
+    ticker: str,
+    interval: str,
+    period: Optional[str] = None,
+    start: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Download bars from the configured provider for a period or from a start time."""
+    return get_provider().history(ticker, period=period, interval=interval, start=start)
+
+
+def _source_name() -> str:
+    """Name of the configured provider, which namespaces the stored bars."""
+    return get_provider().name
+
+
+class PriceStore:
+    """Memory-mapped per-ticker OHLCV store with gap-only refresh."""
+
+    def __init__(
+        self,
+        root_dir: str = PRICE_STORE_DIR,
+        fetcher: Optional[Callable[..., pd.DataFrame]] = None,
+        source: Optional[Callable[[], str]] = None,
+    ):
+        """Create a store.
+
+        Args:
+            root_dir: Directory holding the stored bars
+            fetcher: Download function (defaults to the configured provider)
+            source: Returns the name of the data source the fetcher reads
+                from; bars of different sources are stored apart
+        """
+        self.root_dir = root_dir
+        self.fetcher = fetcher or _fetch_from_source
+        self.source = source or _source_name
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _paths(self, ticker: str, interval: str) -> Tuple[str, str]:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.strip().upper())
+        source = re.sub(r"[^A-Za-z0-9._-]", "_", self.source())
+        base = os.path.join(self.root_dir, source, interval, safe)
+        return base + ".npy", base + ".json"
+
+    def _lock_for(self, ticker: str, interval: str) -> threading.Lock:
+        key = (self.source(), ticker.strip().upper(), interval)
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def load(self, ticker: str, interval: str) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+        """Load stored bars for a ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Data interval
+
+        Returns:
+            Tuple of (DataFrame or None if nothing is stored, metadata dict)
+        """
+        data_path, meta_path = self._paths(ticker, interval)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, {}
+        with open(meta_path) as f:
+            meta = json.load(f)
+        bars = np.load(data_path, mmap_mode="r")
+        if len(bars) == 0:
+            return None, meta
+        index = pd.to_datetime(np.asarray(bars["ts"]), utc=True).tz_convert(meta.get("tz") or "UTC")
+        frame = pd.DataFrame(
+            {column: np.asarray(bars[column]) for column in OHLCV_COLUMNS},
+            index=pd.DatetimeIndex(index, name=meta.get("index_name") or "Date"),
+        )
+        return frame, meta
+
+    def save(self, ticker: str, interval: str, frame: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        """Atomically write bars and metadata for a ticker."""
+        data_path, meta_path = self._paths(ticker, interval)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+        index = pd.DatetimeIndex(frame.index)
+        bars = np.empty(len(frame), dtype=BAR_DTYPE)
+        utc_index = index.tz_convert("UTC") if index.tz is not None else index.tz_localize("UTC")
+        bars["ts"] = utc_index.as_unit("ns").asi8
+        for column in OHLCV_COLUMNS:
+            values = frame[column].to_numpy()
+            if column == "Volume":
+                values = np.nan_to_num(values.astype("f8")).astype("i8")
+            bars[column] = values
+
+        meta = dict(meta)
+        meta["tz"] = str(index.tz) if index.tz is not None else None
+        meta["index_name"] = index.name
+        meta["updated_at"] = time.time()
+
+        tmp_data = f"{data_path}.{os.getpid()}.tmp"
+        tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_data, "wb") as f:
+            np.save(f, bars)
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+
+    def get_history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        """Get price history from disk, downloading only the missing bars.
+
+        When the stored history already reaches back to the start of the
+        requested period, only bars from the last stored timestamp onwards
+        are fetched (the last bar is re-fetched because it may have been
+        incomplete). Otherwise the full period is downloaded once and merged.
+
+        Args:
+            ticker: Stock ticker symbol
+            period: Time period of the history
+            interval: Data interval
+
+        Returns:
+            DataFrame with Open, High, Low, Close and Volume columns, empty if
+            neither the store nor the source has data.
+        """
+        with self._lock_for(ticker, interval):
+            stored, meta = self.load(ticker, interval)
+            start = period_start(period)
+
+            if stored is not None and self._covers(stored, meta, period, start):
+                try:
+                    delta = self.fetcher(ticker, interval, start=stored.index[-1])
+                except Exception:
+                    # Stored bars are still usable while the source is unreachable.
+                    delta = None
+                merged = self._merge(stored, delta)
+                if merged is not stored:
+                    self.save(ticker, interval, merged, meta)
+            else:
+                fetched = self.fetcher(ticker, interval, period=period)
+                if fetched is None or fetched.empty:
+                    if stored is None:
+                        return pd.DataFrame()
+                    return self._slice(stored, period, start)
+                merged = self._ingest_locked(ticker, interval, period, fetched, stored, meta)
+
+        return self._slice(merged, period, start)
+
+    def ingest(self, ticker: str, period: str, interval: str, frame: pd.DataFrame) -> None:
+        """Merge a full-period download obtained elsewhere (e.g. a bulk call).
+
+        Args:
+            ticker: Stock ticker symbol
+            period: Period the frame was downloaded for
+            interval: Data interval
+            frame: Downloaded bars
+        """
+        if frame is None or frame.empty:
+            return
+        with self._lock_for(ticker, interval):
+            stored, meta = self.load(ticker, interval)
+            self._ingest_locked(ticker, interval, period, frame, stored, meta)
+
+    def _ingest_locked(
+        self,
+        ticker: str,
+        interval: str,
+        period: str,
+        fetched: pd.DataFrame,
+        stored: Optional[pd.DataFrame],
+        meta: Dict[str, Any],
+    ) -> pd.DataFrame:
+        merged = self._merge(stored, fetched)
+        meta = self._extend_coverage(meta, period, period_start(period), fetched)
+        self.save(ticker, interval, merged, meta)
+        return merged
+
+    @staticmethod
+    def _covers(
+        stored: pd.DataFrame, meta: Dict[str, Any], period: str, start: Optional[pd.Timestamp]
+    ) -> bool:
+        if meta.get("full"):
+            return True
+        sessions = session_count(period)
+        if sessions is not None:
+            return stored.index.normalize().nunique() >= sessions
+        if start is None or meta.get("covered_from") is None:
+            return False
+        return meta["covered_from"] <= start.value
+
+    @staticmethod
+    def _extend_coverage(
+        meta: Dict[str, Any], period: str, start: Optional[pd.Timestamp], fetched: pd.DataFrame
+    ) -> Dict[str, Any]:
+        meta = dict(meta)
+        if period == "max":
+            meta["full"] = True
+            return meta
+        if start is None:
+            # Trading-day periods only guarantee coverage from the first bar.
+            first = pd.Timestamp(fetched.index[0])
+            first = first.tz_convert("UTC") if first.tz is not None else first.tz_localize("UTC")
+            start = first
+        covered = meta.get("covered_from")
+        meta["covered_from"] = start.value if covered is None else min(covered, start.value)
+        return meta
+
+    @staticmethod
+    def _merge(stored: Optional[pd.DataFrame], new: Optional[pd.DataFrame]) -> pd.DataFrame:
+        if new is None or new.empty:
+            return stored
+        new = new[OHLCV_COLUMNS]
+        if stored is None:
+            return new.sort_index()
+        if new.index.tz is not None and stored.index.tz is not None:
+            new = new.tz_convert(stored.index.tz)
+        merged = pd.concat([stored[~stored.index.isin(new.index)], new])
+        return merged[~merged.index.duplicated(keep="last")].sort_index()
+
+    @staticmethod
+    def _slice(frame: pd.DataFrame, period: str, start: Optional[pd.Timestamp]) -> pd.DataFrame:
+        sessions = session_count(period)
+        if sessions is not None:
+            days = frame.index.normalize()
+            keep = days.unique()[-sessions:]
+            return frame[days.isin(keep)]
+        if start is None:
+            return frame
+        index = frame.index
+        utc_index = index.tz_convert("UTC") if index.tz is not None else index.tz_localize("UTC")
+        return frame[utc_index >= start]
+
+
+# Global price store instance
+price_store = PriceStore()
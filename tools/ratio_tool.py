@@ -1,13 +1,116 @@
 """Financial ratio calculation tools."""
 
-from typing import Dict, Any
-import yfinance as yf
+from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
+import time
+from tools.data_provider import get_provider
+from tools.fundamentals_cache import FundamentalsCache
+from config.settings import (
+    FUNDAMENTALS_MAX_WORKERS,
+    FUNDAMENTALS_MAX_PER_HOST,
+    FUNDAMENTALS_TIMEOUT_SECONDS,
+)
+
+# Shared pool for fundamentals requests, bounded across all batches
+_executor = ThreadPoolExecutor(
+    max_workers=FUNDAMENTALS_MAX_WORKERS, thread_name_prefix="fundamentals"
+)
+_host_limits: Dict[str, threading.BoundedSemaphore] = {}
+_host_limits_lock = threading.Lock()
+
+
+def _valuation_data_from_info(ticker: str, info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Builds the valuation metrics response data from a provider info dict.
+
+    Args:
+        ticker: Stock ticker symbol
+        info: Info dictionary returned by the market data provider
+
+    Returns:
+        Valuation data dictionary, or None if the info does not describe a
+        valid ticker.
+    """
+    # yfinance may still return a non-empty info dict even when the
+    # symbol is invalid. In practice, valid tickers have core fields
+    # like regularMarketPrice populated. Treat missing core price
+    # information as an invalid/unknown ticker.
+    if not info or info.get("regularMarketPrice") is None:
+        return None
+
+    # Extract key metrics
+    metrics = {}
+
+    # Valuation ratios
+    metrics["pe_ratio"] = info.get("trailingPE")
+    metrics["forward_pe"] = info.get("forwardPE")
+    metrics["peg_ratio"] = info.get("pegRatio")
+    metrics["ev_to_ebitda"] = info.get("enterpriseToEbitda")
+    metrics["price_to_book"] = info.get("priceToBook")
+    metrics["price_to_sales"] = info.get("priceToSalesTrailing12Months")
+
+    # Profitability ratios
+    metrics["roe"] = info.get("returnOnEquity")
+    metrics["roa"] = info.get("returnOnAssets")
+    metrics["profit_margin"] = info.get("profitMargins")
+    metrics["operating_margin"] = info.get("operatingMargins")
+
+    # Growth metrics
+    metrics["revenue_growth"] = info.get("revenueGrowth")
+    metrics["earnings_growth"] = info.get("earningsGrowth")
+    metrics["earnings_quarterly_growth"] = info.get("earningsQuarterlyGrowth")
+
+    # Cash flow
+    metrics["free_cash_flow"] = info.get("freeCashflow")
+    metrics["operating_cash_flow"] = info.get("operatingCashflow")
+
+    # Debt metrics
+    metrics["debt_to_equity"] = info.get("debtToEquity")
+    metrics["current_ratio"] = info.get("currentRatio")
+    metrics["quick_ratio"] = info.get("quickRatio")
+
+    # Market cap and enterprise value
+    metrics["market_cap"] = info.get("marketCap")
+    metrics["enterprise_value"] = info.get("enterpriseValue")
+
+    # Clean up None values and convert to float where possible
+    cleaned_metrics = {}
+    for key, value in metrics.items():
+        if value is not None:
+            try:
+                cleaned_metrics[key] = float(value)
+            except (ValueError, TypeError):
+                cleaned_metrics[key] = value
+        else:
+            cleaned_metrics[key] = None
+
+    data = {
+        "ticker": ticker,
+        "company_name": info.get("longName", ticker),
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "current_price": float(info["regularMarketPrice"]),
+        "metrics": cleaned_metrics,
+    }
+
+    return data
+
+
+def _fetch_valuation_data(ticker: str) -> Optional[Dict[str, Any]]:
+    """Downloads and cleans the valuation data for one ticker."""
+    return _valuation_data_from_info(ticker, get_provider().info(ticker))
+
+
+# Persistent snapshot cache shared by the valuation tools
+fundamentals_cache = FundamentalsCache(loader=_fetch_valuation_data)
 
 
 def calculate_valuation_metrics(ticker: str) -> Dict[str, Any]:
     """Calculates key financial valuation metrics for a ticker.
 
     Computes P/E, Forward P/E, EV/EBITDA, ROE, ROA, Revenue Growth, and Free Cash Flow.
+    Snapshots are served from the fundamentals cache; stale ones are refreshed
+    in the background.
 
     Args:
         ticker: Stock ticker symbol
@@ -18,73 +121,14 @@ def calculate_valuation_metrics(ticker: str) -> Dict[str, Any]:
         Error: {"status": "error", "error_message": "..."}
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-
-        # yfinance may still return a non-empty info dict even when the
-        # symbol is invalid. In practice, valid tickers have core fields
-        # like regularMarketPrice populated. Treat missing core price
-        # information as an invalid/unknown ticker.
-        if not info or info.get("regularMarketPrice") is None:
+        data = fundamentals_cache.get(ticker)
+
+        if data is None:
             return {
                 "status": "error",
                 "error_message": f"No data found for ticker {ticker}",
             }
 
-        # Extract key metrics
-        metrics = {}
-
-        # Valuation ratios
-        metrics["pe_ratio"] = info.get("trailingPE")
-        metrics["forward_pe"] = info.get("forwardPE")
-        metrics["peg_ratio"] = info.get("pegRatio")
-        metrics["ev_to_ebitda"] = info.get("enterpriseToEbitda")
-        metrics["price_to_book"] = info.get("priceToBook")
-        metrics["price_to_sales"] = info.get("priceToSalesTrailing12Months")
-
-        # Profitability ratios
-        metrics["roe"] = info.get("returnOnEquity")
-        metrics["roa"] = info.get("returnOnAssets")
-        metrics["profit_margin"] = info.get("profitMargins")
-        metrics["operating_margin"] = info.get("operatingMargins")
-
-        # Growth metrics
-        metrics["revenue_growth"] = info.get("revenueGrowth")
-        metrics["earnings_growth"] = info.get("earningsGrowth")
-        metrics["earnings_quarterly_growth"] = info.get("earningsQuarterlyGrowth")
-
-        # Cash flow
-        metrics["free_cash_flow"] = info.get("freeCashflow")
-        metrics["operating_cash_flow"] = info.get("operatingCashflow")
-
-        # Debt metrics
-        metrics["debt_to_equity"] = info.get("debtToEquity")
-        metrics["current_ratio"] = info.get("currentRatio")
-        metrics["quick_ratio"] = info.get("quickRatio")
-
-        # Market cap and enterprise value
-        metrics["market_cap"] = info.get("marketCap")
-        metrics["enterprise_value"] = info.get("enterpriseValue")
-
-        # Clean up None values and convert to float where possible
-        cleaned_metrics = {}
-        for key, value in metrics.items():
-            if value is not None:
-                try:
-                    cleaned_metrics[key] = float(value)
-                except (ValueError, TypeError):
-                    cleaned_metrics[key] = value
-            else:
-                cleaned_metrics[key] = None
-
-        data = {
-            "ticker": ticker,
-            "company_name": info.get("longName", ticker),
-            "sector": info.get("sector"),
-            "industry": info.get("industry"),
-            "metrics": cleaned_metrics,
-        }
-
         return {"status": "success", "data": data}
 
     except Exception as e:
@@ -93,3 +137,97 @@ def calculate_valuation_metrics(ticker: str) -> Dict[str, Any]:
             "error_message": f"Error calculating valuation metrics for {ticker}: {str(e)}",
         }
 
+
+def _host_limit(host: str) -> threading.BoundedSemaphore:
+    """Gets the semaphore limiting concurrent requests to one host."""
+    with _host_limits_lock:
+        limit = _host_limits.get(host)
+        if limit is None:
+            limit = _host_limits[host] = threading.BoundedSemaphore(FUNDAMENTALS_MAX_PER_HOST)
+        return limit
+
+
+def _fetch_info(provider: Any, ticker: str, deadline: float) -> Dict[str, Any]:
+    """Fetches one info dict while holding the provider host's slot.
+
+    Gives up without calling the provider if no slot frees up before the
+    ticker's deadline, so abandoned requests do not keep queueing.
+    """
+    limit = _host_limit(getattr(provider, "host", provider.name))
+    if not limit.acquire(timeout=max(0.0, deadline - time.monotonic())):
+        raise TimeoutError(f"no request slot for {ticker} before the deadline")
+    try:
+        return provider.info(ticker)
+    finally:
+        limit.release()
+
+
+def calculate_valuation_metrics_batch(tickers: List[str]) -> Dict[str, Any]:
+    """Calculates valuation metrics for several tickers concurrently.
+
+    Cached snapshots are used where available. The remaining info requests
+    run on a bounded thread pool with a per-host concurrency limit. A ticker
+    whose request fails or is not answered within the timeout of its
+    submission is reported in "errors" without failing the rest of the batch.
+
+    Args:
+        tickers: Stock ticker symbols (e.g., ["NVDA", "AMD", "INTC"])
+
+    Returns:
+        Dictionary with status and per-ticker valuation metrics.
+        Success: {"status": "success", "data": {"tickers": {...}, "errors": {...}}}
+        Error: {"status": "error", "error_message": "..."}
+    """
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    if not symbols:
+        return {"status": "error", "error_message": "No tickers provided"}
+
+    batch_start = time.monotonic()
+    results: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for ticker in symbols:
+        cached = fundamentals_cache.lookup(ticker)
+        if cached is not None:
+            results[ticker] = cached
+
+    provider = get_provider()
+    # Each ticker's timeout runs from submission, including time spent waiting
+    # for a worker or a host slot
+    deadline = time.monotonic() + FUNDAMENTALS_TIMEOUT_SECONDS
+    futures = {
+        _executor.submit(_fetch_info, provider, ticker, deadline): ticker
+        for ticker in symbols
+        if ticker not in results
+    }
+
+    done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+    for future, ticker in futures.items():
+        try:
+            if future not in done:
+                # A request already running cannot be stopped; it finishes in
+                # the background and its result is dropped
+                future.cancel()
+                raise TimeoutError
+            data = _valuation_data_from_info(ticker, future.result())
+        except TimeoutError:
+            errors[ticker] = f"Timed out after {FUNDAMENTALS_TIMEOUT_SECONDS}s fetching data for {ticker}"
+            continue
+        except Exception as e:
+            errors[ticker] = f"Error calculating valuation metrics for {ticker}: {str(e)}"
+            continue
+        if data is None:
+            errors[ticker] = f"No data found for ticker {ticker}"
+        else:
+            results[ticker] = fundamentals_cache.store(ticker, data)
+
+    if not results:
+        return {"status": "error", "error_message": "; ".join(errors[t] for t in symbols)}
+
+    return {
+        "status": "success",
+        "data": {
+            "tickers": {t: results[t] for t in symbols if t in results},
+            "errors": {t: errors[t] for t in symbols if t in errors},
+            "elapsed_seconds": round(time.monotonic() - batch_start, 3),
+        },
+    }
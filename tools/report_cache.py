@@ -0,0 +1,184 @@
+"""Persistent cache of full research reports.
+
+The same questions ("Research AAPL") are asked many times a day, and each
+one re-runs every agent and tool. Reports of queries the local resolver
+understands are stored in the application SQLite database under their
+normalized intent (tickers, request type, requested sections and period),
+so "Research AAPL" and "Tell me about $AAPL" share an entry. Only the
+ReportAgent's final report is stored. With the resolver turned off
+(``QUERY_RESOLVER_ENABLED``), nothing is cached.
+
+Every entry records a fingerprint of the data the report was built from:
+per ticker, the date and close of the latest daily price bar and the time
+the fundamentals snapshot was downloaded. A lookup recomputes the
+fingerprint from the price and fundamentals caches and serves the entry
+only while it matches. News is only seen through the model's search, so
+the news set cannot be checked without re-running the news agent; entries
+older than ``REPORT_CACHE_NEWS_TTL`` are rebuilt instead.
+"""
+
+from typing import Dict, Any, Callable, List, Optional
+import hashlib
+import json
+import logging
+import time
+from tools.price_cache import get_price_history
+from tools.ratio_tool import fundamentals_cache
+from utils.db import connect, sqlite_path_from_url
+from utils.query_resolver import get_resolver
+from config.settings import QUERY_RESOLVER_ENABLED, REPORT_CACHE_NEWS_TTL
+
+logger = logging.getLogger(__name__)
+
+
+def query_intent(query: str) -> Optional[Dict[str, Any]]:
+    """Get the normalized intent of a query.
+
+    Args:
+        query: User query
+
+    Returns:
+        Dictionary with tickers, request_type, sections and period, or None
+        when the local resolver is disabled or does not understand the query
+        (such queries are not cached)
+    """
+    if not QUERY_RESOLVER_ENABLED:
+        return None
+    resolution = get_resolver().resolve(query)
+    if resolution is None:
+        return None
+    return {
+        "tickers": sorted(resolution["tickers"]),
+        "request_type": resolution["request_type"],
+        "sections": sorted(resolution["requirements"]),
+        "period": resolution["period"],
+    }
+
+
+def intent_key(intent: Dict[str, Any]) -> str:
+    """Get the cache key of a normalized intent.
+
+    Args:
+        intent: Intent from query_intent
+
+    Returns:
+        Hex SHA-256 digest of the intent
+    """
+    return hashlib.sha256(json.dumps(intent, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _latest_bar(ticker: str) -> Optional[List[Any]]:
+    """Date and close of the latest daily bar, through the shared price cache."""
+    hist = get_price_history(ticker, period="5d")
+    if hist.empty:
+        return None
+    return [str(hist.index[-1]), round(float(hist["Close"].iloc[-1]), 6)]
+
+
+def data_fingerprint(tickers: List[str]) -> Optional[str]:
+    """Fingerprint the market data a report on the tickers is built from.
+
+    Args:
+        tickers: Ticker symbols of the report
+
+    Returns:
+        Hex SHA-256 digest of each ticker's latest price bar and fundamentals
+        snapshot time, or None when either is unavailable for a ticker
+    """
+    parts = {}
+    for ticker in tickers:
+        bar = _latest_bar(ticker)
+        snapshot = fundamentals_cache.snapshot_time(ticker)
+        if bar is None or snapshot is None:
+            return None
+        parts[ticker] = {"bar": bar, "fundamentals": snapshot}
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """SQLite-backed store of reports invalidated by data fingerprints."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        news_ttl: float = REPORT_CACHE_NEWS_TTL,
+        fingerprint: Callable[[List[str]], Optional[str]] = data_fingerprint,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.db_path = db_path or sqlite_path_from_url()
+        self.news_ttl = news_ttl
+        self.fingerprint = fingerprint
+        self.clock = clock
+        self._initialized_path: Optional[str] = None
+
+    def _ensure_table(self) -> None:
+        if self._initialized_path == self.db_path:
+            return
+        with connect(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS report_cache (
+                    intent_hash TEXT PRIMARY KEY,
+                    intent TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    report TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+        self._initialized_path = self.db_path
+
+    def get(self, intent: Dict[str, Any]) -> Optional[str]:
+        """Look up the report of an intent if its data has not changed.
+
+        Args:
+            intent: Intent from query_intent
+
+        Returns:
+            The cached report, or None if there is none or it is out of date
+        """
+        self._ensure_table()
+        key = intent_key(intent)
+        with connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT fingerprint, report, created_at FROM report_cache WHERE intent_hash = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        fingerprint, report, created_at = row
+        if created_at < self.clock() - self.news_ttl or self.fingerprint(intent["tickers"]) != fingerprint:
+            with connect(self.db_path) as conn:
+                conn.execute("DELETE FROM report_cache WHERE intent_hash = ?", (key,))
+            return None
+        return report
+
+    def store(self, intent: Dict[str, Any], report: str) -> bool:
+        """Store a freshly built report and drop entries past the news TTL.
+
+        The fingerprint is taken now, after the report's run refreshed the
+        price and fundamentals caches.
+
+        Args:
+            intent: Intent from query_intent
+            report: Report text
+
+        Returns:
+            Whether the report was stored (not when its data is unavailable)
+        """
+        fingerprint = self.fingerprint(intent["tickers"])
+        if fingerprint is None:
+            logger.info("Not caching report for %s: market data unavailable", intent["tickers"])
+            return False
+        self._ensure_table()
+        now = self.clock()
+        with connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO report_cache (intent_hash, intent, fingerprint, report, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (intent_key(intent), json.dumps(intent, sort_keys=True), fingerprint, report, now),
+            )
+            conn.execute("DELETE FROM report_cache WHERE created_at < ?", (now - self.news_ttl,))
+        return True
+
+
+# Global report cache instance
+report_cache = ReportCache()
@@ -0,0 +1,272 @@
+"""Cross-sectional stock screening over cached fundamentals."""
+
+from __future__ import annotations
+
+from typing import Dict, Any, List, Optional, Tuple
+import operator
+import re
+from tools.ratio_tool import fundamentals_cache, calculate_valuation_metrics_batch
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Metric names produced by ratio_tool, in response order
+METRIC_FIELDS = [
+    "pe_ratio",
+    "forward_pe",
+    "peg_ratio",
+    "ev_to_ebitda",
+    "price_to_book",
+    "price_to_sales",
+    "roe",
+    "roa",
+    "profit_margin",
+    "operating_margin",
+    "revenue_growth",
+    "earnings_growth",
+    "earnings_quarterly_growth",
+    "free_cash_flow",
+    "operating_cash_flow",
+    "debt_to_equity",
+    "current_ratio",
+    "quick_ratio",
+    "market_cap",
+    "enterprise_value",
+]
+TEXT_FIELDS = ["sector", "industry"]
+
+# Derived columns: "<metric>_pct" is the percentile rank within the screened
+# universe, "<metric>_sector_z" the z-score within the ticker's sector
+PERCENTILE_SUFFIX = "_pct"
+SECTOR_Z_SUFFIX = "_sector_z"
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+_FILTER_PATTERN = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=|==|!=|>|<|=)\s*(.+?)\s*$")
+
+
+def build_table(snapshots: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """Builds a columnar fundamentals table from valuation data snapshots.
+
+    Args:
+        snapshots: Valuation data (as returned by ratio_tool) keyed by ticker
+
+    Returns:
+        DataFrame indexed by ticker with one float64 column per metric plus
+        company_name, sector and industry
+    """
+    tickers = list(snapshots)
+    values = np.full((len(tickers), len(METRIC_FIELDS)), np.nan)
+    for row, ticker in enumerate(tickers):
+        metrics = snapshots[ticker].get("metrics", {})
+        for col, field in enumerate(METRIC_FIELDS):
+            value = metrics.get(field)
+            if isinstance(value, (int, float)):
+                values[row, col] = value
+
+    table = pd.DataFrame(values, index=pd.Index(tickers, name="ticker"), columns=METRIC_FIELDS)
+    table.insert(0, "company_name", [snapshots[t].get("company_name", t) for t in tickers])
+    for position, field in enumerate(TEXT_FIELDS, start=1):
+        table.insert(position, field, [snapshots[t].get(field) or "" for t in tickers])
+    return table
+
+
+def _derived_column(table: pd.DataFrame, name: str) -> pd.Series:
+    """Computes a percentile or sector z-score column on demand."""
+    if name.endswith(PERCENTILE_SUFFIX):
+        base = name[: -len(PERCENTILE_SUFFIX)]
+        if base in METRIC_FIELDS:
+            return table[base].rank(pct=True)
+    if name.endswith(SECTOR_Z_SUFFIX):
+        base = name[: -len(SECTOR_Z_SUFFIX)]
+        if base in METRIC_FIELDS:
+            grouped = table.groupby("sector")[base]
+            std = grouped.transform("std").replace(0.0, np.nan)
+            return (table[base] - grouped.transform("mean")) / std
+    raise ValueError(
+        f"Unknown screening field '{name}'. Use one of {', '.join(TEXT_FIELDS + METRIC_FIELDS)}, "
+        f"optionally with the suffix {PERCENTILE_SUFFIX} or {SECTOR_Z_SUFFIX}"
+    )
+
+
+def _column(table: pd.DataFrame, name: str) -> pd.Series:
+    """Gets a table column, adding derived columns the first time they are used."""
+    if name not in table.columns:
+        table[name] = _derived_column(table, name)
+    return table[name]
+
+
+def parse_filter(expression: str) -> Tuple[str, str, Any]:
+    """Parses a filter expression such as "roe > 0.15" or "industry == Semiconductors".
+
+    Args:
+        expression: "<field> <operator> <value>" with operator one of
+            >, >=, <, <=, ==, !=
+
+    Returns:
+        Tuple of (field, operator, value); numeric values are floats
+    """
+    match = _FILTER_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Invalid filter '{expression}', expected e.g. 'roe > 0.15'")
+    field, op, raw_value = match.groups()
+    raw_value = raw_value.strip("'\"")
+    if field in TEXT_FIELDS:
+        if op not in ("==", "=", "!="):
+            raise ValueError(f"Filter on {field} only supports == and !=")
+        return field, op, raw_value
+    try:
+        value = float(raw_value.rstrip("%")) / (100 if raw_value.endswith("%") else 1)
+    except ValueError:
+        raise ValueError(f"Invalid number '{raw_value}' in filter '{expression}'")
+    return field, op, value
+
+
+def screen(
+    table: pd.DataFrame,
+    filters: Optional[List[str]] = None,
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """Filters and ranks a fundamentals table.
+
+    Percentiles and sector z-scores are computed over the whole table
+    before filtering, so they stay relative to the full universe.
+
+    Args:
+        table: Table from build_table
+        filters: Filter expressions combined with AND (see parse_filter)
+        sort_by: Field to rank by; tickers missing the field sort last
+        ascending: Sort direction
+        limit: Maximum number of rows to return
+
+    Returns:
+        Matching rows, ranked
+    """
+    table = table.copy()
+    mask = np.ones(len(table), dtype=bool)
+    for expression in filters or []:
+        field, op, value = parse_filter(expression)
+        column = _column(table, field)
+        if field in TEXT_FIELDS:
+            mask &= _OPERATORS[op](column.str.lower(), value.lower()).to_numpy()
+        else:
+            # Comparisons with NaN are False, so missing metrics never match
+            mask &= _OPERATORS[op](column.to_numpy(), value)
+
+    if sort_by:
+        _column(table, sort_by)
+    result = table[mask]
+    if sort_by:
+        result = result.sort_values(sort_by, ascending=ascending, na_position="last", kind="stable")
+    if limit is not None:
+        result = result.head(limit)
+    return result
+
+
+def _load_universe(tickers: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """Loads snapshots for a universe, fetching only tickers missing from the cache."""
+    if not tickers:
+        return fundamentals_cache.lookup_many(), {}
+
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    snapshots = fundamentals_cache.lookup_many(symbols)
+    errors: Dict[str, str] = {}
+    missing = [t for t in symbols if t not in snapshots]
+    if missing:
+        fetched = calculate_valuation_metrics_batch(missing)
+        if fetched["status"] == "success":
+            snapshots.update(fetched["data"]["tickers"])
+            errors = fetched["data"]["errors"]
+        else:
+            errors = {t: fetched["error_message"] for t in missing}
+    return {t: snapshots[t] for t in symbols if t in snapshots}, errors
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def screen_stocks(
+    tickers: List[str],
+    filters: List[str],
+    sort_by: str = "",
+    ascending: bool = True,
+    limit: int = 10,
+) -> Dict[str, Any]:
+    """Screens a universe of tickers on valuation metrics.
+
+    Fields are the metric names returned by calculate_valuation_metrics
+    (pe_ratio, ev_to_ebitda, roe, ...), sector and industry. Any metric can
+    also be used as "<metric>_pct" (percentile rank within the universe,
+    0-1) or "<metric>_sector_z" (z-score relative to the ticker's sector).
+
+    Example: cheapest semiconductor stocks by EV/EBITDA with ROE above 15%:
+        filters=["industry == Semiconductors", "roe > 0.15"],
+        sort_by="ev_to_ebitda", ascending=True
+
+    Args:
+        tickers: Universe to screen (e.g., ["NVDA", "AMD", "INTC"]); an empty
+            list screens every ticker in the fundamentals cache
+        filters: Filter expressions combined with AND (e.g., ["roe > 0.15"])
+        sort_by: Field to rank by (empty for no ranking)
+        ascending: True to rank lowest first
+        limit: Maximum number of tickers to return
+
+    Returns:
+        Dictionary with status and matching tickers.
+        Success: {"status": "success", "data": {"results": [...], ...}}
+        Error: {"status": "error", "error_message": "..."}
+    """
+    try:
+        snapshots, errors = _load_universe(tickers)
+        if not snapshots:
+            return {
+                "status": "error",
+                "error_message": "No fundamentals available for the requested universe",
+            }
+
+        table = build_table(snapshots)
+        result = screen(table, filters, sort_by or None, ascending)
+        matched = len(result)
+        result = result.head(limit)
+
+        fields = []
+        for expression in filters or []:
+            fields.append(parse_filter(expression)[0])
+        if sort_by:
+            fields.append(sort_by)
+        columns = ["company_name", "sector", "industry"] + [
+            f for f in dict.fromkeys(fields) if f not in TEXT_FIELDS
+        ]
+
+        results = [
+            {"ticker": ticker, **{col: _json_value(row[col]) for col in columns}}
+            for ticker, row in result[columns].iterrows()
+        ]
+        data = {
+            "universe_size": len(table),
+            "matched": matched,
+            "filters": filters or [],
+            "sort_by": sort_by or None,
+            "results": results,
+            "stale_tickers": [t for t, s in snapshots.items() if s.get("freshness", {}).get("stale")],
+            "errors": errors,
+        }
+        return {"status": "success", "data": data}
+
+    except ValueError as e:
+        return {"status": "error", "error_message": str(e)}
+    except Exception as e:
+        return {"status": "error", "error_message": f"Error screening stocks: {str(e)}"}
@@ -0,0 +1,117 @@
+"""Persistent cache of per-article sentiment results.
+
+The same headlines are scored many times (for every user asking about the
+same ticker, and on every follow-up question), so each article's LLM result
+is stored in the application SQLite database under a hash of its
+normalized title and snippet and the ticker it was judged for (the same
+headline can be good news for one company and bad news for another).
+Entries expire after ``SENTIMENT_CACHE_TTL``.
+"""
+
+from typing import Dict, Any, Callable, Iterable, Optional
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from utils.db import connect, sqlite_path_from_url
+from config.settings import SENTIMENT_CACHE_TTL
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    """Folds case, Unicode forms and whitespace so trivial variants match."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def article_key(article: Dict[str, Any], ticker: Optional[str] = None) -> str:
+    """Get the cache key of a news article.
+
+    Args:
+        article: News article dictionary with 'title' and 'snippet' keys
+        ticker: Ticker the article's sentiment is judged for, or None when
+            it is judged on its own
+
+    Returns:
+        Hex SHA-256 digest of the normalized title and snippet, and the ticker
+    """
+    title = _normalize(article.get("title", ""))
+    snippet = _normalize(article.get("snippet", ""))
+    text = f"{title}\n{snippet}" if ticker is None else f"{ticker.upper()}\n{title}\n{snippet}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """SQLite-backed store of per-article sentiment results with a TTL."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: float = SENTIMENT_CACHE_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.db_path = db_path or sqlite_path_from_url()
+        self.ttl = ttl
+        self.clock = clock
+        self._initialized_path: Optional[str] = None
+
+    def _ensure_table(self) -> None:
+        if self._initialized_path == self.db_path:
+            return
+        with connect(self.db_path) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    article_hash TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    analyzed_at REAL NOT NULL
+                )"""
+            )
+        self._initialized_path = self.db_path
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up unexpired results.
+
+        Args:
+            keys: Article keys from article_key
+
+        Returns:
+            Mapping of key to cached result for the keys that were found
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        self._ensure_table()
+        cutoff = self.clock() - self.ttl
+        results = {}
+        with connect(self.db_path) as conn:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 900):
+                chunk = keys[start:start + 900]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT article_hash, result FROM sentiment_cache "
+                    f"WHERE article_hash IN ({placeholders}) AND analyzed_at >= ?",
+                    (*chunk, cutoff),
+                ).fetchall()
+                results.update((key, json.loads(result)) for key, result in rows)
+        return results
+
+    def store_many(self, results: Dict[str, Dict[str, Any]]) -> None:
+        """Store results and drop expired entries.
+
+        Args:
+            results: Mapping of article key to sentiment result
+        """
+        if not results:
+            return
+        self._ensure_table()
+        now = self.clock()
+        with connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache (article_hash, result, analyzed_at) "
+                "VALUES (?, ?, ?)",
+                [(key, json.dumps(result), now) for key, result in results.items()],
+            )
+            conn.execute("DELETE FROM sentiment_cache WHERE analyzed_at < ?", (now - self.ttl,))
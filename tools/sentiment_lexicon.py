@@ -0,0 +1,106 @@
+"""Finance word lists for the local sentiment scorer.
+
+Categories follow the Loughran-McDonald financial sentiment dictionary
+(positive, negative, uncertainty, litigious), trimmed to words that carry
+signal in news headlines and snippets and extended with common headline
+verbs ("beats", "plunges", "downgrade"). Entries are base forms; regular
+inflections are generated when the lexicon is built, irregular past
+forms are listed.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+POSITIVE_WORDS = """
+accelerate achieve advance advantage attractive beat benefit best better boost
+breakthrough bullish climb confident efficient enhance exceed excellent expand
+favorable gain good great grow growth improve improvement innovative jump lead
+leading momentum optimistic outperform outperformance positive profitable
+profitability rally rebound record recover recovery resilient rise robust soar
+solid strong stronger strongest strength success successful surge surpass upbeat
+upgrade upside win winner
+grew grown led rose risen won
+""".split()
+
+NEGATIVE_WORDS = """
+adverse bankrupt bankruptcy bearish breach collapse concern crash crisis cut
+decline decrease default deficit delay disappoint disappointing downgrade
+downturn drop fail failure fall fear fraud halt headwind impairment layoff
+lose loss miss negative penalty plummet plunge recall recession scandal selloff
+shortage shortfall sink slash slide slowdown slump struggle tumble turmoil
+underperform warn warning weak weaken weakness worse worst writedown
+fell fallen lost sank slid sunk
+""".split()
+
+UNCERTAINTY_WORDS = """
+approximately could depend doubt may might pending possible possibly reportedly
+risk rumor speculate speculation tentative uncertain uncertainty unclear
+unpredictable volatile volatility whether
+""".split()
+
+LITIGIOUS_WORDS = """
+allegation allege antitrust court defendant indictment investigation lawsuit
+litigation plaintiff probe regulator settlement subpoena sue
+""".split()
+
+NEGATORS = frozenset("not no never none nobody neither nor without cannot".split())
+
+# Theme name -> regular expression over lower-cased text
+THEME_PATTERNS: Dict[str, str] = {
+    "earnings": r"\b(?:earnings|eps|quarterly results?|revenue\w*|profits?|sales)\b",
+    "guidance": r"\b(?:guidance|outlook|forecast\w*|projections?)\b",
+    "regulation": r"\b(?:regulat\w*|sec|ftc|antitrust|compliance|bans?|banned|tariffs?|sanctions?)\b",
+    "litigation": r"\b(?:lawsuits?|sue[sd]?|suing|court|settle\w*|litigation|class action)\b",
+    "risks": r"\b(?:risks?|uncertaint\w*|volatil\w*|headwinds?|concerns?)\b",
+    "partnerships": r"\b(?:partner\w*|collaborat\w*|alliance|joint venture)\b",
+    "product launches": r"\b(?:launch\w*|unveil\w*|debut\w*|introduc\w*|new product\w*|releases?)\b",
+    "mergers and acquisitions": r"\b(?:acqui\w*|merger\w*|takeover\w*|buyout\w*|to buy)\b",
+    "analyst ratings": r"\b(?:upgrade\w*|downgrade\w*|price target\w*|ratings?|analysts?)\b",
+    "management": r"\b(?:ceo|cfo|chief executive|executives?|resign\w*|appoint\w*|steps? down)\b",
+    "capital returns": r"\b(?:dividends?|buybacks?|repurchase\w*)\b",
+    "macro": r"\b(?:inflation|interest rates?|fed|federal reserve|recession|economy|gdp)\b",
+    "restructuring": r"\b(?:layoffs?|job cuts|restructur\w*|cost cuts?)\b",
+}
+
+CATEGORIES = ("positive", "negative", "uncertainty", "litigious")
+
+
+def _inflections(word: str) -> Iterable[str]:
+    """Regular inflections of an English base form."""
+    yield word
+    if word.endswith("y") and len(word) > 2 and word[-2] not in "aeiou":
+        yield word[:-1] + "ies"
+        yield word[:-1] + "ied"
+        yield word + "ing"
+        return
+    if word.endswith("e"):
+        yield word + "s"
+        yield word + "d"
+        yield word[:-1] + "ing"
+        return
+    yield word + ("es" if word.endswith(("s", "sh", "ch", "x", "z")) else "s")
+    yield word + "ed"
+    yield word + "ing"
+    if len(word) > 2 and word[-1] in "bdglmnpt" and word[-2] in "aeiou" and word[-3] not in "aeiou":
+        # Doubled final consonant (drop -> dropped, slip -> slipping)
+        yield word + word[-1] + "ed"
+        yield word + word[-1] + "ing"
+
+
+def build_lexicon() -> Dict[str, int]:
+    """Maps every word form to the index of its category in CATEGORIES.
+
+    Negative words take precedence over the other categories where an
+    inflection collides.
+    """
+    lists: List[Tuple[int, List[str]]] = [
+        (CATEGORIES.index("positive"), POSITIVE_WORDS),
+        (CATEGORIES.index("uncertainty"), UNCERTAINTY_WORDS),
+        (CATEGORIES.index("litigious"), LITIGIOUS_WORDS),
+        (CATEGORIES.index("negative"), NEGATIVE_WORDS),
+    ]
+    lexicon = {}
+    for category, words in lists:
+        for word in words:
+            for form in _inflections(word):
+                lexicon[form] = category
+    return lexicon
@@ -1,9 +1,401 @@
-"""Sentiment analysis tool for financial news."""
+"""Sentiment analysis tool for financial news.
 
-from typing import Dict, Any, List, Optional
-from google.adk.models.google_llm import Gemini
-from google.genai import types
-import json
+Articles are scored individually. A finance lexicon scores every article
+locally first, and only articles it is not confident about are sent to the
+model. Model results are cached by a hash of the article's normalized title
+and snippet (see tools.sentiment_cache), and the overall sentiment is
+rebuilt from the per-article results. analyze_news_sentiment_batch scores
+the news of several tickers with one structured-output model request.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+import re
+from tools.sentiment_cache import SentimentCache, article_key
+from tools.sentiment_lexicon import CATEGORIES, NEGATORS, THEME_PATTERNS, build_lexicon
+from config.settings import (
+    SENTIMENT_LLM_FALLBACK_CONFIDENCE,
+    SENTIMENT_BATCH_MAX_INPUT_TOKENS,
+    SENTIMENT_BATCH_MAX_OUTPUT_TOKENS,
+)
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_MODEL = "gemini-2.5-flash-lite"
+MAX_ARTICLES = 10
+MAX_KEY_THEMES = 5
+
+SENTIMENT_LABELS = ("positive", "neutral", "negative")
+# Score used when the model omits one for an article
+DEFAULT_SCORES = {"positive": 0.8, "neutral": 0.5, "negative": 0.2}
+# Overall tone thresholds on the 0-1 sentiment score
+POSITIVE_THRESHOLD = 0.6
+NEGATIVE_THRESHOLD = 0.4
+
+# Local scorer: a positive word within this many tokens after a negator counts as negative
+NEGATION_WINDOW = 3
+# Litigious words weigh on sentiment, but less than outright negative ones
+LITIGIOUS_WEIGHT = 0.5
+# Confidence of an article without a single sentiment word
+NO_SIGNAL_CONFIDENCE = 2
+
+# Model requests: character-based token estimates used to split large batches
+CHARS_PER_TOKEN = 4
+PROMPT_OVERHEAD_TOKENS = 200
+ARTICLE_OVERHEAD_TOKENS = 15
+OUTPUT_TOKENS_PER_ARTICLE = 60
+
+# Structured output schema, so the response needs no parsing of its own
+RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "articles": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "article_id": {"type": "INTEGER"},
+                    "sentiment": {"type": "STRING", "enum": list(SENTIMENT_LABELS)},
+                    "score": {"type": "NUMBER"},
+                    "confidence": {"type": "INTEGER"},
+                    "themes": {"type": "ARRAY", "items": {"type": "STRING"}},
+                },
+                "required": ["article_id", "sentiment", "score", "confidence", "themes"],
+            },
+        }
+    },
+    "required": ["articles"],
+}
+
+_LEXICON = build_lexicon()
+_POSITIVE, _NEGATIVE, _UNCERTAINTY, _LITIGIOUS = (
+    CATEGORIES.index(name) for name in ("positive", "negative", "uncertainty", "litigious")
+)
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_THEMES = {theme: re.compile(pattern) for theme, pattern in THEME_PATTERNS.items()}
+
+sentiment_cache = SentimentCache()
+
+
+def _get_model():
+    """Get the shared sentiment model from the model registry."""
+    # Imported here; the ADK model stack is slow to load
+    from llm.registry import get_model
+
+    return get_model(SENTIMENT_MODEL)
+
+
+def _clean_result(item: Any) -> Optional[Dict[str, Any]]:
+    """Validates one article result from the model (None if unusable)."""
+    if not isinstance(item, dict):
+        return None
+    sentiment = str(item.get("sentiment", "")).strip().lower()
+    if sentiment not in SENTIMENT_LABELS:
+        return None
+    try:
+        score = min(1.0, max(0.0, float(item.get("score"))))
+    except (TypeError, ValueError):
+        score = DEFAULT_SCORES[sentiment]
+    try:
+        confidence = min(10, max(1, int(item.get("confidence"))))
+    except (TypeError, ValueError):
+        confidence = 5
+    themes = item.get("themes") or []
+    if not isinstance(themes, list):
+        themes = [themes]
+    return {
+        "sentiment": sentiment,
+        "score": score,
+        "confidence": confidence,
+        "themes": [str(theme).strip().lower() for theme in themes if str(theme).strip()],
+    }
+
+
+def score_articles_locally(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Scores articles with the finance lexicon, without a model call.
+
+    Words are counted per article and category in one pass over the batch,
+    then scores and confidences are computed for all articles at once.
+    Confidence grows with the number of sentiment words and how one-sided
+    they are, and shrinks with uncertainty words.
+
+    Args:
+        articles: News article dictionaries with 'title' and 'snippet' keys
+
+    Returns:
+        One result per article with sentiment, score, confidence and themes
+    """
+    n_categories = len(CATEGORIES)
+    cells = []
+    themes = []
+    for i, article in enumerate(articles):
+        text = f"{article.get('title', '')} {article.get('snippet', '')}".lower()
+        last_negator = -NEGATION_WINDOW - 1
+        for j, token in enumerate(_TOKEN.findall(text)):
+            if token in NEGATORS or token.endswith("n't"):
+                last_negator = j
+                continue
+            category = _LEXICON.get(token)
+            if category is None:
+                continue
+            if category == _POSITIVE and j - last_negator <= NEGATION_WINDOW:
+                category = _NEGATIVE
+            cells.append(i * n_categories + category)
+        themes.append([theme for theme, pattern in _THEMES.items() if pattern.search(text)])
+
+    counts = np.bincount(
+        np.asarray(cells, dtype=np.int64), minlength=len(articles) * n_categories
+    ).reshape(len(articles), n_categories)
+    positive = counts[:, _POSITIVE].astype(float)
+    negative = counts[:, _NEGATIVE] + LITIGIOUS_WEIGHT * counts[:, _LITIGIOUS]
+    polar = positive + negative
+    net = np.divide(positive - negative, polar, out=np.zeros_like(polar), where=polar > 0)
+    evidence = polar / (polar + 1)
+    scores = 0.5 + 0.5 * net * evidence
+    confidence = 1 + 9 * np.abs(net) * evidence / (1 + 0.5 * counts[:, _UNCERTAINTY])
+    confidence = np.where(polar > 0, np.clip(np.rint(confidence), 1, 10), NO_SIGNAL_CONFIDENCE)
+    labels = np.where(
+        scores >= POSITIVE_THRESHOLD,
+        "positive",
+        np.where(scores <= NEGATIVE_THRESHOLD, "negative", "neutral"),
+    )
+
+    return [
+        {
+            "sentiment": str(labels[i]),
+            "score": round(float(scores[i]), 3),
+            "confidence": int(confidence[i]),
+            "themes": themes[i],
+            "source": "lexicon",
+        }
+        for i in range(len(articles))
+    ]
+
+
+def _token_chunks(
+    articles: List[Dict[str, Any]], tickers: List[Optional[str]]
+) -> List[Tuple[int, int]]:
+    """Splits articles into (start, end) ranges that fit one model request.
+
+    Token counts are estimated from character counts. A range closes before
+    either the estimated prompt or the expected response would exceed its
+    budget; a single oversized article still gets a request of its own.
+    """
+    chunks = []
+    start = 0
+    input_tokens = PROMPT_OVERHEAD_TOKENS
+    for i, (article, ticker) in enumerate(zip(articles, tickers)):
+        text = f"{ticker or ''}{article.get('title', '')}{article.get('snippet', '')}"
+        article_tokens = len(text) // CHARS_PER_TOKEN + ARTICLE_OVERHEAD_TOKENS
+        output_tokens = (i - start + 1) * OUTPUT_TOKENS_PER_ARTICLE
+        if i > start and (
+            input_tokens + article_tokens > SENTIMENT_BATCH_MAX_INPUT_TOKENS
+            or output_tokens > SENTIMENT_BATCH_MAX_OUTPUT_TOKENS
+        ):
+            chunks.append((start, i))
+            start = i
+            input_tokens = PROMPT_OVERHEAD_TOKENS
+        input_tokens += article_tokens
+    if start < len(articles):
+        chunks.append((start, len(articles)))
+    return chunks
+
+
+def _build_prompt(articles: List[Dict[str, Any]], tickers: List[Optional[str]]) -> str:
+    """Lists articles under their ticker, numbered across the whole prompt."""
+    sections: Dict[Optional[str], List[str]] = {}
+    for article_id, (article, ticker) in enumerate(zip(articles, tickers), 1):
+        sections.setdefault(ticker, []).append(
+            f"[{article_id}] Title: {article.get('title', '')}\n"
+            f"Snippet: {article.get('snippet', '')}"
+        )
+    body = "\n\n".join(
+        (f"Articles about {ticker}:\n" if ticker else "Articles:\n") + "\n\n".join(lines)
+        for ticker, lines in sections.items()
+    )
+    return f"""Analyze the sentiment of each of the following financial news articles. Where an
+article is listed under a ticker, judge its sentiment for that company's stock.
+
+For each article give its article_id, the sentiment ("positive", "neutral" or
+"negative"), a score from 0.0 (very negative) to 1.0 (very positive), a confidence
+from 1 to 10, and key themes (regulation, earnings, risks, partnerships, product
+launches, etc.).
+
+{body}
+"""
+
+
+def _request_scores(
+    articles: List[Dict[str, Any]], tickers: List[Optional[str]]
+) -> List[Optional[Dict[str, Any]]]:
+    """Scores one chunk of articles in a single structured-output request.
+
+    A response cut off at the output token limit is retried as two halves.
+    """
+    from google.genai import types
+
+    from llm.registry import model_registry
+
+    model = _get_model()
+    with model_registry.limiter(model.model).slot():
+        response = model.api_client.models.generate_content(
+            model=model.model,
+            contents=_build_prompt(articles, tickers),
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=RESPONSE_SCHEMA,
+                max_output_tokens=SENTIMENT_BATCH_MAX_OUTPUT_TOKENS,
+            ),
+        )
+
+    candidates = response.candidates or []
+    truncated = bool(candidates) and candidates[0].finish_reason == types.FinishReason.MAX_TOKENS
+    if truncated and len(articles) > 1:
+        half = len(articles) // 2
+        return _request_scores(articles[:half], tickers[:half]) + _request_scores(
+            articles[half:], tickers[half:]
+        )
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(articles)
+    parsed = response.parsed if not truncated else None
+    items = parsed.get("articles") if isinstance(parsed, dict) else None
+    for item in items if isinstance(items, list) else []:
+        article_id = item.get("article_id") if isinstance(item, dict) else None
+        if isinstance(article_id, int) and 1 <= article_id <= len(articles):
+            results[article_id - 1] = _clean_result(item)
+    return results
+
+
+def _score_articles(
+    articles: List[Dict[str, Any]], tickers: Optional[List[Optional[str]]] = None
+) -> List[Optional[Dict[str, Any]]]:
+    """Scores articles with the model, in as few requests as the token budget allows.
+
+    Args:
+        articles: News article dictionaries with 'title' and 'snippet' keys
+        tickers: Ticker each article is about (None where unknown)
+
+    Returns:
+        One result per article, in order (None where the model gave no usable result)
+    """
+    tickers = list(tickers) if tickers is not None else [None] * len(articles)
+    results: List[Optional[Dict[str, Any]]] = []
+    for start, end in _token_chunks(articles, tickers):
+        results.extend(_request_scores(articles[start:end], tickers[start:end]))
+    return results
+
+
+def summarize_sentiment(scored: List[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Rebuilds the overall sentiment from per-article results.
+
+    Args:
+        scored: (article number, result) pairs
+
+    Returns:
+        Sentiment analysis with overall sentiment, confidence-weighted score,
+        per-article results, key themes and a short summary
+    """
+    total_weight = sum(result["confidence"] for _, result in scored)
+    score = sum(result["score"] * result["confidence"] for _, result in scored) / total_weight
+    if score >= POSITIVE_THRESHOLD:
+        overall = "positive"
+    elif score <= NEGATIVE_THRESHOLD:
+        overall = "negative"
+    else:
+        overall = "neutral"
+
+    theme_counts = Counter(theme for _, result in scored for theme in set(result["themes"]))
+    key_themes = [theme for theme, _ in theme_counts.most_common(MAX_KEY_THEMES)]
+    label_counts = Counter(result["sentiment"] for _, result in scored)
+    summary = (
+        f"{overall.capitalize()} overall across {len(scored)} articles "
+        f"({label_counts['positive']} positive, {label_counts['neutral']} neutral, "
+        f"{label_counts['negative']} negative)."
+    )
+    if key_themes:
+        summary += f" Key themes: {', '.join(key_themes)}."
+
+    return {
+        "overall_sentiment": overall,
+        "sentiment_score": round(score, 3),
+        "articles": [{"article_number": number, **result} for number, result in scored],
+        "key_themes": key_themes,
+        "summary": summary,
+    }
+
+
+def _analyze_groups(
+    groups: Dict[Optional[str], List[Dict[str, Any]]]
+) -> Dict[Optional[str], Dict[str, Any]]:
+    """Scores several article lists together.
+
+    The cache lookup, the lexicon pass and the model requests are shared by
+    all groups, so articles of every ticker needing the model go out in as
+    few requests as the token budget allows.
+
+    Args:
+        groups: Ticker (or None) -> news articles
+
+    Returns:
+        Ticker (or None) -> sentiment data for that group's articles
+    """
+    group_keys = {
+        name: [article_key(article, name) for article in articles[:MAX_ARTICLES]]
+        for name, articles in groups.items()
+    }
+    cached = sentiment_cache.get_many(key for keys in group_keys.values() for key in keys)
+
+    # Score each unseen article once per ticker, even if it appears twice in the batch
+    missing: Dict[str, Tuple[Dict[str, Any], Optional[str]]] = {}
+    for name, keys in group_keys.items():
+        for key, article in zip(keys, groups[name]):
+            if key not in cached:
+                missing.setdefault(key, (article, name))
+    local = dict(zip(missing, score_articles_locally([article for article, _ in missing.values()])))
+
+    # Escalate to the model only where the lexicon is unsure
+    uncertain = [
+        key for key, result in local.items() if result["confidence"] < SENTIMENT_LLM_FALLBACK_CONFIDENCE
+    ]
+    fresh = {}
+    if uncertain:
+        try:
+            scores = _score_articles(
+                [missing[key][0] for key in uncertain], tickers=[missing[key][1] for key in uncertain]
+            )
+        except Exception as e:
+            # Keep the local results rather than failing the whole analysis
+            logger.warning("Model sentiment scoring failed, using lexicon results: %s", e)
+            scores = [None] * len(uncertain)
+        fresh = {
+            key: {**result, "source": "llm"}
+            for key, result in zip(uncertain, scores)
+            if result is not None
+        }
+        sentiment_cache.store_many(fresh)
+
+    results = {**cached, **local, **fresh}
+    data = {}
+    for name, keys in group_keys.items():
+        scored = [(i, results[key]) for i, key in enumerate(keys, 1)]
+        sources = Counter(
+            "cache" if key in cached else results[key].get("source", "llm") for key in keys
+        )
+        data[name] = {
+            "total_articles": len(groups[name]),
+            "analyzed_articles": len(scored),
+            "cached_articles": sources["cache"],
+            "lexicon_articles": sources["lexicon"],
+            "llm_articles": sources["llm"],
+            "sentiment_analysis": summarize_sentiment(scored),
+        }
+    return data
 
 
 def analyze_news_sentiment(
@@ -27,82 +419,58 @@ def analyze_news_sentiment(
                 "error_message": "No news articles provided",
             }
 
-        # Prepare news text for analysis
-        news_text = ""
-        for i, article in enumerate(news_articles[:10], 1):  # Limit to 10 articles
-            title = article.get("title", "")
-            snippet = article.get("snippet", "")
-            news_text += f"Article {i}:\nTitle: {title}\nSnippet: {snippet}\n\n"
-
-        # Use Gemini to analyze sentiment
-        model = Gemini(model="gemini-2.5-flash-lite")
-        
-        prompt = f"""Analyze the sentiment of the following financial news articles about stocks.
-        
-For each article, determine:
-1. Overall sentiment: "positive", "neutral", or "negative"
-2. Key themes: regulation, earnings, risks, partnerships, product launches, etc.
-3. Confidence level: 1-10
-
-Articles:
-{news_text}
-
-Provide your analysis in JSON format with this structure:
-{{
-    "overall_sentiment": "positive|neutral|negative",
-    "sentiment_score": 0.0-1.0,
-    "articles": [
-        {{
-            "article_number": 1,
-            "sentiment": "positive|neutral|negative",
-            "confidence": 1-10,
-            "themes": ["theme1", "theme2"]
-        }}
-    ],
-    "key_themes": ["theme1", "theme2", ...],
-    "summary": "Brief summary of overall sentiment and key points"
-}}
-"""
+        return {"status": "success", "data": _analyze_groups({None: news_articles})[None]}
 
-        response = model.generate_content(prompt)
-        
-        # Extract text from response
-        response_text = response.text if hasattr(response, 'text') else str(response)
-        
-        # Try to parse JSON from response
-        try:
-            # Extract JSON if wrapped in markdown code blocks
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            sentiment_data = json.loads(response_text)
-        except json.JSONDecodeError:
-            # Fallback: create structured response from text
-            sentiment_data = {
-                "overall_sentiment": "neutral",
-                "sentiment_score": 0.5,
-                "summary": response_text[:500],
-                "articles": [],
-                "key_themes": [],
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Error analyzing sentiment: {str(e)}",
+        }
+
+
+def analyze_news_sentiment_batch(
+    articles_by_ticker: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """Analyzes news sentiment for several tickers in one pass.
+
+    Articles the local scorer is unsure about are sent to the model in a
+    single structured-output request (split only when it would exceed the
+    token budget), instead of one request per ticker.
+
+    Args:
+        articles_by_ticker: Ticker symbol -> list of news article dictionaries
+            with 'title' and 'snippet' keys (e.g., {"AAPL": [...], "MSFT": [...]})
+
+    Returns:
+        Dictionary with status and per-ticker sentiment analysis.
+        Success: {"status": "success", "data": {"tickers": {...}, "errors": {...}}}
+        Error: {"status": "error", "error_message": "..."}
+    """
+    try:
+        groups: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        for ticker, articles in articles_by_ticker.items():
+            symbol = ticker.strip().upper()
+            if not symbol:
+                continue
+            if articles:
+                groups.setdefault(symbol, []).extend(articles)
+            else:
+                errors[symbol] = f"No news articles provided for {symbol}"
+
+        if not groups:
+            return {
+                "status": "error",
+                "error_message": "; ".join(errors.values()) or "No tickers provided",
             }
 
-        data = {
-            "total_articles": len(news_articles),
-            "analyzed_articles": min(len(news_articles), 10),
-            "sentiment_analysis": sentiment_data,
+        return {
+            "status": "success",
+            "data": {"tickers": _analyze_groups(groups), "errors": errors},
         }
 
-        return {"status": "success", "data": data}
-
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Error analyzing sentiment: {str(e)}",
         }
-
@@ -0,0 +1,40 @@
+"""SQLite helpers for caches kept in the application database."""
+
+from contextlib import contextmanager
+from typing import Iterator
+import sqlite3
+from config.settings import DB_URL
+
+
+def sqlite_path_from_url(db_url: str = DB_URL) -> str:
+    """Get the file path of a SQLite database URL.
+
+    Args:
+        db_url: SQLAlchemy-style URL (e.g., "sqlite:///financial_agent_data.db"
+            or "sqlite+aiosqlite:///data/app.db")
+
+    Returns:
+        Path of the database file
+    """
+    scheme, sep, path = db_url.partition(":///")
+    if not sep or not scheme.startswith("sqlite"):
+        raise ValueError(f"Not a SQLite database URL: {db_url}")
+    return path
+
+
+@contextmanager
+def connect(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Open a short-lived connection that commits on success.
+
+    Args:
+        db_path: Path of the database file
+
+    Yields:
+        SQLite connection
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,41 @@
+"""Deferred imports for heavy dependencies.
+
+numpy, pandas and matplotlib together add about a second to startup, yet
+the tools only need them once a tool actually runs. lazy_import returns a
+stand-in module that performs the real import on first attribute access.
+"""
+
+from types import ModuleType
+import importlib
+import threading
+
+
+class LazyModule(ModuleType):
+    """Module stand-in that imports the real module when first used."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+
+    def __getattr__(self, attr: str):
+        # Only reached for names not yet copied into this module's namespace
+        with self._lazy_lock:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a module on first attribute access.
+
+    Annotations that name the module's types (e.g. pd.DataFrame) must not
+    be evaluated at import time, so modules using this should also use
+    `from __future__ import annotations`.
+
+    Args:
+        name: Absolute module name (e.g., "pandas" or "matplotlib.figure")
+
+    Returns:
+        Stand-in module forwarding to the real one once it is imported
+    """
+    return LazyModule(name)
@@ -0,0 +1,313 @@
+"""Local resolver for common query shapes.
+
+Turns queries such as "Research NVDA" or "Compare Tesla and Ford on
+valuation" into the query agent's structured analysis without a model
+round-trip. Company names and aliases from the bundled listing file are
+matched in one pass by an Aho-Corasick automaton, upper-case symbols are
+looked up in the same table, and the words that are left must be intent,
+requirement or filler words. Anything else (an unknown symbol, a pronoun
+referring to an earlier turn, an investment question) makes the resolver
+unsure, and the query goes to the model instead.
+"""
+
+import csv
+import math
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from utils.tickers import NOT_TICKERS
+from config.settings import LISTINGS_PATH
+
+# Upper-case symbol-like words ("NVDA", "BRK.B", "$TSLA"); possessives ("NVDA's") allowed
+_SYMBOL = re.compile(r"(?<![\w./$&'-])\$?([A-Z][A-Z0-9]{0,5}(?:\.[A-Z]{1,2})?)(?![\w/&]|[.\-]\w)")
+_WORD = re.compile(r"[a-z0-9]+")
+_TIME = re.compile(
+    r"\b(?:(?:this|last|past|next|the last|the past)\s+(?:\d+\s+)?(?:days?|weeks?|months?|quarters?|years?)"
+    r"|\d+\s*(?:d|days?|w|wks?|weeks?|m|mo|mos|months?|q|quarters?|y|yrs?|years?)"
+    r"|ytd|year to date|today|recently|lately)\b"
+)
+_TIME_AMOUNT = re.compile(r"(?P<count>\d+)?\s*(?P<unit>[a-z]+)$")
+# Time unit -> (length in calendar days, period of "this <unit>")
+_TIME_UNITS = {
+    "d": (1, "1d"), "day": (1, "1d"),
+    "w": (7, "5d"), "wk": (7, "5d"), "week": (7, "5d"),
+    "m": (30, "1mo"), "mo": (30, "1mo"), "month": (30, "1mo"),
+    "q": (91, "3mo"), "quarter": (91, "3mo"),
+    "y": (365, "ytd"), "yr": (365, "ytd"), "year": (365, "ytd"),
+}
+# Fixed-length periods the market data tools accept -> length in calendar days
+# (a "5d" week of sessions spans seven); longer spans use "max"
+PERIOD_DAYS = {
+    "1d": 1, "5d": 7, "1mo": 30, "3mo": 91, "6mo": 182,
+    "1y": 365, "2y": 730, "5y": 1826, "10y": 3652,
+}
+
+# Requirement name -> pattern over the lower-cased query
+REQUIREMENT_PATTERNS: Dict[str, re.Pattern] = {
+    "valuation": re.compile(
+        r"\b(?:valuations?|values?|valued|overvalued|undervalued|cheap(?:er|est)?|expensive|multiples?"
+        r"|p/?e(?: ratios?)?|pe ratios?|price to earnings|ev/ebitda|fundamentals|ratios?|eps|earnings)\b"
+    ),
+    "price trends": re.compile(
+        r"\b(?:trends?|trending|perform(?:s|ed|ing|ance)?|returns?|price (?:history|action|movement)"
+        r"|prices?|charts?|volatility|volatile|momentum)\b"
+    ),
+    "news sentiment": re.compile(r"\b(?:news|headlines?|sentiment|press)\b"),
+}
+
+# Intent name -> pattern over the lower-cased query, after requirement words are removed
+INTENT_PATTERNS: Dict[str, re.Pattern] = {
+    "comparison": re.compile(
+        r"\b(?:compare[sd]?|comparing|comparison|versus|vs|against|relative to|better|stack up"
+        r"|head to head|between)\b"
+    ),
+    "research": re.compile(
+        r"\b(?:research|analy[sz]e|analysis|look(?:ing)? (?:at|into)|review|tell me about|overview"
+        r"|report(?: on)?|deep dive(?: into| on)?|dig into|what about|how (?:is|are|has|have|did|does|do)"
+        r"|doing|outlook|thoughts on|update on|check(?: on)?|evaluate|evaluation|assess|assessment"
+        r"|summary of|summarize|info on|information on)\b"
+    ),
+}
+
+FILLER_WORDS = frozenset(
+    """
+    a an the and or of for to with on in at about from over since as also both all each
+    me i we us you please pls can could would will give show get do does is are was were
+    has have had been be what whats which s stock stocks share shares company companies
+    ticker tickers equity equities inc corp quick brief full detailed some want need like
+    know let lets well side by latest current
+    """.split()
+)
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton matching many phrases in one pass over a text."""
+
+    def __init__(self, phrases: Dict[str, Any]):
+        """Build the automaton.
+
+        Args:
+            phrases: Phrase -> value returned when it matches
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        for phrase, value in phrases.items():
+            state = 0
+            for char in phrase:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append((len(phrase), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (start, end, value) of every phrase occurrence, overlapping ones included."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in out[state]:
+                yield index + 1 - length, index + 1, value
+
+
+def load_listings(path: str = LISTINGS_PATH) -> Dict[str, Dict[str, Any]]:
+    """Load the listing table.
+
+    Args:
+        path: CSV file with symbol, name and "|"-separated aliases columns
+
+    Returns:
+        Symbol -> {"name": company name, "aliases": [alias, ...]}
+    """
+    listings = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            aliases = [alias.strip() for alias in (row.get("aliases") or "").split("|") if alias.strip()]
+            listings[row["symbol"].strip()] = {"name": row["name"].strip(), "aliases": aliases}
+    return listings
+
+
+def normalize_period(phrase: str) -> Optional[str]:
+    """Normalize a time phrase of a query to a period the market data tools accept.
+
+    Spans between two periods round to the nearer one on a log scale
+    ("3 years" -> "2y", "4 years" -> "5y").
+
+    Args:
+        phrase: Lower-case time phrase (e.g., "the last 6 months", "ytd", "2 quarters")
+
+    Returns:
+        Period such as "6mo", "1y" or "ytd", or None for vague phrases
+        ("recently")
+    """
+    phrase = " ".join(phrase.split())
+    if phrase in ("ytd", "year to date"):
+        return "ytd"
+    if phrase == "today":
+        return "1d"
+    match = _TIME_AMOUNT.search(phrase)
+    unit = match.group("unit") if match else ""
+    if unit not in _TIME_UNITS:
+        unit = unit.rstrip("s")
+    if unit not in _TIME_UNITS:
+        return None
+    days, to_date = _TIME_UNITS[unit]
+    if phrase.startswith("this "):
+        return to_date
+    span = int(match.group("count") or 1) * days
+    if span <= 0:
+        return None
+    if span > 2 * PERIOD_DAYS["10y"]:
+        return "max"
+    return min(PERIOD_DAYS, key=lambda period: abs(math.log(span / PERIOD_DAYS[period])))
+
+
+def _at_word_boundary(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+class QueryResolver:
+    """Resolves common query shapes to tickers, request type and requirements."""
+
+    def __init__(self, listings: Dict[str, Dict[str, Any]]):
+        """Build the symbol table and the name automaton.
+
+        Args:
+            listings: Listing table as returned by load_listings
+        """
+        self.listings = listings
+        names: Dict[str, str] = {}
+        for symbol, listing in listings.items():
+            for alias in [listing["name"], *listing["aliases"]]:
+                names.setdefault(" ".join(alias.lower().split()), symbol)
+        self._names = PhraseMatcher(names)
+
+    def _mentions(self, text: str) -> Optional[List[Tuple[int, int, str]]]:
+        """Non-overlapping (start, end, symbol) mentions, or None on an unknown symbol."""
+        lowered = text.lower()
+        candidates = [
+            (start, end, symbol)
+            for start, end, symbol in self._names.find(lowered)
+            if _at_word_boundary(lowered, start, end)
+        ]
+        symbols = []
+        for match in _SYMBOL.finditer(text):
+            symbol = match.group(1)
+            if symbol in self.listings:
+                candidates.append((match.start(), match.end(), symbol))
+            elif symbol not in NOT_TICKERS:
+                symbols.append((match.start(), match.end()))
+
+        # Leftmost-longest mentions win
+        mentions: List[Tuple[int, int, str]] = []
+        for start, end, symbol in sorted(candidates, key=lambda c: (c[0], c[0] - c[1])):
+            if not mentions or start >= mentions[-1][1]:
+                mentions.append((start, end, symbol))
+
+        # An unknown symbol not covered by a name ("TSMC") leaves the query to the model
+        for start, end in symbols:
+            if not any(m_start <= start and end <= m_end for m_start, m_end, _ in mentions):
+                return None
+        return mentions
+
+    def resolve(self, query: str) -> Optional[Dict[str, Any]]:
+        """Resolve a query locally.
+
+        Args:
+            query: User query
+
+        Returns:
+            Dictionary with tickers, request_type, requirements, period (None
+            when not stated) and the analysis text, or None when the query
+            should go to the model
+        """
+        text = " ".join(query.split())
+        if len(text.lower()) != len(text):
+            return None
+        mentions = self._mentions(text)
+        if not mentions:
+            return None
+
+        tickers: List[str] = []
+        for _, _, symbol in mentions:
+            if symbol not in tickers:
+                tickers.append(symbol)
+
+        rest = []
+        position = 0
+        for start, end, _ in mentions:
+            rest.append(text[position:start])
+            position = end
+        rest.append(text[position:])
+        remainder = " ".join(rest).lower()
+        time_phrase = _TIME.search(remainder)
+        period = normalize_period(time_phrase.group(0)) if time_phrase else None
+        remainder = _TIME.sub(" ", remainder)
+
+        requirements = []
+        for name, pattern in REQUIREMENT_PATTERNS.items():
+            remainder, count = pattern.subn(" ", remainder)
+            if count:
+                requirements.append(name)
+        intents = []
+        for name, pattern in INTENT_PATTERNS.items():
+            remainder, count = pattern.subn(" ", remainder)
+            if count:
+                intents.append(name)
+        if any(word not in FILLER_WORDS for word in _WORD.findall(remainder)):
+            return None
+
+        if "comparison" in intents:
+            if len(tickers) < 2:
+                return None  # compared with what the model has to work out ("its peers")
+            request_type = "multi-ticker comparison"
+        else:
+            request_type = "multi-ticker research" if len(tickers) > 1 else "single-ticker research"
+
+        companies = ", ".join(f"{self.listings[ticker]['name']} ({ticker})" for ticker in tickers)
+        analysis = (
+            f"Tickers: {', '.join(tickers)}\n"
+            f"Request type: {request_type}\n"
+            f"Companies: {companies}\n"
+            f"Requirements: {', '.join(requirements) or 'none specified'}"
+        )
+        if period:
+            analysis += f"\nPeriod: {period}"
+        return {
+            "tickers": tickers,
+            "request_type": request_type,
+            "requirements": requirements,
+            "period": period,
+            "analysis": analysis,
+        }
+
+
+_resolver: Optional[QueryResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> QueryResolver:
+    """Get the process-wide resolver over the bundled listing file."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = QueryResolver(load_listings())
+    return _resolver
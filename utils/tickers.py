@@ -0,0 +1,52 @@
+"""Ticker symbol parsing for agent outputs and queries."""
+
+import re
+from typing import List, Optional
+
+# "Tickers: AAPL, MSFT", also as "**Ticker symbols:** AAPL, MSFT" or "- Tickers: NVDA"
+_TICKER_LINE = re.compile(r"ticker(?:\s+symbol)?s?\W{0,3}:\W{0,3}(?P<symbols>[^\n]*)", re.IGNORECASE)
+_SYMBOL = re.compile(r"(?<![\w./$-])\$?([A-Z][A-Z0-9]{0,5}(?:[.\-][A-Z]{1,2})?)(?![\w/]|[.\-]\w)")
+# Upper-case words that are not tickers
+NOT_TICKERS = {
+    "A", "I", "AI", "AND", "CEO", "CFO", "EPS", "ETF", "FY", "GDP", "IPO", "NA",
+    "NONE", "OR", "PE", "Q1", "Q2", "Q3", "Q4", "THE", "USA", "USD", "US", "VS", "YTD",
+}
+
+
+def _symbols(text: str) -> List[str]:
+    tickers: List[str] = []
+    for symbol in _SYMBOL.findall(text):
+        if symbol not in NOT_TICKERS and symbol not in tickers:
+            tickers.append(symbol)
+    return tickers
+
+
+def parse_ticker_line(text: str) -> Optional[List[str]]:
+    """Parse the symbols of the last "Tickers: ..." line of a text.
+
+    Args:
+        text: Text such as the query agent's analysis
+
+    Returns:
+        Ticker symbols in order, or None if the text has no tickers line
+    """
+    matches = list(_TICKER_LINE.finditer(text))
+    if not matches:
+        return None
+    return _symbols(matches[-1].group("symbols"))
+
+
+def parse_tickers(text: str) -> List[str]:
+    """Parse the ticker symbols a text is about.
+
+    A "Tickers: ..." line wins; otherwise every upper-case symbol-like word
+    is taken as a ticker.
+
+    Args:
+        text: Query or agent output
+
+    Returns:
+        Ticker symbols in order of first mention
+    """
+    tickers = parse_ticker_line(text)
+    return _symbols(text) if tickers is None else tickers